@@ -21,16 +21,83 @@ SOFTWARE.
 """
 
 #=============================================================================
-from src.Utils.rgb_color import ANTHRACITE
+import os
+
+from src.App.config_loader       import ConfigLoader
+from src.Buffers.frame_bus       import SubscriptionPolicy
+from src.Cameras.capture_mode    import ThroughputPolicy
+from src.Display.views_layout    import LayoutMode
+from src.Utils.rgb_color         import ANTHRACITE
 
 
 #=============================================================================
 class AVTConfig:
     """The namespace for configuration values.
+    
+    The values below are the defaults.  They may be overridden by
+    a performance profile and by the settings of the  configuration
+    file when this module is imported - see class 'ConfigLoader'.
     """
 
     #-------------------------------------------------------------------------
-    CAMERAS_MAX_COUNT = 4
+    CAMERA_BUS_CAPACITY = 8
+    CAMERAS_CACHE_PATH = os.path.join( os.path.expanduser('~'), '.avt', 'cameras-cache.json' )
+    CAMERAS_MAX_COUNT = 8
+    CAMERAS_PROBED_COUNT = 8
+    CAMERA_PROBE_TIMEOUT_S = 3.0
+    CAMERA_PROPERTIES_REFRESH_S = 5.0
+    CAMERA_ERRORS_BUDGET = 10  # consecutive failed reads before reconnecting
+    CAMERA_RECONNECT_MIN_DELAY_S = 0.25
+    CAMERA_RECONNECT_MAX_DELAY_S = 4.0
+    CAPTURE_POLICY = ThroughputPolicy.BANDWIDTH_BUDGET
+    USB_BANDWIDTH_BUDGET_MBPS = 320.0  # shared by all cameras, about 2/3 of USB 2.0 high-speed
     DEFAULT_BACKGROUND = ANTHRACITE
+    DELAY_DEFAULT_S = 7
+    DELAY_RANGE_S = (5, 12)
+    DETACHED_VIEWS = ()  # (view key, monitor index, full screen) triples, e.g. ('camera-1', 1, True)
+    FPS_RATE_FRAMES = 15  # frames count of the sliding window of the displayed FPS rates
+    LAYOUT_CHECK_PERIOD_S = 0.25  # main window resizing is checked at this period
+    LAYOUT_MODE = LayoutMode.GRID
+    LIVE_DISPLAY_DELAY = 1  # frames waited for before displaying the live camera views
+    LIVE_DISPLAY_QUEUE_SIZE = 3
+    OPENCV_THREADS = { 'acquisition': None,  # OpenCV threads budgets per stage, None: CPUs
+                       'analysis'   : None,  # shared by the concurrent threads of the stage.
+                       'display'    : None,  # Process-wide: the lowest budget of the active
+                       'encoding'   : None } # stages applies to all of them - see OpenCVThreads
+    OPENCV_THREADS_GLOBAL = None  # when no stage is active; None: acquisition budget
+    PRESENT_PERIOD_S = 1.0 / 60.0  # presenter tick of the main event loop
+    PROFILE = None  # the name of the applied profile, if any
+    RECORD_CODEC = 'mjpg'  # see CameraRecorder.CODECS
+    RECORD_DEFAULT_S = 60.0
+    RECORD_POLICY = SubscriptionPolicy.DROP_OLDEST  # LOSSLESS stalls acquisition for a bounded time
+    RECORD_QUEUE_SIZE = 8  # frames, clipped to the capacity of the cameras frame buses
+    RECORD_RANGE_S = (20.0, 130.0)
+    RECORDS_PATH = os.path.join( os.path.expanduser('~'), '.avt', 'records' )
+    REPLAY_CACHE_FRAMES = 16  # decoded frames per replayed stream, at least one keyframes interval
+    REPLAY_FAST_SPEED = 4.0  # replay speed of the fast-backward and fast-forward controls
+    REPLAY_PERIOD_S = 1.0 / 30.0
+    REPLAY_SLOW_SPEED = 0.25  # replay speed of the step controls while playing
+    SLOWMO_CACHE_PAIRS = 32  # interpolated pairs of frames kept per replay, all streams together
+    SLOWMO_FLOW_SCALE = 0.5  # scale of the images the optical flow is evaluated on
+    SLOWMO_LOOKAHEAD_PAIRS = 4  # pairs interpolated ahead of the replay position, per stream
+    SLOWMO_MAX_STEPS = 8
+    SLOWMO_MODE = 'flow'  # 'flow', 'blend' or None to repeat frames - see FrameInterpolator
+    SLOWMO_WORKERS = 2
+    STARTUP_REPORT = True
+    THUMBNAILS_CACHE_MB = 64  # in-memory replayed thumbnails, all streams together
+    THUMBNAILS_MIN_SPEED = 2.0  # replay speed from which thumbnails are displayed instead of full frames
+    THUMBNAILS_PERIOD_S = 0.25
+    THUMBNAILS_SCALE = 8
+    WINDOW_HEIGHT = 2 * 480  # cameras area of the main window
+    WINDOW_WIDTH = 2 * 640
+    ZERO_COPY_VIEWS = False  # views drawn in place in their window content - see AVTWindow
+    
+    ENUMERATIONS = { 'CAPTURE_POLICY': ThroughputPolicy,
+                     'LAYOUT_MODE'   : LayoutMode,
+                     'RECORD_POLICY' : SubscriptionPolicy }
+
+
+#=============================================================================
+ConfigLoader.load( AVTConfig )
 
 #=====   end of   src.App.avt_config   =====#
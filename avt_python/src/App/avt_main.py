@@ -23,7 +23,10 @@ SOFTWARE.
 #=============================================================================
 import cv2
 
+from src.App.avt_config          import AVTConfig
+from src.App.event_loop          import Event, EventLoop
 from src.Display.main_window     import MainWindow
+from src.Utils.startup_report    import StartupReport, StartupTimer
 
 
 #=============================================================================
@@ -35,15 +38,36 @@ def avt_main():
     main_window = MainWindow()
      
     #-- shows the main window
-    main_window.draw()
+    with StartupTimer( 'display', 'main window first draw' ):
+        main_window.draw()
+    
+    if AVTConfig.STARTUP_REPORT:
+        StartupReport.print()
     
     #-- starts the cameras acquisition
     main_window.run_views()
     
     #-- interactions w. mouse and keyboard
-    while True:
-        if cv2.waitKey( 20 ) == 27 or not main_window.is_visible():
-            break
+    #   every window gets its own presenter and layout ticks
+    event_loop = EventLoop()
+    for window in (main_window, *main_window.view_windows):
+        event_loop.add_window( window )
+        event_loop.call_every( AVTConfig.PRESENT_PERIOD_S, window.present_if_dirty )
+        event_loop.call_every( AVTConfig.LAYOUT_CHECK_PERIOD_S, window.update_layout )
+    
+    def on_key(event: Event) -> None:
+        if event.data == 27:  # ESC
+            event_loop.stop()
+    event_loop.add_handler( Event.KEY, on_key )
+    
+    def on_thread_done(event: Event) -> None:
+        if event_loop.running:
+            print( f"!!! thread '{event.data.name}' has unexpectedly completed" )
+    event_loop.add_handler( Event.THREAD_DONE, on_thread_done )
+    for thread in main_window.get_threads():
+        event_loop.watch_thread( thread )
+    
+    event_loop.run()
     
     #-- stops cameras acquisition
     main_window.stop_views()
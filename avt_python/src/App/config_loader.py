@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import json
+import os
+from typing import Any, Dict, List
+
+from src.Utils.rgb_color import Palette, PaletteColor
+
+
+#=============================================================================
+class ConfigLoader:
+    """The loader of the runtime configuration of application AVT.
+    
+    This is a namespace for class methods only.  Configuration
+    values are the upper-case attributes of class  'AVTConfig'.
+    Their default values are overridden, in this order, by:
+        - the values of a named performance profile,  either a
+          built-in one - see 'PROFILES' - or one defined in the
+          configuration file;
+        - the values of section "settings" of the configuration
+          file.
+    
+    The configuration file is a JSON file, by default
+    '~/.avt/avt-config.json', e.g.:
+        {
+            "profile" : "laptop",
+            "profiles": { "coach-screen": { "DETACHED_VIEWS": [["camera-1", 1, true]] } },
+            "settings": { "CAMERA_BUS_CAPACITY": 6 }
+        }
+    
+    Environment variables AVT_CONFIG and AVT_PROFILE take pre-
+    cedence over the default path of the configuration file and
+    over its "profile" entry.
+    
+    Every value is validated against the type of its default
+    value:  ints, floats, bools and strings,  lists  for  tuples,
+    objects for dictionaries, whose keys must be known, [r, g, b]
+    lists for colors and names or integer values for the enumer-
+    ations  listed  in  'AVTConfig.ENUMERATIONS'.  null is only
+    accepted for the values whose default is None,  and for the
+    ones listed in '_NULLABLES'.  Values are then
+    checked against their bounds:  minimums - see '_MINIMUMS' -,
+    strictly positive periods,  durations and factors - see
+    '_POSITIVES' -,  ranges whose min is less than their max,
+    defaults within their ranges and detached views as (str, int,
+    bool) triples.  Invalid values are reported on console and
+    ignored, so that the application always starts.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def load(cls, config_class: type, path: str = None, profile: str = None) -> List[str]:
+        '''Loads the configuration file and the selected profile into a configuration class.
+        
+        Args:
+            config_class: type
+                A reference to the class of configuration  values,
+                i.e. 'AVTConfig'.
+            path: str
+                The path to the configuration file.  If None,  the
+                environment variable AVT_CONFIG or else the default
+                path is used. A missing file is not an error.
+            profile: str
+                The name of the profile to be applied.  If None,
+                the environment  variable  AVT_PROFILE  or else the
+                "profile" entry of the configuration file is used.
+        
+        Returns:
+            The list of the errors messages, which have also been
+            printed on console.
+        '''
+        path = path or os.environ.get( 'AVT_CONFIG' ) or cls.DEFAULT_PATH
+        errors = []
+        defaults = { name: getattr(config_class, name) for name in dir(config_class) if name.isupper() }
+        
+        content = {}
+        if os.path.isfile( path ):
+            try:
+                with open( path, 'r', encoding='utf-8' ) as fp:
+                    content = json.load( fp )
+                if not isinstance( content, dict ):
+                    raise ValueError( "top level must be an object" )
+            except (OSError, ValueError) as e:
+                errors.append( f"configuration file '{path}' ignored: {e}" )
+                content = {}
+        
+        file_profiles = content.get( 'profiles', {} )
+        if not isinstance( file_profiles, dict ):
+            errors.append( "profiles: an object is expected" )
+            file_profiles = {}
+        profiles = { **cls.PROFILES, **file_profiles }
+        profile = profile or os.environ.get( 'AVT_PROFILE' ) or content.get( 'profile' )
+        
+        if profile is not None:
+            if profile in profiles:
+                cls._apply( config_class, profiles[profile], f"profile '{profile}'", errors )
+                config_class.PROFILE = profile
+            else:
+                errors.append( f"unknown profile '{profile}', available ones: {', '.join(sorted(profiles))}" )
+        
+        cls._apply( config_class, content.get('settings', {}), 'settings', errors )
+        cls._check_consistency( config_class, defaults, errors )
+        
+        for error in errors:
+            print( f"!!! config: {error}" )
+        return errors
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _apply(cls, config_class: type,
+                    values      : Dict[str, Any],
+                    origin      : str,
+                    errors      : List[str]) -> None:
+        '''Validates values and sets them into the configuration class.
+        '''
+        if not isinstance( values, dict ):
+            errors.append( f"{origin}: an object is expected" )
+            return
+        
+        for name, value in values.items():
+            if not name.isupper() or not hasattr( config_class, name ) or name in cls._RESERVED:
+                errors.append( f"{origin}: unknown configuration value '{name}'" )
+                continue
+            try:
+                default = getattr( config_class, name )
+                enumeration = config_class.ENUMERATIONS.get( name )
+                if value is None and name in cls._NULLABLES:
+                    setattr( config_class, name, None )
+                else:
+                    setattr( config_class, name, cls._checked(name, cls._validated(value, default, enumeration)) )
+            except (TypeError, ValueError) as e:
+                errors.append( f"{origin}: invalid value {value!r} for '{name}' ({e})" )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _check_consistency(cls, config_class: type,
+                                defaults    : Dict[str, Any],
+                                errors      : List[str]) -> None:
+        '''Checks the values that depend on each other, once all of them are set.
+        
+        Inconsistent values are all restored to their defaults.
+        '''
+        pairs = [ (name, name.replace('_RANGE_S', '_DEFAULT_S')) for name in defaults if name.endswith('_RANGE_S') ]
+        pairs.append( ('CAMERA_RECONNECT_MIN_DELAY_S', 'CAMERA_RECONNECT_MAX_DELAY_S') )
+        pairs.append( ('CAMERAS_MAX_COUNT', 'CAMERAS_PROBED_COUNT') )
+        
+        for name, other in pairs:
+            if other not in defaults:
+                continue
+            value, other_value = getattr( config_class, name ), getattr( config_class, other )
+            if name.endswith( '_RANGE_S' ):
+                b_ok = value[0] <= other_value <= value[1]
+            else:
+                b_ok = value <= other_value
+            if not b_ok:
+                errors.append( f"inconsistent values {value!r} for '{name}' and {other_value!r} for '{other}', "
+                               f"defaults restored" )
+                setattr( config_class, name, defaults[name] )
+                setattr( config_class, other, defaults[other] )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _checked(cls, name: str, value: Any) -> Any:
+        '''Returns a validated value once checked against the bounds of its configuration value.
+        
+        Raises:
+            ValueError: the value is out of its bounds.
+        '''
+        if value is None:
+            return value
+        
+        if name in cls._MINIMUMS and value < cls._MINIMUMS[ name ]:
+            raise ValueError( f"a value of at least {cls._MINIMUMS[name]} is expected" )
+        
+        if (name in cls._POSITIVES or name.endswith('_PERIOD_S')) and value <= 0:
+            raise ValueError( "a strictly positive value is expected" )
+        
+        if name.endswith( '_RANGE_S' ) and not value[ 0 ] < value[ 1 ]:
+            raise ValueError( "min must be less than max" )
+        
+        if name == 'OPENCV_THREADS':
+            if any( count is not None and count < 1 for count in value.values() ):
+                raise ValueError( "threads counts of at least 1 are expected" )
+        
+        if name == 'DETACHED_VIEWS':
+            for item in value:
+                if (not isinstance(item, tuple) or len(item) != 3 or
+                        not isinstance(item[0], str) or
+                        not isinstance(item[1], int) or isinstance(item[1], bool) or item[1] < 0 or
+                        not isinstance(item[2], bool)):
+                    raise ValueError( f"item {item!r} is not a (view key, monitor index, full screen) triple" )
+        
+        return value
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _validated(cls, value: Any, default: Any, enumeration: type = None) -> Any:
+        '''Returns a value converted to the type of a default value.
+        
+        Raises:
+            TypeError: the value is not of the expected type.
+            ValueError: the value is not a valid one.
+        '''
+        if enumeration is not None:
+            if isinstance( value, str ):
+                for enum_value, enum_name in enumeration.NAMES.items():
+                    if enum_name == value:
+                        return enum_value
+                raise ValueError( f"expected one of {', '.join(enumeration.NAMES.values())}" )
+            if value not in enumeration.NAMES:
+                raise ValueError( f"expected one of {', '.join(enumeration.NAMES.values())}" )
+            return value
+        
+        if default is None:
+            if value is None or isinstance( value, (int, float) ) and not isinstance( value, bool ):
+                return value
+            raise TypeError( "a number or null is expected" )
+        
+        if value is None:
+            raise TypeError( "null is not allowed" )
+        
+        if isinstance( default, PaletteColor ):
+            if not isinstance( value, list ) or len( value ) != 3:
+                raise TypeError( "an [r, g, b] list is expected" )
+            r, g, b = ( cls._validated(comp, 0) for comp in value )
+            return Palette.get( r, g, b )
+        
+        if isinstance( default, bool ):
+            if not isinstance( value, bool ):
+                raise TypeError( "a boolean is expected" )
+            return value
+        
+        if isinstance( default, (int, float) ):
+            if isinstance( value, bool ) or not isinstance( value, (int, float) ):
+                raise TypeError( "a number is expected" )
+            if isinstance( default, int ) and not isinstance( value, int ):
+                raise TypeError( "an integer is expected" )
+            if value < 0:
+                raise ValueError( "a positive value is expected" )
+            return value
+        
+        if isinstance( default, str ):
+            if not isinstance( value, str ):
+                raise TypeError( "a string is expected" )
+            return os.path.expanduser( value )
+        
+        if isinstance( default, tuple ):
+            if not isinstance( value, list ):
+                raise TypeError( "a list is expected" )
+            if default and len( value ) != len( default ):
+                raise ValueError( f"{len(default)} items are expected" )
+            if default:
+                return tuple( cls._validated(item, item_default) for item, item_default in zip(value, default) )
+            return tuple( tuple(item) if isinstance(item, list) else item for item in value )
+        
+        if isinstance( default, dict ):
+            if not isinstance( value, dict ):
+                raise TypeError( "an object is expected" )
+            unknown = [ key for key in value if key not in default ]
+            if unknown:
+                raise ValueError( f"unknown keys {', '.join(unknown)}" )
+            return { **default, **{ key: cls._validated(item, default[key]) for key, item in value.items() } }
+        
+        raise TypeError( f"values of type {type(default).__name__} cannot be configured" )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _RESERVED = ('ENUMERATIONS', 'PROFILE')  # set by the application only
+    
+    _NULLABLES = ( 'SLOWMO_MODE', )  # None being meaningful while their default is not
+    
+    _MINIMUMS = { 'CAMERA_BUS_CAPACITY'    : 2,  # see FrameBus
+                  'CAMERA_ERRORS_BUDGET'   : 1,
+                  'CAMERAS_MAX_COUNT'      : 1,
+                  'CAMERAS_PROBED_COUNT'   : 1,
+                  'FPS_RATE_FRAMES'        : 1,
+                  'LIVE_DISPLAY_QUEUE_SIZE': 1,
+                  'OPENCV_THREADS_GLOBAL'  : 1,
+                  'RECORD_QUEUE_SIZE'      : 1,
+                  'REPLAY_CACHE_FRAMES'    : 1,
+                  'SLOWMO_CACHE_PAIRS'     : 1,
+                  'SLOWMO_MAX_STEPS'       : 1,
+                  'SLOWMO_WORKERS'         : 1,
+                  'THUMBNAILS_SCALE'       : 1,
+                  'WINDOW_HEIGHT'          : 1,
+                  'WINDOW_WIDTH'           : 1 }
+    
+    _POSITIVES = ( 'CAMERA_PROBE_TIMEOUT_S',  # plus all the '..._PERIOD_S' values
+                   'CAMERA_PROPERTIES_REFRESH_S',
+                   'CAMERA_RECONNECT_MAX_DELAY_S',
+                   'CAMERA_RECONNECT_MIN_DELAY_S',
+                   'REPLAY_FAST_SPEED',
+                   'REPLAY_SLOW_SPEED',
+                   'SLOWMO_FLOW_SCALE',
+                   'THUMBNAILS_MIN_SPEED',
+                   'USB_BANDWIDTH_BUDGET_MBPS' )
+    
+    DEFAULT_PATH = os.path.join( os.path.expanduser('~'), '.avt', 'avt-config.json' )
+    
+    PROFILES = {
+        # the shortest path from capture to screen,  at the cost
+        # of more dropped frames
+        'low-latency-live': { 'CAMERA_BUS_CAPACITY'    : 4,
+                              'CAPTURE_POLICY'         : 'max-fps',
+                              'LIVE_DISPLAY_DELAY'     : 0,
+                              'LIVE_DISPLAY_QUEUE_SIZE': 1,
+                              'PRESENT_PERIOD_S'       : 1.0 / 120.0 },
+        
+        # four cameras recorded at once: deeper buffers and shared
+        # USB bandwidth.  OpenCV threads budgets are left to their
+        # automatic evaluation,  which already shares the CPUs bet-
+        # ween the four cameras:  any lower encoding budget would
+        # apply to the whole process while recording - see class
+        # 'OpenCVThreads'
+        '4-cam-recording' : { 'CAMERA_BUS_CAPACITY'    : 16,
+                              'CAMERAS_MAX_COUNT'      : 4,
+                              'CAPTURE_POLICY'         : 'bandwidth-budget',
+                              'LIVE_DISPLAY_QUEUE_SIZE': 4,
+                              'RECORD_QUEUE_SIZE'      : 16 },
+        
+        # modest CPU and screen: two cameras, smaller window and
+        # lower presentation rate
+        'laptop'          : { 'CAMERAS_MAX_COUNT'      : 2,
+                              'CAMERAS_PROBED_COUNT'   : 4,
+                              'FPS_RATE_FRAMES'        : 10,
+                              'PRESENT_PERIOD_S'       : 1.0 / 30.0,
+                              'WINDOW_HEIGHT'          : 600,
+                              'WINDOW_WIDTH'           : 800 },
+    }
+
+#=====   end of   src.App.config_loader   =====#
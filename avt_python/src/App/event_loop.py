@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class Event
+#    class EventLoop
+#
+
+
+#=============================================================================
+import cv2
+import heapq
+import itertools
+from queue       import Empty, SimpleQueue
+from threading   import Thread
+import time
+from typing      import Any, Callable, Dict, List
+
+from src.Display.avt_window  import AVTWindow
+
+
+#=============================================================================
+EventHandler = Callable[ ['Event'], None ]
+
+
+#=============================================================================
+class Event:
+    """The class of events dispatched by the AVT event loop.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, kind: int, data: Any = None) -> None:
+        '''Constructor.
+        
+        Args:
+            kind: int
+                The kind of this event,  one of the  constants
+                that are defined at the end of this class.
+            data: Any
+                The data that are associated with this  event:
+                the key code for KEY events, a MouseData for
+                MOUSE events,  the completed thread for THREAD_
+                DONE events, anything for USER events. Defaults
+                to None.
+        '''
+        self.kind = kind
+        self.data = data
+
+    #-------------------------------------------------------------------------
+    class MouseData:
+        '''The data of mouse events, as provided by OpenCV mouse callbacks.
+        '''
+        def __init__(self, window: AVTWindow, cv_event: int, x: int, y: int, flags: int) -> None:
+            self.window = window
+            self.cv_event = cv_event  # one of cv2.EVENT_XXX
+            self.x = x
+            self.y = y
+            self.flags = flags  # combination of cv2.EVENT_FLAG_XXX
+
+    #-------------------------------------------------------------------------
+    # Class data
+    KEY         = 0
+    MOUSE       = 1
+    THREAD_DONE = 2
+    USER        = 3
+    QUIT        = 4
+
+
+#=============================================================================
+class EventLoop:
+    """The class of the AVT application event loop.
+    
+    This loop runs in the main thread,  which is the one that
+    must  pump  the  OpenCV  HighGUI  events.  It waits with
+    'cv2.waitKey()' up to the next timer deadline,  so  that
+    keys  are delivered as soon as they are hit,  mouse call-
+    backs are called as soon as the mouse acts and  the  CPU
+    is left idle in between.
+    
+    Events  posted  from  other  threads  (threads  completion,
+    user events) are dispatched on the next wake-up of the loop,
+    which  happens at the latest after 'MAX_WAIT_MS'.  Presenting
+    the windows content is a periodical timer of this loop.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self) -> None:
+        '''Constructor.
+        '''
+        self.handlers: Dict[int, List[EventHandler]] = {}
+        self.running = False
+        self.windows = []
+        self._posted = SimpleQueue()
+        self._timers = []  # heap of (deadline, id, period, handler)
+        self._timers_ids = itertools.count()
+        self._cancelled = set()
+
+    #-------------------------------------------------------------------------
+    def add_handler(self, kind: int, handler: EventHandler) -> None:
+        '''Adds a handler for a kind of events.
+        
+        Handlers are called in the order of their addition.
+        '''
+        self.handlers.setdefault( kind, [] ).append( handler )
+
+    #-------------------------------------------------------------------------
+    def add_window(self, window: AVTWindow) -> None:
+        '''Adds a window to this loop.
+        
+        Mouse events in the window are dispatched as events
+        of kind MOUSE to the handlers  of this loop and to
+        method 'on_mouse()'  of the window.  The loop stops
+        once every added window has been closed.
+        '''
+        self.windows.append( window )
+        cv2.setMouseCallback( window.name, self._on_mouse, window )
+        self.add_handler( Event.MOUSE, lambda event, w=window: w.on_mouse(event.data)
+                                                               if event.data.window is w else None )
+
+    #-------------------------------------------------------------------------
+    def call_every(self, period_s: float, handler: Callable[[], Any]) -> int:
+        '''Calls a handler periodically.
+        
+        Returns:
+            The identifier of the timer, to be used with
+            method 'cancel()'.
+        '''
+        return self._add_timer( period_s, period_s, handler )
+
+    #-------------------------------------------------------------------------
+    def call_later(self, delay_s: float, handler: Callable[[], Any]) -> int:
+        '''Calls a handler once, after some delay.
+        
+        Returns:
+            The identifier of the timer, to be used with
+            method 'cancel()'.
+        '''
+        return self._add_timer( delay_s, None, handler )
+
+    #-------------------------------------------------------------------------
+    def cancel(self, timer_id: int) -> None:
+        '''Cancels a timer.
+        '''
+        self._cancelled.add( timer_id )
+
+    #-------------------------------------------------------------------------
+    def post(self, kind: int, data: Any = None) -> None:
+        '''Posts an event to this loop.
+        
+        This method is thread safe.  The event is dispatched
+        by the thread that runs this loop.
+        '''
+        self._posted.put( Event(kind, data) )
+
+    #-------------------------------------------------------------------------
+    def run(self) -> None:
+        '''Runs this loop until it is stopped or all its windows are closed.
+        '''
+        self.running = True
+        while self.running:
+            self._dispatch_posted()
+            wait_ms = self._run_timers()
+            if not self.running:
+                break
+            
+            key = cv2.waitKey( wait_ms )
+            if key != -1:
+                self._dispatch( Event(Event.KEY, key) )
+            
+            if self.windows and not any( w.is_visible() for w in self.windows ):
+                self.stop()
+        
+        self._dispatch( Event(Event.QUIT) )
+
+    #-------------------------------------------------------------------------
+    def stop(self) -> None:
+        '''Stops this loop.
+        
+        Should be called from the thread that runs this loop.
+        Other threads should post an event of kind QUIT instead.
+        '''
+        self.running = False
+
+    #-------------------------------------------------------------------------
+    def watch_thread(self, thread: Thread) -> None:
+        '''Posts an event of kind THREAD_DONE once the thread has completed.
+        '''
+        def _join() -> None:
+            thread.join()
+            self.post( Event.THREAD_DONE, thread )
+        Thread( target=_join, name=f"{thread.name}-watch", daemon=True ).start()
+
+    #-------------------------------------------------------------------------
+    def _add_timer(self, delay_s: float, period_s: float, handler: Callable[[], Any]) -> int:
+        '''Adds a timer to this loop.
+        '''
+        timer_id = next( self._timers_ids )
+        heapq.heappush( self._timers, (time.perf_counter() + delay_s, timer_id, period_s, handler) )
+        return timer_id
+
+    #-------------------------------------------------------------------------
+    def _dispatch(self, event: Event) -> None:
+        '''Dispatches an event to its handlers.
+        '''
+        if event.kind == Event.QUIT:
+            self.running = False
+        for handler in self.handlers.get( event.kind, () ):
+            handler( event )
+
+    #-------------------------------------------------------------------------
+    def _dispatch_posted(self) -> None:
+        '''Dispatches all the events that have been posted by other threads.
+        '''
+        while True:
+            try:
+                event = self._posted.get_nowait()
+            except Empty:
+                return
+            self._dispatch( event )
+
+    #-------------------------------------------------------------------------
+    def _on_mouse(self, cv_event: int, x: int, y: int, flags: int, window: AVTWindow) -> None:
+        '''The OpenCV mouse callback, called while in 'cv2.waitKey()'.
+        '''
+        self._dispatch( Event(Event.MOUSE, Event.MouseData(window, cv_event, x, y, flags)) )
+
+    #-------------------------------------------------------------------------
+    def _run_timers(self) -> int:
+        '''Calls the handlers of due timers.
+        
+        Returns:
+            The delay before the next timer deadline, in milli-
+            seconds, clipped to [1, MAX_WAIT_MS].
+        '''
+        now = time.perf_counter()
+        while self._timers and self._timers[0][0] <= now:
+            deadline, timer_id, period_s, handler = heapq.heappop( self._timers )
+            if timer_id in self._cancelled:
+                self._cancelled.discard( timer_id )
+                continue
+            handler()
+            if period_s is not None:
+                # no burst of calls after some lag
+                heapq.heappush( self._timers, (max(deadline + period_s, now), timer_id, period_s, handler) )
+        
+        if not self._timers:
+            return self.MAX_WAIT_MS
+        wait_ms = int( (self._timers[0][0] - time.perf_counter()) * 1000.0 + 0.5 )
+        return min( max(wait_ms, 1), self.MAX_WAIT_MS )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    MAX_WAIT_MS = 100
+
+#=====   end of   src.App.event_loop   =====#
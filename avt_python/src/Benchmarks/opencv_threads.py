@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+"""Benchmark of the OpenCV threads budget versus the count of cameras.
+
+Usage, from directory 'avt_python':
+    python -m src.Benchmarks.opencv_threads [duration_s [results_path]]
+
+For 1 to 4 cameras,  one thread per camera runs the per-frame
+OpenCV work of the acquisition and display stages on synthetic
+HD frames: downscaling,  mirroring and letterboxing  warp.  Each
+configuration is run with several OpenCV threads counts,  and
+the aggregated frames rates are printed, together with the best
+threads count and the one that 'OpenCVThreads' evaluates auto-
+matically.  Results are saved in a JSON file - by default
+'~/.avt/opencv-threads-benchmark.json' - with the count of CPUs
+and the OpenCV version they have been measured with,  so that
+the values of 'AVTConfig.OPENCV_THREADS' that are derived from
+them are documented.  They are to be reported in the settings
+of the configuration file when they differ from the automatic
+budgets on the target PC.
+"""
+
+#=============================================================================
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from src.Utils.Scheduling                import Scheduler
+from src.Utils.Scheduling.opencv_threads import OpenCVThreads
+
+
+#=============================================================================
+class OpenCVThreadsBenchmark:
+    """The namespace of the OpenCV threads budget benchmark.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def camera_pipeline(cls, stop_event: threading.Event, counts: List[int], index: int) -> None:
+        '''The per-frame OpenCV work of one camera, looped until stopped.
+        '''
+        frame = np.random.randint( 0, 256, (cls.FRAME_HEIGHT, cls.FRAME_WIDTH, 3), np.uint8 )
+        scaled = np.empty( (cls.FRAME_HEIGHT // 2, cls.FRAME_WIDTH // 2, 3), np.uint8 )
+        view = np.empty( (cls.VIEW_HEIGHT, cls.VIEW_WIDTH, 3), np.uint8 )
+        matrix = np.array( [[-1.0, 0.0, cls.VIEW_WIDTH - 1.0],
+                            [ 0.0, 1.0, (cls.VIEW_HEIGHT - scaled.shape[0]) / 2]], np.float64 )
+        
+        while not stop_event.is_set():
+            cv2.resize( frame, scaled.shape[1::-1], dst=scaled, interpolation=cv2.INTER_AREA )
+            cv2.warpAffine( scaled, matrix, (cls.VIEW_WIDTH, cls.VIEW_HEIGHT), dst=view,
+                            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT )
+            counts[ index ] += 1
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def measure(cls, cameras_count: int, threads_count: int, duration_s: float) -> float:
+        '''Returns the aggregated frames rate of the cameras for an OpenCV threads count.
+        '''
+        cv2.setNumThreads( threads_count )
+        stop_event = threading.Event()
+        counts = [ 0 ] * cameras_count
+        threads = [ threading.Thread( target=cls.camera_pipeline, args=(stop_event, counts, index) )
+                        for index in range(cameras_count) ]
+        
+        for thread in threads:
+            thread.start()
+        time.sleep( duration_s )
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        
+        return sum( counts ) / duration_s
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def run(cls, duration_s: float = 2.0, results_path: str = None) -> Dict[int, int]:
+        '''Runs the benchmark, prints its results and saves them.
+        
+        Args:
+            duration_s: float
+                The duration of each measure, in seconds. Defaults
+                to 2.0.
+            results_path: str
+                The path of the JSON file of the results. If None,
+                'RESULTS_PATH' is used. Defaults to None.
+        
+        Returns:
+            The best OpenCV threads count per count of cameras.
+        '''
+        cpus_count = len( Scheduler.get_available_cpus() )
+        print( f"-- {cpus_count} CPUs, OpenCV default threads count: {cv2.getNumThreads()}" )
+        
+        best_counts = {}
+        results = { 'cpus_count'    : cpus_count,
+                    'opencv_version': cv2.__version__,
+                    'duration_s'    : duration_s,
+                    'cameras'       : {} }
+        for cameras_count in range( 1, cls.MAX_CAMERAS_COUNT + 1 ):
+            auto_count = OpenCVThreads.evaluate_budgets( cameras_count, cpus_count )[ OpenCVThreads.ACQUISITION ]
+            candidates = sorted( {1, 2, auto_count, cpus_count} )
+            
+            rates = { count: cls.measure(cameras_count, count, duration_s) for count in candidates }
+            best_counts[ cameras_count ] = max( rates, key=rates.get )
+            results[ 'cameras' ][ cameras_count ] = { 'fps_per_threads_count': rates,
+                                                      'best'                 : best_counts[cameras_count],
+                                                      'auto'                 : auto_count }
+            
+            print( f"-- {cameras_count} camera(s): " +
+                   ", ".join( f"{count} thr. {rate:7.1f} fps" for count, rate in rates.items() ) +
+                   f" -> best: {best_counts[cameras_count]}, auto: {auto_count}" )
+        
+        results_path = results_path or cls.RESULTS_PATH
+        try:
+            os.makedirs( os.path.dirname(results_path), exist_ok=True )
+            with open( results_path, 'w', encoding='utf-8' ) as fp:
+                json.dump( results, fp, indent=2 )
+            print( f"-- results saved in '{results_path}'" )
+        except OSError as e:
+            print( f"!!! cannot save the results in '{results_path}': {e}" )
+        return best_counts
+
+    #-------------------------------------------------------------------------
+    # Class data
+    FRAME_WIDTH  = 1280
+    FRAME_HEIGHT =  720
+    VIEW_WIDTH   =  640
+    VIEW_HEIGHT  =  480
+    MAX_CAMERAS_COUNT = 4
+    RESULTS_PATH = os.path.join( os.path.expanduser('~'), '.avt', 'opencv-threads-benchmark.json' )
+
+
+#=============================================================================
+if __name__ == '__main__':
+    OpenCVThreadsBenchmark.run( float(sys.argv[1]) if len(sys.argv) > 1 else 2.0,
+                                sys.argv[2] if len(sys.argv) > 2 else None )
+
+#=====   end of   src.Benchmarks.opencv_threads   =====#
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+"""Microbenchmark of the allocations of hot value types per rendered frame.
+
+Usage, from directory 'avt_python':
+    python -m src.Benchmarks.values_allocations
+
+The geometry and colors computations that are done per rendered frame
+by 'Font.draw_text()',  'CameraView.draw_borders()'  and  the  sliders
+bars are evaluated twice: with the allocating operators (former code)
+and with the in-place and tuple-returning fast paths  (current code),
+which use the cached shades of the palette colors.  For each of them,
+the count of value instances created per frame - once caches are warm -
+and the duration per frame are printed,  plus the memory size of slot-
+ted instances.
+"""
+
+#=============================================================================
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from src.Shapes.coord_2d     import Coord2D
+from src.Shapes.offset       import Offset
+from src.Shapes.point        import Point
+from src.Shapes.rect         import Rect
+from src.Utils.rgb_color     import ANTHRACITE, GRAY, PaletteColor, RGBColor
+
+
+#=============================================================================
+class ValuesAllocations:
+    """The namespace of the values allocations microbenchmark.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def frame_operators(cls) -> None:
+        '''Computations of one rendered frame, with allocating operators.
+        '''
+        for pos in cls._TEXTS_POSITIONS:
+            (pos + Offset(1, 1)).to_tuple()
+            pt1 = pos + Offset( 0, -1 )
+            pt2 = pos + Offset( 40, 14 )
+            (pt1.x, pt1.y), (pt2.x, pt2.y)
+        
+        bg_color = RGBColor( *ANTHRACITE.color )
+        for _ in range( 2 ):
+            (bg_color / 1.5).color, (bg_color * 3).color, (bg_color / 2).color, (bg_color * 1.5).color
+        
+        bar_color = GRAY.copy()
+        for _ in range( 3 ):
+            color = bar_color // 2
+            (color * 1.40).color, (color // 3).color, (bar_color // 2.5).color
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def frame_fast_paths(cls) -> None:
+        '''Computations of one rendered frame, with fast paths.
+        '''
+        for pos in cls._TEXTS_POSITIONS:
+            pos.to_tuple( 1, 1 )
+            pos.to_tuple( 0, -1 ), pos.to_tuple( 40, 14 )
+        
+        bg_color = ANTHRACITE
+        bg_color.to_bgr()
+        bg_color.scaled_bgr( 1 / 1.5 ), bg_color.scaled_bgr( 3 ), bg_color.scaled_bgr( 1 / 2 ), bg_color.scaled_bgr( 1.5 )
+        
+        bar_color = GRAY
+        for _ in range( 3 ):
+            color = bar_color // 2
+            (color * 1.40).color, (color // 3).color, (bar_color // 2.5).color
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def count_instances(cls, frame_func: Callable[[], None]) -> int:
+        '''Returns the count of value instances created by one frame.
+
+        A first frame is run beforehand, to warm up the caches.
+        '''
+        frame_func()
+        counts = { 'n': 0 }
+        inits = { klass: klass.__init__ for klass in (Coord2D, RGBColor, PaletteColor) }
+        
+        def counting(init):
+            def _init(self, *args, **kwargs):
+                counts[ 'n' ] += 1
+                init( self, *args, **kwargs )
+            return _init
+        
+        try:
+            for klass, init in inits.items():
+                klass.__init__ = counting( init )
+            frame_func()
+        finally:
+            for klass, init in inits.items():
+                klass.__init__ = init
+        return counts[ 'n' ]
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def instance_bytes(cls, factory: Callable[[], object], count: int = 10_000) -> float:
+        '''Returns the mean memory size of instances, in bytes.
+        '''
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[ 0 ]
+        instances = [ factory() for _ in range(count) ]
+        size = tracemalloc.get_traced_memory()[ 0 ] - start
+        tracemalloc.stop()
+        del instances
+        return (size - 8 * count) / count  # the list of instances excluded
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def run(cls, frames_count: int = 20_000) -> Dict[str, float]:
+        '''Runs the benchmark and prints its results.
+        '''
+        results = {}
+        for name, func in (('operators', cls.frame_operators), ('fast paths', cls.frame_fast_paths)):
+            instances = cls.count_instances( func )
+            start = time.perf_counter()
+            for _ in range( frames_count ):
+                func()
+            duration_us = (time.perf_counter() - start) * 1e6 / frames_count
+            results[ name ] = instances
+            print( f"-- {name:10s}: {instances:3d} value instances per frame, {duration_us:6.2f} us per frame" )
+        
+        for name, factory in (('Point', lambda: Point(1, 2)), ('Rect', lambda: Rect(1, 2, 3, 4)),
+                              ('RGBColor', lambda: RGBColor(1, 2, 3))):
+            print( f"-- {name:10s}: {cls.instance_bytes(factory):6.1f} bytes per instance" )
+        return results
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _TEXTS_POSITIONS = [ Point(20, 40 + 30 * i) for i in range(6) ]  # about one view labels and slider ticks
+
+
+#=============================================================================
+if __name__ == '__main__':
+    ValuesAllocations.run()
+
+#=====   end of   src.Benchmarks.values_allocations   =====#
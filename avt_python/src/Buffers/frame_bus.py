@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class SubscriptionPolicy
+#    class FrameBus
+#    class FrameBusSubscriber
+#
+
+
+#=============================================================================
+from typing      import Any, Dict, ForwardRef
+from threading   import Condition, Lock
+import time
+
+from src.Utils.indexed_frame import IndexedFrame
+
+
+#=============================================================================
+FrameBusRef           = ForwardRef( "FrameBus" )
+FrameBusSubscriberRef = ForwardRef( "FrameBusSubscriber" )
+
+
+#=============================================================================
+class SubscriptionPolicy:
+    """The enumeration of the backpressure policies of frame buses subscribers.
+    
+    LATEST_ONLY: the subscriber always gets the newest frame;
+        older not yet read frames are dropped.
+    EVERY_NTH: the subscriber gets one frame out of every  N
+        published ones.
+    DROP_OLDEST: the subscriber reads frames in order from a
+        bounded queue;  the oldest frames are dropped when the
+        queue overflows.
+    LOSSLESS: the subscriber reads frames in order  and  the
+        writer waits for it before overwriting a not yet read
+        frame, but no longer than a bounded block budget. Frames
+        get dropped once this budget is exhausted.
+    
+    None of these policies ever stalls the writer but LOSSLESS,
+    which stalls it for a bounded time only.
+    """
+    LATEST_ONLY = 0
+    EVERY_NTH   = 1
+    DROP_OLDEST = 2
+    LOSSLESS    = 3
+    
+    NAMES = { LATEST_ONLY: 'latest-only',
+              EVERY_NTH  : 'every-nth'  ,
+              DROP_OLDEST: 'drop-oldest',
+              LOSSLESS   : 'lossless'    }
+
+
+#=============================================================================
+class FrameBus:
+    """The class of cameras frames buses.
+    
+    A frame bus is a ring of captured frames with one single
+    writer - the camera acquisition thread - and many named
+    subscribers:  live display,  delayed display,  recorder,
+    motion analysis, etc. Each subscriber gets its own cursor
+    into the shared ring.  Frames are never copied for  sub-
+    scribers.
+    
+    Every published frame gets a sequence number.  Each slot
+    of  the  ring  stores  the sequence number of its frame,
+    which is checked by readers so that a slot that has just
+    been reused is never returned with a wrong sequence.  The
+    writer never waits for readers.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, capacity: int) -> None:
+        '''Constructor.
+        
+        Args:
+            capacity: int
+                The number of slots of this bus, i.e. the max
+                number of frames a subscriber may lag  behind
+                the writer before losing frames. Must be greater
+                than 1.
+        '''
+        assert capacity > 1
+        
+        self.capacity    = capacity
+        self.write_seq   = 0     # sequence number of the next published frame
+        self.subscribers = {}
+        self._frames     = [ None ] * capacity
+        self._seqs       = [ -1 ] * capacity
+        self._lossless   = []
+        self._new_frame  = Condition()
+        self._subscribers_lock = Lock()
+
+    #-------------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        '''Returns the statistics of all subscribers, indexed by their names.
+        '''
+        return { name: subscriber.get_stats() for name, subscriber in self.subscribers.items() }
+
+    #-------------------------------------------------------------------------
+    def get_subscriber(self, name: str) -> FrameBusSubscriberRef:
+        '''Returns the named subscriber, or None if not subscribed.
+        '''
+        return self.subscribers.get( name )
+
+    #-------------------------------------------------------------------------
+    def is_valid(self, seq: int) -> bool:
+        '''Returns True if the frame with this sequence number is still in the bus.
+        
+        Consumers that process a frame over some time may call
+        this method once done,  to check that the frame content
+        has not been reused by the writer meanwhile.
+        '''
+        return 0 <= seq < self.write_seq <= seq + self.capacity
+
+    #-------------------------------------------------------------------------
+    def publish(self, indexed_frame: IndexedFrame) -> None:
+        '''Publishes a new frame to all subscribers.
+        
+        This method is to be called by the one single writer of
+        this bus.  It only waits for LOSSLESS subscribers which
+        have not yet read the frame that is to be overwritten,
+        and for no longer than their block budget.
+        
+        Args:
+            indexed_frame: IndexedFrame
+                A reference to the indexed frame to be published.
+        '''
+        seq = self.write_seq
+        overwritten_seq = seq - self.capacity
+        if overwritten_seq >= 0:
+            for subscriber in self._lossless:
+                subscriber._wait_for_read( overwritten_seq )
+        
+        slot = seq % self.capacity
+        self._seqs[ slot ] = -1  # slot in update
+        self._frames[ slot ] = indexed_frame
+        self._seqs[ slot ] = seq
+        
+        with self._new_frame:
+            self.write_seq = seq + 1
+            self._new_frame.notify_all()
+
+    #-------------------------------------------------------------------------
+    def subscribe(self, name          : str                                  ,
+                        policy        : int   = SubscriptionPolicy.DROP_OLDEST,
+                        *,
+                        delay         : int   = 0                             ,
+                        nth           : int   = 1                             ,
+                        queue_size    : int   = None                          ,
+                        block_budget_s: float = 0.002                         ) -> FrameBusSubscriberRef:
+        '''Creates a new subscriber to this bus.
+        
+        Args:
+            name: str
+                The name of the subscriber. Must be unique for
+                this bus.
+            policy: int
+                The backpressure policy of the subscriber,  one
+                of the values of class SubscriptionPolicy.  De-
+                faults to SubscriptionPolicy.DROP_OLDEST.
+            delay: int
+                Named argument. The number of frames the subscri-
+                ber stays behind the newest published one.  Must
+                be less than the capacity of this bus. Defaults
+                to 0.
+            nth: int
+                Named argument. The decimation factor of policy
+                EVERY_NTH. Defaults to 1.
+            queue_size: int
+                Named argument.  The max number of frames a  sub-
+                scriber with policy DROP_OLDEST may lag behind the
+                writer.  Defaults to None,  in which case the cap-
+                acity of this bus is used instead.
+            block_budget_s: float
+                Named argument.  The max duration the writer waits
+                for a subscriber with policy LOSSLESS before over-
+                writing a not yet read frame,  in seconds. Defaults
+                to 0.002 (i.e. 2 ms).
+        
+        Returns:
+            A reference to the newly created subscriber.
+        
+        Raises:
+            ValueError: the name is already subscribed or  some
+                argument is out of bounds.
+        '''
+        if not 0 <= delay < self.capacity:
+            raise ValueError( f"delay {delay} is out of bounds [0:{self.capacity - 1}]" )
+        if queue_size is None:
+            queue_size = self.capacity
+        if not delay < queue_size <= self.capacity:
+            raise ValueError( f"queue size {queue_size} is out of bounds [{delay + 1}:{self.capacity}]" )
+        if nth < 1:
+            raise ValueError( f"decimation factor {nth} must be greater than 0" )
+        
+        with self._subscribers_lock:
+            if name in self.subscribers:
+                raise ValueError( f"'{name}' is already subscribed to this frame bus" )
+            subscriber = FrameBusSubscriber( self, name, policy, delay, nth, queue_size, block_budget_s )
+            self.subscribers = { **self.subscribers, name: subscriber }
+            self._lossless = [ s for s in self.subscribers.values() if s.policy == SubscriptionPolicy.LOSSLESS ]
+            return subscriber
+
+    #-------------------------------------------------------------------------
+    def unsubscribe(self, name: str) -> None:
+        '''Removes the named subscriber from this bus.
+        '''
+        with self._subscribers_lock:
+            self.subscribers = { n: s for n, s in self.subscribers.items() if n != name }
+            self._lossless = [ s for s in self.subscribers.values() if s.policy == SubscriptionPolicy.LOSSLESS ]
+
+    #-------------------------------------------------------------------------
+    def _read(self, seq: int) -> IndexedFrame:
+        '''Returns the frame with this sequence number, or None if its slot has been reused.
+        '''
+        slot = seq % self.capacity
+        if self._seqs[ slot ] != seq:
+            return None
+        indexed_frame = self._frames[ slot ]
+        return indexed_frame if self._seqs[ slot ] == seq else None
+
+    #-------------------------------------------------------------------------
+    def _wait(self, seq: int, timeout: float = None) -> bool:
+        '''Waits for the frame with this sequence number to be published.
+        
+        Returns:
+            True if the frame has been published,  or False if
+            the timeout has been reached.
+        '''
+        with self._new_frame:
+            return self._new_frame.wait_for( lambda: self.write_seq > seq, timeout )
+
+
+#=============================================================================
+class FrameBusSubscriber:
+    """The class of frame buses subscribers.
+    
+    Subscribers are created by method 'FrameBus.subscribe()'.
+    Each one reads the frames of the bus with its own cursor,
+    according to its backpressure policy - see class Subscrip-
+    tionPolicy.  Frames that are never delivered to a subscri-
+    ber  are  counted  as  dropped ones,  but for the frames
+    that are intentionally skipped with policy  EVERY_NTH, which
+    are counted as decimated ones.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, bus           : FrameBusRef,
+                       name          : str        ,
+                       policy        : int        ,
+                       delay         : int        ,
+                       nth           : int        ,
+                       queue_size    : int        ,
+                       block_budget_s: float       ) -> None:
+        '''Constructor.
+        
+        See method 'FrameBus.subscribe()' for a description of
+        the arguments.
+        '''
+        self.bus            = bus
+        self.name           = name
+        self.policy         = policy
+        self.delay          = delay
+        self.nth            = nth
+        self.queue_size     = queue_size
+        self.block_budget_s = block_budget_s
+        
+        self.cursor          = self._aligned( bus.write_seq )  # sequence number of the next frame to read
+        self.last_seq        = -1
+        self.frames_count    = 0
+        self.dropped_count   = 0
+        self.decimated_count = 0
+        self.blocked_count   = 0   # LOSSLESS only: count of exhausted block budgets
+        self.blocked_time_s  = 0.0 # LOSSLESS only: total time the writer waited
+        self._read_done = Condition()
+
+    #-------------------------------------------------------------------------
+    def get_next(self, timeout: float = 0.0) -> IndexedFrame:
+        '''Returns the next frame for this subscriber.
+        
+        Args:
+            timeout: float
+                The max duration of the wait for a new frame, in
+                seconds.  Set it to 0.0 to get no wait at all or
+                to None to wait without limit.  Defaults to 0.0.
+        
+        Returns:
+            A reference to the next indexed frame,  or None if
+            no new frame is available within the timeout.
+        '''
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        
+        while True:
+            write_seq = self.bus.write_seq
+            
+            if write_seq <= self.cursor + self.delay:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if (remaining is not None and remaining <= 0.0) or \
+                        not self.bus._wait( self.cursor + self.delay, remaining ):
+                    return None
+                continue
+            
+            self._apply_policy( write_seq )
+            
+            indexed_frame = self.bus._read( self.cursor )
+            if indexed_frame is None:
+                self._drop_to( self._aligned(self.cursor + 1) )  # slot reused while being read
+                continue
+            
+            with self._read_done:
+                self.last_seq = self.cursor
+                self.cursor += self.nth
+                self._read_done.notify()
+            self.frames_count += 1
+            self.decimated_count += self.nth - 1
+            return indexed_frame
+
+    #-------------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        '''Returns the statistics of this subscriber.
+        '''
+        return { 'policy'         : SubscriptionPolicy.NAMES[ self.policy ],
+                 'frames_count'   : self.frames_count   ,
+                 'dropped_count'  : self.dropped_count  ,
+                 'decimated_count': self.decimated_count,
+                 'blocked_count'  : self.blocked_count  ,
+                 'blocked_time_s' : self.blocked_time_s ,
+                 'lag'            : max( 0, self.bus.write_seq - self.cursor ) }
+
+    #-------------------------------------------------------------------------
+    def is_valid(self) -> bool:
+        '''Returns True if the last returned frame is still in the bus.
+        
+        See method 'FrameBus.is_valid()'.
+        '''
+        return self.bus.is_valid( self.last_seq )
+
+    #-------------------------------------------------------------------------
+    def unsubscribe(self) -> None:
+        '''Removes this subscriber from its bus.
+        '''
+        self.bus.unsubscribe( self.name )
+
+    #-------------------------------------------------------------------------
+    def _aligned(self, seq: int) -> int:
+        '''Returns the first sequence number not less than seq this subscriber may read.
+        '''
+        if self.policy == SubscriptionPolicy.EVERY_NTH:
+            return -(-seq // self.nth) * self.nth
+        return seq
+
+    #-------------------------------------------------------------------------
+    def _apply_policy(self, write_seq: int) -> None:
+        '''Moves the cursor of this subscriber forward according to its policy.
+        
+        Args:
+            write_seq: int
+                The sequence number of the next frame to be pub-
+                lished on the bus.  At least one frame is then
+                available for this subscriber.
+        '''
+        if self.policy == SubscriptionPolicy.LATEST_ONLY:
+            oldest = write_seq - 1 - self.delay
+        elif self.policy == SubscriptionPolicy.DROP_OLDEST:
+            oldest = write_seq - self.queue_size
+        else:
+            oldest = write_seq - self.bus.capacity
+        
+        if self.cursor < oldest:
+            self._drop_to( self._aligned(oldest) )
+
+    #-------------------------------------------------------------------------
+    def _drop_to(self, seq: int) -> None:
+        '''Moves the cursor of this subscriber forward, counting dropped frames.
+        '''
+        with self._read_done:
+            self.dropped_count += (seq - self.cursor) // self.nth
+            self.cursor = seq
+
+    #-------------------------------------------------------------------------
+    def _wait_for_read(self, seq: int) -> None:
+        '''Waits for this subscriber to have read the frame with this sequence number.
+        
+        Called by the writer of the bus with LOSSLESS subscribers
+        only. The wait never lasts longer than the block budget
+        of this subscriber.
+        '''
+        if self.cursor > seq:
+            return
+        start = time.perf_counter()
+        with self._read_done:
+            if not self._read_done.wait_for( lambda: self.cursor > seq, self.block_budget_s ):
+                self.blocked_count += 1
+        self.blocked_time_s += time.perf_counter() - start
+
+#=====   end of   src.Buffers.frame_bus   =====#
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import numpy as np
+from threading   import Lock
+from typing      import Tuple
+
+
+#=============================================================================
+class TripleBuffer:
+    """The class of triple buffers of preallocated arrays.
+    
+    Triple buffers are made of three  arrays  which  are
+    allocated  once  and  then  reused:  the  front  one
+    is the last published one,  the back one is the one
+    that is being filled by the writer,  and  the  third
+    one is the previously published front one,  that may
+    still be in use by some reader.
+    
+    The writer gets the back array with method 'get_back()',
+    fills it in place and then publishes it with  method
+    'publish()',  which  is a single index assignment and
+    so is atomic.  Readers get the front array with method
+    'get()',  without any lock and without any copy. The
+    returned array is never written by the writer while it
+    is the front one nor while it is the previous front one:
+    readers are then guaranteed to get stable and complete
+    data for,  at least,  one whole writing period after
+    the next publishing.
+    
+    Notice: a triple buffer has one writer at a time.  Method
+            'set()' may be used by concurrent writers since
+            it writes under the lock of the buffer.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, shape: Tuple[int, ...] = None,
+                       dtype: type            = np.uint8) -> None:
+        '''Constructor.
+        
+        Args:
+            shape: Tuple[int, ...]
+                The shape of the three arrays of this  buffer.
+                If None, they are allocated on their first use.
+                Defaults to None.
+            dtype: type
+                The type of the items of the arrays. Defaults
+                to 'np.uint8'.
+        '''
+        self.buffers = [ None, None, None ]
+        self.dtype = dtype
+        self.index = None  # the index of the front array, None while nothing has been published
+        self.lock = Lock()
+        if shape is not None:
+            self.buffers = [ np.empty(shape, dtype) for _ in range(3) ]
+
+    #-------------------------------------------------------------------------
+    def get(self) -> np.ndarray:
+        '''Returns a reference to the front array, or None if no array has been published yet.
+        
+        This is lock-free and copy-free.  The returned array
+        must not be modified.
+        '''
+        index = self.index  # read once, since the writer may publish meanwhile
+        return None if index is None else self.buffers[ index ]
+
+    #-------------------------------------------------------------------------
+    def get_back(self, shape: Tuple[int, ...]) -> np.ndarray:
+        '''Returns a reference to the back array, to be filled in place by the writer.
+        
+        The back array is allocated again only if its shape
+        differs from the specified one, i.e. when the size of
+        the written data changes.
+        
+        Args:
+            shape: Tuple[int, ...]
+                The shape of the data to be written.
+        '''
+        back = self._back_index()
+        buffer = self.buffers[ back ]
+        if buffer is None or buffer.shape != shape:
+            buffer = self.buffers[ back ] = np.empty( shape, self.dtype )
+        return buffer
+
+    #-------------------------------------------------------------------------
+    def publish(self) -> None:
+        '''Makes the back array the front one.
+        
+        The array returned by the last call to 'get_back()'
+        must have been completely filled before this call.
+        '''
+        self.index = self._back_index()
+
+    #-------------------------------------------------------------------------
+    def set(self, data: np.ndarray) -> None:
+        '''Copies data into the back array and publishes it.
+        
+        No array is allocated, unless the shape of the data
+        changes.
+        '''
+        with self.lock:
+            np.copyto( self.get_back(data.shape), data )
+            self.publish()
+
+    #-------------------------------------------------------------------------
+    def _back_index(self) -> int:
+        '''Returns the index of the back array.
+        
+        This is the array published before the previous front
+        one, i.e. the oldest one.
+        '''
+        return 0 if self.index is None else (self.index + 1) % 3
+
+#=====   end of   src.Buffers.triple_buffer   =====#
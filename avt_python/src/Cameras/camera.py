@@ -29,11 +29,14 @@ SOFTWARE.
 
 
 #=============================================================================
-from typing import Any
+from threading import Lock
+import time
+from typing import Any, Iterable, List
 import cv2
 import numpy as np
 
-from src.Utils.types import Frame
+from .capture_mode      import CaptureMode, ThroughputPolicy
+from src.Utils.types    import Frame
 
 
 #=============================================================================
@@ -71,11 +74,17 @@ class Camera:
                 to this height before being delivered.
         '''
         self.cam_id = cam_id
+        self._props = {}
+        self._props_lock = Lock()
+        self.props_refresh_time = time.perf_counter()
         self.hndl = cv2.VideoCapture( cam_id )
+        self.placeholder_frame = None
         self._copy_default_hw_size()
         self.set_frames_size( width, height )
+        self.last_mode = None
         if self.is_ok():
             self.period = 1.0 / self.get_fps()
+            self.last_mode = self.get_mode()
 
     #-------------------------------------------------------------------------
     def __del__(self) -> None:
@@ -87,28 +96,26 @@ class Camera:
     def get_fps(self) -> float:
         '''Returns the frame rate of this video capturing device.
         '''
-        try:
-            return self.hndl.get( cv2.CAP_PROP_FPS )
-        except:
-            return 0.0 
+        return self.get_property( cv2.CAP_PROP_FPS )
     
+    #-------------------------------------------------------------------------
+    def get_fourcc(self) -> str:
+        '''Returns the four characters code of the captured frames pixel format.
+        '''
+        code = int( self.get_property(cv2.CAP_PROP_FOURCC) )
+        return ''.join( chr((code >> 8*i) & 0xff) for i in range(4) ).strip( '\0' )
+
     #-------------------------------------------------------------------------
     def get_hw_height(self) -> int:
-        '''Returns the height of rames as set in the H/W device.
+        '''Returns the height of frames as set in the H/W device.
         '''
-        try:
-            return int( self.hndl.get(cv2.CAP_PROP_FRAME_HEIGHT) )
-        except:
-            return 0
+        return int( self.get_property(cv2.CAP_PROP_FRAME_HEIGHT) )
 
     #-------------------------------------------------------------------------
     def get_hw_width(self) -> int:
-        '''Returns the width of rames as set in the H/W device.
+        '''Returns the width of frames as set in the H/W device.
         '''
-        try:
-            return int( self.hndl.get(cv2.CAP_PROP_FRAME_WIDTH) )
-        except:
-            return 0
+        return int( self.get_property(cv2.CAP_PROP_FRAME_WIDTH) )
 
     #-------------------------------------------------------------------------
     def get_id(self) -> int:
@@ -116,14 +123,78 @@ class Camera:
         '''
         return self.cam_id + 1
 
+    #-------------------------------------------------------------------------
+    def get_mode(self) -> CaptureMode:
+        '''Returns the capture mode as currently achieved by the H/W device.
+        '''
+        return CaptureMode( self.get_fourcc(), self.get_hw_width(), self.get_hw_height(), self.get_fps() )
+
+    #-------------------------------------------------------------------------
+    def get_property(self, prop_id: int) -> float:
+        '''Returns the value of a property of the H/W device.
+        
+        Values are cached. The driver is only queried when the
+        property has not been read yet since  the  last  inval-
+        idation of the cache. See methods 'invalidate_proper-
+        ties()' and 'refresh_properties()'.
+        
+        Args:
+            prop_id: int
+                The OpenCV identifier of the property, i.e. one
+                of the 'cv2.CAP_PROP_XXX' values.
+        
+        Returns:
+            The value of the property, or 0.0 in case of error.
+        '''
+        try:
+            return self._props[ prop_id ]
+        except KeyError:
+            try:
+                value = self.hndl.get( prop_id )
+            except:
+                value = 0.0
+            with self._props_lock:
+                self._props[ prop_id ] = value
+            return value
+
+    #-------------------------------------------------------------------------
+    def get_placeholder_frame(self) -> Frame:
+        '''Returns the frame that stands for not acquired frames.
+        
+        This frame is preallocated  when  the  H/W size of the
+        captured frames is set,  i.e.  at creation time and on
+        any capture mode or size change,  so that it is never
+        built in the capture loop.  It must not be modified by
+        callers.
+        '''
+        return self.placeholder_frame
+
     #-------------------------------------------------------------------------
     def get_period(self) -> float:
         '''Returns the frames period for this video capturing device.
         '''
-        try:
-            return 1.0 / self.get_fps()
-        except:
-            return 0.0
+        fps = self.get_fps()
+        return 1.0 / fps if fps > 0 else 0.0
+
+    #-------------------------------------------------------------------------
+    def invalidate_properties(self, prop_ids: Iterable[int] = None) -> None:
+        '''Invalidates cached values of properties of the H/W device.
+        
+        Invalidated properties get queried to  the  driver  on
+        their next reading.
+        
+        Args:
+            prop_ids: Iterable[int]
+                The OpenCV identifiers of the properties to  be
+                invalidated.  Defaults to None,  in which case
+                all cached properties are invalidated.
+        '''
+        with self._props_lock:
+            if prop_ids is None:
+                self._props = {}
+            else:
+                for prop_id in prop_ids:
+                    self._props.pop( prop_id, None )
 
     #-------------------------------------------------------------------------
     def is_ok(self) -> bool:
@@ -131,6 +202,71 @@ class Camera:
         '''
         return self.get_hw_width() != 0
 
+    #-------------------------------------------------------------------------
+    def negotiate_mode(self, policy        : int = ThroughputPolicy.MAX_FPS,
+                             bandwidth_mbps: float = None                  ,
+                             candidates    : Iterable[CaptureMode] = None  ) -> CaptureMode:
+        '''Selects and sets the best capture mode for this camera.
+        
+        Args:
+            policy: int
+                One of the policies of class ThroughputPolicy.
+                Defaults to ThroughputPolicy.MAX_FPS.
+            bandwidth_mbps: float
+                The bandwidth share of this camera, in Mbit/s.
+                Only  used  with  policy  BANDWIDTH_BUDGET.
+                Defaults to None (i.e. no limit).
+            candidates: Iterable[CaptureMode]
+                The candidate capture modes.  Defaults to None,
+                in which case 'CaptureMode.CANDIDATES' is used
+                instead.
+        
+        Returns:
+            The capture mode that is achieved by the H/W device.
+        '''
+        mode = ThroughputPolicy.select( self.probe_modes(candidates), policy, bandwidth_mbps )
+        if mode is None:
+            return self.get_mode()
+        return self.set_mode( mode )
+
+    #-------------------------------------------------------------------------
+    def probe_modes(self, candidates: Iterable[CaptureMode] = None) -> List[CaptureMode]:
+        '''Returns the capture modes that are accepted by this camera.
+        
+        Each candidate mode is set on the H/W device and  the 
+        achieved  mode  is  read back.  The candidate is kept
+        only if its pixel format and its size  are  achieved.
+        Its  frame  rate is the one that is reported by the
+        device (drivers generally round the requested fps to
+        the closest available one).
+        The initial capture mode is restored on completion.
+        
+        Args:
+            candidates: Iterable[CaptureMode]
+                The candidate capture modes.  Defaults to None,
+                in which case 'CaptureMode.CANDIDATES' is used
+                instead.
+        
+        Returns:
+            The list of the achieved capture modes, without any
+            duplicate.
+        '''
+        if not self.is_ok():
+            return []
+        
+        initial_mode = self.get_mode()
+        modes = []
+        
+        for candidate in (CaptureMode.CANDIDATES if candidates is None else candidates):
+            achieved = self.set_mode( candidate )
+            if (achieved.fourcc == candidate.fourcc and
+                    achieved.width == candidate.width and achieved.height == candidate.height and
+                    achieved.fps > 0 and achieved not in modes):
+                modes.append( achieved )
+        
+        self.set_mode( initial_mode )
+        return modes
+
     #-------------------------------------------------------------------------
     def read(self) -> Frame:
         '''Reads next frame.
@@ -141,18 +277,61 @@ class Camera:
         
         Returns:
             A reference to the captured image,  or None  in 
-            case of error.
+            case of error.  See method 'get_placeholder_frame()'
+            to get a frame standing for missing ones.
         '''
         try:
             ok, frame = self.hndl.read()
-            self.last_frame = frame
             return frame if ok else None
         except:
+            return None
+
+    #-------------------------------------------------------------------------
+    def reconnect(self) -> bool:
+        '''Reopens the video capturing device of this camera.
+        
+        The last capture mode that has been achieved by  the
+        device is set back on success.
+        
+        Returns:
+            True if the device has been reopened, or False
+            otherwise.
+        '''
+        self.release()
+        try:
+            self.hndl = cv2.VideoCapture( self.cam_id )
+        except:
+            return False
+        self.refresh_properties()
+        if not self.is_ok():
+            return False
+        
+        if self.last_mode is not None:
+            self.set_mode( self.last_mode )
+        elif self.hw_frames_size:
+            self.set_frames_size()
+        return True
+        
+    #-------------------------------------------------------------------------
+    def refresh_properties(self) -> None:
+        '''Queries again the driver for all cached properties.
+        
+        The new values replace the cached ones at once, so that
+        readers never have to wait for the driver.  This method
+        is  expected  to  be called by the acquisition thread,
+        either after a change of  capture  mode  or  on  a  slow
+        health timer.
+        '''
+        props = {}
+        for prop_id in (self._props.keys() | self.CACHED_PROPS):
             try:
-                return self.last_frame
+                props[ prop_id ] = self.hndl.get( prop_id )
             except:
-                return np.zeros( (480,640,3), np.uint8 )
-        
+                props[ prop_id ] = 0.0
+        with self._props_lock:
+            self._props = props
+        self.props_refresh_time = time.perf_counter()
+
     #-------------------------------------------------------------------------
     def release(self) -> None:
         '''Releases all resources that have been allocated with this camera.
@@ -166,28 +345,34 @@ class Camera:
     def set_frames_size(self, width: int = None, height: int = None) -> None:
         '''Sets the size of captured frames when delivered.
         
-        These values are used to resize delivered frames. See
-        method  'read()'  to get an understanding of how they 
-        are used.  Both must be either set or None.  If None,
-        the  default  H /W  values are used instead - this is
-        something like a reset to the H/W values.
+        Method 'read()' returns the captured frames  as  is.
+        These values are used by the acquisition thread of the
+        camera, which scales the captured frames to this size
+        before publishing them - see method 'CameraAcquisition.
+        _scale()' - unless full resolution has been requested,
+        for instance while recording. The views then place the
+        delivered frames in their own geometry - see class
+        'FrameTransform'.  Both must be either set or None. If
+        None,  the default H/W values are used instead - this
+        is something like a reset to the H/W values.
         
         Args:
             width: int
                 The wished width for the acquired  frames.  If
                 set to None,  the camera default value is used
-                instead.  If set,  captures frames are resized
-                to this width before being delivered.
+                instead.  If set,  captured frames are scaled
+                to this width before being published.
             height: int
                 The wished height for the acquired frames.  If
                 set to None,  the camera default value is used
-                instead.  If set,  captures frames are resized
-                to this height before being delivered.
+                instead.  If set,  captured frames are scaled
+                to this height before being published.
         
         Raises:
             AssertionError: width  and  height  are  not  both 
                 either set or None.
         '''
+        self.hw_frames_size = width is None
         if width is None:
             assert height is None, "both arguments must be None."
             self.width  = self.get_hw_width()
@@ -196,6 +381,39 @@ class Camera:
             assert height is not None, "both arguments must be set."
             self.width, self.height = width, height
 
+    #-------------------------------------------------------------------------
+    def set_mode(self, mode: CaptureMode) -> CaptureMode:
+        '''Sets the capture mode of the H/W device.
+        
+        The pixel format is set first since, with many drivers,
+        it conditions the available sizes and frame rates.
+        
+        Args:
+            mode: CaptureMode
+                A reference to the wished capture mode.
+        
+        Returns:
+            The capture mode that is achieved by the H/W device,
+            which may differ from the wished one.
+        '''
+        if mode.fourcc:
+            self.hndl.set( cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc) )
+        self.hndl.set( cv2.CAP_PROP_FRAME_WIDTH , mode.width  )
+        self.hndl.set( cv2.CAP_PROP_FRAME_HEIGHT, mode.height )
+        if mode.fps > 0:
+            self.hndl.set( cv2.CAP_PROP_FPS, mode.fps )
+        self.refresh_properties()
+        
+        self._copy_default_hw_size()
+        if self.hw_frames_size:
+            self.set_frames_size()
+        
+        achieved = self.get_mode()
+        if achieved.fps > 0:
+            self.period = 1.0 / achieved.fps
+        self.last_mode = achieved
+        return achieved
+
     #-------------------------------------------------------------------------
     def set_hw_dims(self, width: int = None, height: int = None) -> None:
         '''Sets the physical dimensions of captured frames.
@@ -227,6 +445,7 @@ class Camera:
             assert height is None
             self.hndl.set( cv2.CAP_PROP_FRAME_WIDTH , self.hw_default_width  )
             self.hndl.set( cv2.CAP_PROP_FRAME_HEIGHT, self.hw_default_height )
+            self.invalidate_properties( (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT) )
         
         else:
             assert height is not None
@@ -234,6 +453,7 @@ class Camera:
                 raise ValueError( 'Dimensions must be greater than zero.' )
             self.hndl.set( cv2.CAP_PROP_FRAME_WIDTH , width  )
             self.hndl.set( cv2.CAP_PROP_FRAME_HEIGHT, height )
+            self.invalidate_properties( (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT) )
             self._copy_default_hw_size()  # this call is mandatory because passed arguments may be wrong according to the device H/W
  
     #-------------------------------------------------------------------------
@@ -262,6 +482,17 @@ class Camera:
         except:
             raise AttributeError( f"'{name}' is not an attribute of OpenCV VideoCapture cameras.")
  
+    #-------------------------------------------------------------------------
+    def _build_placeholder_frame(self) -> None:
+        '''Preallocates the placeholder frame with the H/W size of the captured frames.
+        
+        The frame is only reallocated when this size has changed.
+        '''
+        shape = ( self.hw_default_height or self.PLACEHOLDER_HEIGHT,
+                  self.hw_default_width  or self.PLACEHOLDER_WIDTH , 3 )
+        if self.placeholder_frame is None or self.placeholder_frame.shape != shape:
+            self.placeholder_frame = np.full( shape, self.PLACEHOLDER_GRAY_LEVEL, np.uint8 )
+
     #-------------------------------------------------------------------------
     def _copy_default_hw_size(self)-> None:
         '''Remembers the currently H/W dimensions of captured frames.
@@ -272,6 +503,18 @@ class Camera:
         '''
         self.hw_default_width  = self.get_hw_width()
         self.hw_default_height = self.get_hw_height()
+        self._build_placeholder_frame()
+
+    #-------------------------------------------------------------------------
+    # Class data
+    CACHED_PROPS = { cv2.CAP_PROP_FOURCC      ,
+                     cv2.CAP_PROP_FPS         ,
+                     cv2.CAP_PROP_FRAME_HEIGHT,
+                     cv2.CAP_PROP_FRAME_WIDTH  }
+
+    PLACEHOLDER_GRAY_LEVEL = 16
+    PLACEHOLDER_HEIGHT     = 480
+    PLACEHOLDER_WIDTH      = 640
 
 
 #=============================================================================
@@ -298,6 +541,8 @@ class NullCamera( Camera ):
                 cameras get their status as being True. 
         '''
         self.cam_id = cam_id   
+        self._props = { prop_id: 0.0 for prop_id in self.CACHED_PROPS }
+        self._props_lock = Lock()
 
     #-------------------------------------------------------------------------
     def is_ok(self) -> bool:
@@ -24,12 +24,20 @@ SOFTWARE.
 
 #=============================================================================
 import cv2
-from threading   import Event, Thread
+import numpy as np
+from threading   import Event, Lock, Thread
 import time
+from typing      import Tuple
 
+from src.App.avt_config                  import AVTConfig
 from .camera                             import Camera
-from src.Buffers.camera_frames_buffer    import CameraFramesBuffer
+from .camera_health                      import CameraHealth
+from src.Buffers.frame_bus               import FrameBus
 from src.Utils.indexed_frame             import IndexedFrame
+from src.Utils.Scheduling                import Scheduler
+from src.Utils.Scheduling.opencv_threads import OpenCVStage, OpenCVThreads
+from src.Utils.Scheduling.threads_policy import ThreadsPolicy
+from src.Utils.types                     import Frame
 
 
 #=============================================================================
@@ -37,26 +45,33 @@ class CameraAcquisition( Thread ):
     """The class description.
     """
     #-------------------------------------------------------------------------
-    def __init__(self, camera      : Camera,
-                       frame_buffer: CameraFramesBuffer) -> None:
+    def __init__(self, camera   : Camera  ,
+                       frame_bus: FrameBus ) -> None:
         '''Constructor.
         
         CameraAcquisition instances are thread  that  capture
-        video frame from cameras at their own pace. They fill
-        buffers that can be read by external threads.
+        video frame from cameras at their own pace. They pub-
+        lish them on a frame bus  to  which  external  threads
+        subscribe.
         
         Args:
             camera: Camera
                 A reference to the associated camera instance.
-            frame_buffer: CameraFramesBuffer
-                A reference to the camera frames  buffer  that
-                is associated with the specified camera.
+            frame_bus: FrameBus
+                A reference to the frame bus that is associated
+                with the specified camera.
         '''
         self.camera = camera
-        self.buffer = frame_buffer
+        self.bus = frame_bus
         self.stop_event = Event()
+        self.wake_event = Event()
         self.fps = self.camera.get_fps()
-        self.flip_status = True
+        self.frames_count = 0
+        self.health = CameraHealth()
+        self.full_res_requests = 0
+        self.full_res_lock = Lock()
+        self._slots = [ None ] * (frame_bus.capacity + 1)
+        self._slot_index = 0
         super().__init__( name=f"cam-acq-{camera.get_id()}-thrd" )
 
     #-------------------------------------------------------------------------
@@ -72,35 +87,72 @@ class CameraAcquisition( Thread ):
         return 1.0 / self.fps if self.fps > 0 else 0.0
 
     #-------------------------------------------------------------------------
-    def flip_image(self) -> None:
-        '''Modifies the image flipping status of the camera acquisition.
+    def release_full_resolution(self) -> None:
+        '''Releases a former request for full resolution frames.
         
-        Facing and sides camera views should be  mirrored, 
-        while up and back ones should not. This is then an 
-        option that is available to the  user  via  a  GUI 
-        control. This method acts as a toggle.
+        This is the counterpart of  method  'request_full_reso-
+        lution()'. Frames get back being scaled at acquisition
+        time once every request has been released.
         '''
-        self.flip_status = not self.flip_status
+        with self.full_res_lock:
+            if self.full_res_requests > 0:
+                self.full_res_requests -= 1
+
+    #-------------------------------------------------------------------------
+    def request_full_resolution(self) -> None:
+        '''Requests for the delivery of frames at full H/W resolution.
+        
+        Recorders and analyzers that need  the  full  resolution
+        of  captured  frames  call this method,  and then call
+        'release_full_resolution()' when they are  done.  While
+        at least one request is pending, frames are not scaled
+        to the frames size of the camera.
+        '''
+        with self.full_res_lock:
+            self.full_res_requests += 1
 
     #-------------------------------------------------------------------------
     def run(self) -> None:
         '''The running loop of this thread.
+        
+        Failing reads are counted in the health of this  acqui-
+        sition.  Once the errors budget is exhausted the camera
+        is reconnected,  with an exponential backoff delay bet-
+        ween successive attempts.  Meanwhile, the preallocated
+        placeholder frame of the camera is delivered instead of
+        captured frames.
+        The cached properties of the camera are refreshed  here
+        on a slow timer,  so that readers of these  properties
+        never wait for the driver.
         '''
         self.stop_event.set()
-        frames_count = 0
+        self.frames_count = 0
         
-        while self.stop_event.is_set():
-            frm = self.camera.read()
-
-            if frm is not None:
-                if self.flip_status:
-                    frm = cv2.flip( frm, 1 )
-                self.buffer.append( IndexedFrame(frames_count, frm) )
-                frames_count += 1
-                time.sleep( 0.004 )
-                
-            else:
-                self.stop()
+        with Scheduler( 1 ) as scheduler, OpenCVStage( OpenCVThreads.ACQUISITION ):
+            cpu = ThreadsPolicy.set_acquisition_thread( scheduler )
+            
+            try:
+                while self.stop_event.is_set():
+                    frm = self.camera.read()
+                    capture_time = time.perf_counter()
+    
+                    if frm is not None:
+                        self.health.new_frame()
+                        self.bus.publish( IndexedFrame(self.frames_count, self._scale(frm), capture_time=capture_time) )
+                        self.frames_count += 1
+                        if time.perf_counter() - self.camera.props_refresh_time >= AVTConfig.CAMERA_PROPERTIES_REFRESH_S:
+                            self._refresh_properties()
+                        time.sleep( 0.004 )
+                    
+                    else:
+                        self.health.new_error()
+                        if self.health.consecutive_errors >= AVTConfig.CAMERA_ERRORS_BUDGET:
+                            self._reconnect()
+                        else:
+                            self.wake_event.wait( self.ERROR_DELAY_S )
+            
+            finally:
+                ThreadsPolicy.release_acquisition_thread( cpu )
 
         self.camera.release()
         
@@ -109,5 +161,103 @@ class CameraAcquisition( Thread ):
         '''Definitively stops this thread.
         '''
         self.stop_event.clear()
+        self.wake_event.set()
+
+    #-------------------------------------------------------------------------
+    def _deliver_placeholder(self) -> None:
+        '''Fills the frame bus with the placeholder frame of the camera.
+        
+        The whole bus is filled so that no former frame  is
+        displayed any more.  The placeholder frame is not copied.
+        '''
+        placeholder = self.camera.get_placeholder_frame()
+        for _ in range( self.bus.capacity ):
+            self.bus.publish( IndexedFrame(self.frames_count, placeholder) )
+            self.frames_count += 1
+
+    #-------------------------------------------------------------------------
+    def _next_slot(self, shape: Tuple[int, int, int]) -> Frame:
+        '''Returns the next preallocated output frame, with the specified shape.
+        
+        There is one more output frame than slots in the frame
+        bus,  so that an output frame is never overwritten while
+        it is still in the bus - see 'FrameBus.is_valid()'.
+        '''
+        self._slot_index = (self._slot_index + 1) % len( self._slots )
+        slot = self._slots[ self._slot_index ]
+        if slot is None or slot.shape != shape:
+            slot = self._slots[ self._slot_index ] = np.empty( shape, np.uint8 )
+        return slot
+
+    #-------------------------------------------------------------------------
+    def _output_size(self, frame: Frame) -> Tuple[int, int]:
+        '''Returns the (width, height) of the frames to be delivered.
+        '''
+        if self.full_res_requests > 0 or self.camera.hw_frames_size:
+            return frame.shape[1], frame.shape[0]
+        return self.camera.width, self.camera.height
+
+    #-------------------------------------------------------------------------
+    def _scale(self, frame: Frame) -> Frame:
+        '''Scales a captured frame into the next output frame.
+        
+        Downscaling uses pyramidal reduction for exact halves 
+        and pixels area relation otherwise,  which both avoid
+        the aliasing of linear interpolation.  Mirroring  is
+        not done here but is folded into the frame transform of
+        the displaying view.
+        
+        Returns:
+            A reference to the scaled frame,  which is the cap-
+            tured one when it is not scaled.
+        '''
+        frame_height, frame_width = frame.shape[:2]
+        width, height = self._output_size( frame )
+        
+        if width == frame_width and height == frame_height:
+            return frame
+        
+        out = self._next_slot( (height, width, frame.shape[2]) )
+        if 2 * width == frame_width and 2 * height == frame_height:
+            cv2.pyrDown( frame, dst=out, dstsize=(width, height) )
+        elif width < frame_width and height < frame_height:
+            cv2.resize( frame, (width, height), dst=out, interpolation=cv2.INTER_AREA )
+        else:
+            cv2.resize( frame, (width, height), dst=out, interpolation=cv2.INTER_LINEAR )
+        return out
+
+    #-------------------------------------------------------------------------
+    def _refresh_properties(self) -> None:
+        '''Refreshes the cached properties of the camera.
+        '''
+        self.camera.refresh_properties()
+        self.fps = self.camera.get_fps()
+
+    #-------------------------------------------------------------------------
+    def _reconnect(self) -> None:
+        '''Reconnects the camera, with exponential backoff between attempts.
+        
+        Returns as soon as the camera has been reconnected or
+        this thread has been stopped.
+        '''
+        print( f"-- camera #{self.camera.get_id()}: too many acquisition errors, reconnecting" )
+        self.health.reconnection_started()
+        self._deliver_placeholder()
+        
+        delay_s = AVTConfig.CAMERA_RECONNECT_MIN_DELAY_S
+        while self.stop_event.is_set():
+            if self.camera.reconnect():
+                self.health.reconnection_succeeded()
+                self.fps = self.camera.get_fps()  # properties just refreshed on reconnection
+                print( f"-- camera #{self.camera.get_id()}: reconnected" )
+                return
+            
+            self.health.reconnection_failed()
+            self.wake_event.wait( delay_s )
+            delay_s = min( 2.0 * delay_s, AVTConfig.CAMERA_RECONNECT_MAX_DELAY_S )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    ERROR_DELAY_S = 0.01
 
 #=====   end of   src.Cameras.camera_acquisition   =====#
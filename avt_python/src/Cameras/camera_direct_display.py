@@ -26,8 +26,9 @@ SOFTWARE.
 from typing import ForwardRef
 
 from .camera                             import Camera
-from src.Buffers.camera_frames_buffer    import CameraFramesBuffer
+from src.Buffers.frame_bus               import FrameBusSubscriber
 from src.Utils.periodical_thread         import PeriodicalThread
+from src.Utils.Scheduling.opencv_threads import OpenCVThreads
 
 
 #=============================================================================
@@ -45,18 +46,23 @@ class CameraDirectDisplay( PeriodicalThread ):
     OpenCV capturing of webcams is not that periodical.
     """
     #-------------------------------------------------------------------------
-    def __init__(self, camera      : Camera            ,
-                       frame_buffer: CameraFramesBuffer,
-                       view        : CameraViewRef      ) -> None:
+    def __init__(self, camera    : Camera            ,
+                       subscriber: FrameBusSubscriber,
+                       view      : CameraViewRef      ) -> None:
         '''Constructor.
         
         Args:
-            cam_acq: CameraAcquisition
-                A reference to the associated instance of a 
-                camera acquisition.
+            camera: Camera
+                A reference to the displayed camera.
+            subscriber: FrameBusSubscriber
+                A reference to the subscriber of this display
+                to the frame bus of the camera.
+            view: CameraView
+                A reference to the view into which frames are
+                displayed.
         '''
         self.camera      = camera
-        self.buffer      = frame_buffer
+        self.subscriber  = subscriber
         self.first_frame = True
         self.cam_view    = view
         super().__init__( self.camera.get_period(), f"cam-displ-{camera.get_id()}-thrd" )
@@ -66,22 +72,38 @@ class CameraDirectDisplay( PeriodicalThread ):
     def period(self) -> float:
         return self.period_s
 
+    #-------------------------------------------------------------------------
+    def finalize_run_loop(self) -> None:
+        '''Leaves the display stage of the OpenCV threads budget.
+        '''
+        OpenCVThreads.leave_stage( OpenCVThreads.DISPLAY )
+
+    #-------------------------------------------------------------------------
+    def initialize_run_loop(self) -> None:
+        '''Enters the display stage of the OpenCV threads budget.
+        '''
+        OpenCVThreads.enter_stage( OpenCVThreads.DISPLAY )
+
     #-------------------------------------------------------------------------
     def process(self) -> bool:
         '''The processing core of this periodical thread.
         
+        Frames keep on being read while their view replays a
+        recorded session,  but they are not displayed.
+        
         Returns:
             True if processing is to be kept on,  or False  if
             this thread must be definitively stopped.
         '''
-        indexed_frame = self.buffer.get_oldest()
+        indexed_frame = self.subscriber.get_next()
         
-        if indexed_frame.frame is not None:
+        if indexed_frame is not None:
             if self.first_frame:
                 self.first_frame = False
                 self.set_start_time()
         
-            self.cam_view.draw_frame( indexed_frame.frame )
+            if not self.cam_view.b_replaying:
+                self.cam_view.draw_frame( indexed_frame.frame )
 
         return True
         
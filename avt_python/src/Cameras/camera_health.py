@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import time
+from typing import Any, Dict
+
+
+#=============================================================================
+class CameraHealth:
+    """The class of cameras acquisitions health.
+    
+    The health of an acquisition is updated by the acquisition
+    thread only.  It can be read at any time by the UI or for
+    metrics purposes.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self) -> None:
+        '''Constructor.
+        '''
+        self.status               = self.OK
+        self.frames_count         = 0
+        self.errors_count         = 0
+        self.consecutive_errors   = 0
+        self.reconnections_count  = 0
+        self.failed_reconnections = 0
+        self.last_error_time      = None
+
+    #-------------------------------------------------------------------------
+    def get_metrics(self) -> Dict[str, Any]:
+        '''Returns the health metrics as a dictionary.
+        '''
+        return { 'status'              : self._STATUS_TEXTS[ self.status ],
+                 'frames_count'        : self.frames_count,
+                 'errors_count'        : self.errors_count,
+                 'consecutive_errors'  : self.consecutive_errors,
+                 'reconnections_count' : self.reconnections_count,
+                 'failed_reconnections': self.failed_reconnections,
+                 'last_error_time'     : self.last_error_time }
+
+    #-------------------------------------------------------------------------
+    def get_text(self) -> str:
+        '''Returns a short text describing the current health status.
+        '''
+        return self._STATUS_TEXTS[ self.status ]
+
+    #-------------------------------------------------------------------------
+    def is_ok(self) -> bool:
+        '''Returns True if frames are currently acquired without errors.
+        '''
+        return self.status == self.OK
+
+    #-------------------------------------------------------------------------
+    def new_error(self) -> None:
+        '''Records a failed frame acquisition.
+        '''
+        self.errors_count       += 1
+        self.consecutive_errors += 1
+        self.last_error_time = time.time()
+        if self.status == self.OK:
+            self.status = self.DEGRADED
+
+    #-------------------------------------------------------------------------
+    def new_frame(self) -> None:
+        '''Records a successful frame acquisition.
+        '''
+        self.frames_count += 1
+        self.consecutive_errors = 0
+        if self.status != self.OK:
+            self.status = self.OK
+
+    #-------------------------------------------------------------------------
+    def reconnection_failed(self) -> None:
+        '''Records a failed reconnection attempt.
+        '''
+        self.failed_reconnections += 1
+        if self.failed_reconnections >= self.LOST_RECONNECTIONS_COUNT:
+            self.status = self.LOST
+
+    #-------------------------------------------------------------------------
+    def reconnection_started(self) -> None:
+        '''Records the start of a reconnection sequence.
+        '''
+        self.status = self.RECONNECTING
+        self.failed_reconnections = 0
+
+    #-------------------------------------------------------------------------
+    def reconnection_succeeded(self) -> None:
+        '''Records a successful reconnection.
+        '''
+        self.reconnections_count += 1
+        self.consecutive_errors = 0
+        self.status = self.DEGRADED  # back to OK on next acquired frame
+
+    #-------------------------------------------------------------------------
+    # Class data
+    OK           = 0
+    DEGRADED     = 1
+    RECONNECTING = 2
+    LOST         = 3
+
+    LOST_RECONNECTIONS_COUNT = 5
+
+    _STATUS_TEXTS = { OK          : 'ok',
+                      DEGRADED    : 'degraded',
+                      RECONNECTING: 'reconnecting...',
+                      LOST        : 'lost - reconnecting...' }
+
+#=====   end of   src.Cameras.camera_health   =====#
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import glob
+import os
+import re
+from threading   import Lock, Thread
+from typing      import List, Optional
+
+from src.App.avt_config  import AVTConfig
+from .camera             import Camera
+from src.Utils.system    import System
+
+
+#=============================================================================
+class CameraProbe( Thread ):
+    """The class of cameras probes.
+    
+    Opening a video capturing device may take a  long  time,
+    or may even hang with some drivers.  Probes open devices
+    in  their  own  daemon  thread,  so  that  many  of them
+    can be probed concurrently and so that a hanging  device
+    never blocks the application:  once its timeout has been
+    reached, a probe is abandoned and the camera it may open
+    later is released.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, cam_id: int) -> None:
+        '''Constructor.
+        
+        Args:
+            cam_id: int
+                The OpenCV identifier of the probed camera.
+        '''
+        super().__init__( name=f"cam-probe-{cam_id}-thrd", daemon=True )
+        self.cam_id = cam_id
+        self.camera = None
+        self.abandoned = False
+        self.lock = Lock()
+
+    #-------------------------------------------------------------------------
+    def get_camera(self, timeout_s: float = None) -> Optional[Camera]:
+        '''Returns the probed camera,  waiting for it at most timeout seconds.
+        
+        Args:
+            timeout_s: float
+                The max duration of the wait,  expressed  in
+                fractional seconds.  Defaults to None,  i.e.
+                the  per-device  timeout of the AVT configur-
+                ation.
+        
+        Returns:
+            A reference to the opened camera, or None if no
+            camera is connected with this identifier or if
+            the probe has timed out. Timed out probes are
+            abandoned.
+        '''
+        self.join( AVTConfig.CAMERA_PROBE_TIMEOUT_S if timeout_s is None else timeout_s )
+        with self.lock:
+            if self.is_alive():
+                self.abandoned = True
+            return self.camera
+
+    #-------------------------------------------------------------------------
+    @staticmethod
+    def get_candidate_ids() -> List[int]:
+        '''Returns the sorted list of the identifiers of the candidate cameras.
+        
+        On Linux,  the candidates are enumerated from the V4L2
+        devices  '/dev/video*'.  Notice:  some of them may be
+        metadata devices that will fail at probing time.
+        On other platforms, the first 'CAMERAS_PROBED_COUNT'
+        identifiers are candidates.
+        '''
+        if System.is_linux():
+            ids = []
+            for dev_path in glob.glob( '/dev/video*' ):
+                match = re.fullmatch( r'video(\d+)', os.path.basename(dev_path) )
+                if match:
+                    ids.append( int(match.group(1)) )
+            return sorted( ids )
+        else:
+            return list( range(AVTConfig.CAMERAS_PROBED_COUNT) )
+
+    #-------------------------------------------------------------------------
+    def run(self) -> None:
+        '''The probing of the camera.
+        '''
+        camera = Camera( self.cam_id )
+        if not camera.is_ok():
+            camera.release()
+            camera = None
+        
+        with self.lock:
+            if self.abandoned:
+                if camera is not None:
+                    camera.release()
+            else:
+                self.camera = camera
+
+#=====   end of   src.Cameras.camera_probe   =====#
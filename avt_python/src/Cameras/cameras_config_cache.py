@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import json
+import os
+from threading   import Lock
+from typing      import Any, Dict, List
+
+from src.App.avt_config  import AVTConfig
+from .camera             import Camera
+
+
+#=============================================================================
+CameraEntry = Dict[ str, Any ]
+
+
+#=============================================================================
+class CamerasConfigCache:
+    """The persistent cache of the last known good cameras configuration.
+    
+    This is a namespace for class methods only.  The cache is
+    a JSON file which contains one entry per camera,  sorted
+    according to the cameras order in the pool.  Each entry
+    gets the OpenCV identifier of the device and its capture
+    mode (pixel format, width, height and frame rate).
+    
+    The entries of negotiated capture modes also get the cond-
+    itions they have been negotiated in - see 'negotiation_of()'
+    -  so that modes are negotiated again when these conditions
+    have changed,  e.g.  when cameras have been connected since
+    then: the USB bandwidth budget is then shared between more
+    cameras.  Newly connected cameras get no such conditions.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def entry_of(cls, camera: Camera, negotiation: Dict[str, Any] = None) -> CameraEntry:
+        '''Returns the cache entry of a camera.
+        
+        Args:
+            camera: Camera
+                A reference to a connected camera.
+            negotiation: Dict[str, Any]
+                The conditions the capture mode of the camera has
+                been negotiated in,  or None if it has not been
+                negotiated. Defaults to None.
+        '''
+        entry = { 'cam_id': camera.cam_id, **camera.get_mode().to_dict() }
+        if negotiation is not None:
+            entry[ 'negotiation' ] = negotiation
+        return entry
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def is_negotiated(cls, entries: List[CameraEntry]) -> bool:
+        '''Returns True if the capture modes of cached entries have been negotiated for them.
+        
+        This is the case when all of them have been negotiated
+        together,  with the current capture policy and USB band-
+        width budget.
+        '''
+        negotiation = cls.negotiation_of( len(entries) )
+        return all( entry.get('negotiation') == negotiation for entry in entries )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def negotiation_of(cls, cameras_count: int) -> Dict[str, Any]:
+        '''Returns the conditions of the negotiation of capture modes for a count of cameras.
+        '''
+        return { 'cameras_count' : cameras_count,
+                 'policy'        : AVTConfig.CAPTURE_POLICY,
+                 'bandwidth_mbps': AVTConfig.USB_BANDWIDTH_BUDGET_MBPS }
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def load(cls) -> List[CameraEntry]:
+        '''Returns the cached cameras entries.
+        
+        Returns:
+            The list of the cached entries,  which is empty if
+            no cache is available or if it cannot be read.
+        '''
+        with cls._lock:
+            try:
+                with open( AVTConfig.CAMERAS_CACHE_PATH ) as fp:
+                    entries = json.load( fp )
+                return [ e for e in entries if isinstance(e, dict) and 'cam_id' in e ]
+            except (OSError, ValueError, TypeError):
+                return []
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def save(cls, cameras    : List[Camera],
+                  new_cameras: List[Camera] = () ) -> None:
+        '''Saves the configuration of the specified cameras.
+        
+        Args:
+            cameras: List[Camera]
+                The list of the cameras of the pool,  the capture
+                modes of which have been negotiated together.
+            new_cameras: List[Camera]
+                The list of the cameras that have been connected
+                since then,  with not negotiated capture  modes.
+                Defaults to an empty list.
+        '''
+        negotiation = cls.negotiation_of( len(cameras) )
+        entries = sorted( [ *(cls.entry_of(camera, negotiation) for camera in cameras),
+                            *(cls.entry_of(camera) for camera in new_cameras) ],
+                          key=lambda entry: entry['cam_id'] )
+        with cls._lock:
+            try:
+                os.makedirs( os.path.dirname(AVTConfig.CAMERAS_CACHE_PATH), exist_ok=True )
+                tmp_path = AVTConfig.CAMERAS_CACHE_PATH + '.tmp'
+                with open( tmp_path, 'w' ) as fp:
+                    json.dump( entries, fp, indent=1 )
+                os.replace( tmp_path, AVTConfig.CAMERAS_CACHE_PATH )
+            except OSError as e:
+                print( f"!!! cameras configuration cannot be cached ({e})" )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _lock = Lock()
+
+#=====   end of   src.Cameras.cameras_config_cache   =====#
@@ -23,14 +23,20 @@ SOFTWARE.
 """
 
 #=============================================================================
+from threading   import Thread
 import time
-from types   import TracebackType
-from typing  import ForwardRef, Tuple, Type
+from types       import TracebackType
+from typing      import ForwardRef, Iterable, List, Tuple, Type
 
 from src.App.avt_config      import AVTConfig
 from src.GUIItems.avt_fonts  import AVTConsoleFont
 from .camera                 import Camera
+from .camera_probe           import CameraProbe
+from .capture_mode           import CaptureMode
+from .cameras_config_cache   import CamerasConfigCache, CameraEntry
 from src.Shapes.point        import Point
+from src.Utils.Scheduling    import Scheduler
+from src.Utils.Scheduling.threads_policy import ThreadsPolicy
 
 
 #=============================================================================
@@ -75,6 +81,19 @@ class  CamerasPool( list ):
         Initializes the pool of cameras according to  the 
         currently connected ones.
         
+        Warm start: the cameras of the last known good config-
+        uration are opened first. If they all are still conn-
+        ected, their configuration is verified and updated in
+        a background thread while the application goes on.
+        Their cached capture modes are applied if they have been
+        negotiated for this set of cameras,  otherwise - e.g.
+        once a newly connected camera has been cached - modes
+        are negotiated again.
+        
+        Cold start: all candidate devices are probed  concur-
+        rently,  each with its own timeout. A missing camera
+        never prevents the next ones from being found.
+        
         Args:
             parent_window: MainWindowRef
                 A reference to the containing main window.
@@ -85,25 +104,161 @@ class  CamerasPool( list ):
         x, y = 20, 40
         y_offset = 24
         
-        for camera_index in range( AVTConfig.CAMERAS_MAX_COUNT ):
-            
+        AVTConsoleFont.forced_draw_text( parent_window,
+                                         Point(x, y),
+                                         "testing connection of cameras " )
+        
+        cached_entries = CamerasConfigCache.load()[ :AVTConfig.CAMERAS_MAX_COUNT ]
+        cameras = self._probe( [entry['cam_id'] for entry in cached_entries] )
+        warm_start = len( cached_entries ) > 0 and len( cameras ) == len( cached_entries )
+        
+        b_negotiate = not warm_start or not CamerasConfigCache.is_negotiated( cached_entries )
+        
+        if warm_start:
+            if not b_negotiate:
+                self._apply_cached_modes( cameras, cached_entries )
+        else:
+            opened_ids = [ camera.cam_id for camera in cameras ]
+            cameras += self._probe( [cam_id for cam_id in CameraProbe.get_candidate_ids()
+                                                if cam_id not in opened_ids] )
+            cameras.sort( key=lambda camera: camera.cam_id )
+        
+        for camera in cameras[ AVTConfig.CAMERAS_MAX_COUNT: ]:
+            camera.release()
+        self.extend( cameras[ :AVTConfig.CAMERAS_MAX_COUNT ] )
+        
+        if b_negotiate:
+            self.negotiate_modes()
+        
+        for index, camera in enumerate( self ):
+            y += y_offset
             AVTConsoleFont.forced_draw_text( parent_window,
                                              Point(x, y),
-                                             f"testing connection of camera #{camera_index+1} " )            
-
-            camera = Camera( camera_index )
-             
-            if camera.is_ok():
-                self.append( camera )
-
-            else:
-                AVTConsoleFont.forced_draw_text( parent_window,
-                                                 Point(x, y+y_offset),
-                                                 f"camera #{camera_index+1} not connected or not found" )
-                time.sleep( 1.750 )
-                del camera
-                break
+                                             f"camera #{index+1} connected (device {camera.cam_id}, {camera.get_mode()})" )
+        if len( self ) == 0:
+            AVTConsoleFont.forced_draw_text( parent_window,
+                                             Point(x, y+y_offset),
+                                             "no camera connected or found" )
+            time.sleep( 1.750 )
+        
+        if warm_start:
+            self.verification_thread = Thread( target=self._verify_cached_configuration,
+                                               name="cams-config-verif-thrd",
+                                               daemon=True )
+            self.verification_thread.start()
+        else:
+            CamerasConfigCache.save( self )
+
+    #-------------------------------------------------------------------------
+    def negotiate_modes(self, policy: int = None) -> None:
+        '''Negotiates the capture modes of all the cameras of this pool.
+        
+        With policy BANDWIDTH_BUDGET, the USB bandwidth budget
+        of the AVT configuration is evenly shared between  the
+        cameras,  so that many cameras connected  to  the  same
+        USB controller do not saturate it.  Cameras are nego-
+        tiated concurrently.
+        
+        Args:
+            policy: int
+                One of the policies of class ThroughputPolicy.
+                Defaults to None,  in which case the policy of
+                the AVT configuration is used.
+        '''
+        if len( self ) == 0:
+            return
+        
+        policy = AVTConfig.CAPTURE_POLICY if policy is None else policy
+        bandwidth_share = AVTConfig.USB_BANDWIDTH_BUDGET_MBPS / len( self )
+        
+        threads = [ Thread( target=camera.negotiate_mode,
+                            args=(policy, bandwidth_share),
+                            name=f"cam-mode-{camera.cam_id}-thrd" ) for camera in self ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for index, camera in enumerate( self ):
+            print( f"-- camera #{index+1} capture mode: {camera.get_mode()}" )
+
+    #-------------------------------------------------------------------------
+    def _apply_cached_modes(self, cameras       : List[Camera],
+                                  cached_entries: List[CameraEntry]) -> None:
+        '''Applies the cached capture modes to the warm started cameras.
+        
+        Args:
+            cameras: List[Camera]
+                The list of the opened cameras, in the same order
+                as the cached entries.
+            cached_entries: List[CameraEntry]
+                The list of the cached entries.
+        '''
+        for camera, entry in zip( cameras, cached_entries ):
+            mode = CaptureMode.from_dict( entry )
+            if mode is not None and mode != camera.get_mode():
+                camera.set_mode( mode )
+
+    #-------------------------------------------------------------------------
+    @staticmethod
+    def _probe(cam_ids  : Iterable[int],
+               b_verbose: bool = True  ) -> List[Camera]:
+        '''Concurrently probes the specified cameras.
+        
+        All  the probes share the same deadline,  which is the
+        per-device timeout of the AVT configuration.
+        
+        Args:
+            cam_ids: Iterable[int]
+                The OpenCV identifiers of the probed cameras.
+            b_verbose: bool
+                Set this to True to print the identifiers  of
+                the not found cameras on console, or False
+                otherwise. Defaults to True.
+        
+        Returns:
+            The list of the connected cameras, in the order of
+            the passed identifiers.
+        '''
+        probes = [ CameraProbe(cam_id) for cam_id in cam_ids ]
+        for probe in probes:
+            probe.start()
+        
+        deadline = time.perf_counter() + AVTConfig.CAMERA_PROBE_TIMEOUT_S
+        cameras = []
+        for probe in probes:
+            camera = probe.get_camera( max(0.0, deadline - time.perf_counter()) )
+            if camera is not None:
+                cameras.append( camera )
+            elif b_verbose:
+                print( f"-- camera device {probe.cam_id} not connected or not found" )
+        
+        return cameras
+
+    #-------------------------------------------------------------------------
+    def _verify_cached_configuration(self) -> None:
+        '''Verifies the cached configuration against the whole set of candidate cameras.
+        
+        Runs in a background thread after a warm start,  with
+        the background policy of the application applied: it
+        is deferrable work which must not delay the acquisi-
+        tions that are already running.  The cameras  that  are  not  in  this pool are probed and
+        released.  The cache is updated with the whole set of
+        connected cameras, so that newly connected ones are 
+        used at next start.
+        '''
+        with Scheduler( 3 ) as scheduler:
+            ThreadsPolicy.set_background_thread( scheduler )
             
-            y += y_offset
+            pool_ids = [ camera.cam_id for camera in self ]
+            new_cameras = self._probe( [cam_id for cam_id in CameraProbe.get_candidate_ids()
+                                                    if cam_id not in pool_ids],
+                                      False )
+            
+            CamerasConfigCache.save( self, new_cameras )
+        
+        for camera in new_cameras:
+            print( f"-- camera device {camera.cam_id} newly connected, will be used at next start" )
+            camera.release()
         
 #=====   end of   src.Cameras.cameras_pool   =====#
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class CaptureMode
+#    class ThroughputPolicy
+#
+
+
+#=============================================================================
+from typing import Any, Dict, ForwardRef, List, Optional
+
+
+#=============================================================================
+CaptureModeRef = ForwardRef( "CaptureMode" )
+
+
+#=============================================================================
+class CaptureMode:
+    """The class of cameras capture modes.
+    
+    A capture mode is the association of a pixel format
+    (FOURCC code),  of a frame size and of a frame rate.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, fourcc: str  ,
+                       width : int  ,
+                       height: int  ,
+                       fps   : float ) -> None:
+        '''Constructor.
+        
+        Args:
+            fourcc: str
+                The four characters code of the pixel format of
+                the captured frames, e.g. 'MJPG' or 'YUYV'.
+            width, height: int
+                The size of the captured frames, in pixels.
+            fps: float
+                The frame rate of the captures, in frames per
+                second.
+        '''
+        self.fourcc = fourcc
+        self.width  = int( width )
+        self.height = int( height )
+        self.fps    = float( fps )
+
+    #-------------------------------------------------------------------------
+    @property
+    def bandwidth_mbps(self) -> float:
+        '''The estimated bus bandwidth used by this mode, in Mbit/s.
+        '''
+        bytes_per_pixel = self._BYTES_PER_PIXEL.get( self.fourcc, 3.0 )
+        return self.pixels_count * bytes_per_pixel * self.fps * 8 / 1_000_000
+
+    #-------------------------------------------------------------------------
+    @property
+    def pixels_count(self) -> int:
+        return self.width * self.height
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, mode_dict: Dict[str, Any]) -> Optional[CaptureModeRef]:
+        '''Returns a new capture mode from its dictionary,  or None if not valid.
+        
+        Args:
+            mode_dict: Dict[str, Any]
+                A dictionary as returned by method 'to_dict()'.
+        '''
+        try:
+            return CaptureMode( mode_dict['fourcc'], mode_dict['width'],
+                                mode_dict['height'], mode_dict['fps']    )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    #-------------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        '''Returns the dictionary of this capture mode.
+        '''
+        return { 'fourcc': self.fourcc,
+                 'width' : self.width ,
+                 'height': self.height,
+                 'fps'   : self.fps    }
+
+    #-------------------------------------------------------------------------
+    def __eq__(self, other: CaptureModeRef) -> bool:
+        '''Returns True if both capture modes are the same.
+        '''
+        try:
+            return (self.fourcc, self.width, self.height, round(self.fps)) == \
+                   (other.fourcc, other.width, other.height, round(other.fps))
+        except AttributeError:
+            return False
+
+    #-------------------------------------------------------------------------
+    def __hash__(self) -> int:
+        return hash( (self.fourcc, self.width, self.height, round(self.fps)) )
+
+    #-------------------------------------------------------------------------
+    def __str__(self) -> str:
+        return f"{self.fourcc} {self.width}x{self.height} @ {self.fps:.1f} fps"
+
+    #-------------------------------------------------------------------------
+    # Class data
+    # Notice: MJPG bytes per pixel is an estimation for usual webcams compression
+    _BYTES_PER_PIXEL = { 'MJPG': 0.25,
+                         'YUYV': 2.0 ,
+                         'YUY2': 2.0 ,
+                         'NV12': 1.5 ,
+                         'BGR3': 3.0  }
+
+    CANDIDATES: List[CaptureModeRef] = []  # set at end of module
+
+
+#=============================================================================
+CaptureMode.CANDIDATES = [ CaptureMode(fourcc, width, height, fps)
+                                for fourcc in ('MJPG', 'YUYV')
+                                    for (width, height) in ((1920, 1080), (1280, 720), (640, 480))
+                                        for fps in (60.0, 30.0) ]
+
+
+#=============================================================================
+class ThroughputPolicy:
+    """The 'enumeration' class of the capture modes selection policies.
+    """
+    MAX_FPS          = 0  # the highest frame rate, then the highest resolution
+    MAX_RESOLUTION   = 1  # the highest resolution, then the highest frame rate
+    BANDWIDTH_BUDGET = 2  # the highest frame rate, then resolution, within a bandwidth share
+    
+    NAMES = { MAX_FPS         : 'max-fps'         ,
+              MAX_RESOLUTION  : 'max-resolution'  ,
+              BANDWIDTH_BUDGET: 'bandwidth-budget' }
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def select(cls, modes          : List[CaptureMode],
+                    policy         : int              ,
+                    bandwidth_mbps : float = None      ) -> Optional[CaptureMode]:
+        '''Returns the best capture mode according to a policy.
+        
+        Args:
+            modes: List[CaptureMode]
+                The list of the capture modes that are available
+                with a camera.
+            policy: int
+                One of the policies of this class.
+            bandwidth_mbps: float
+                The bandwidth share of the camera, in Mbit/s. Only
+                used with policy BANDWIDTH_BUDGET.  Defaults to
+                None (i.e. no limit).
+        
+        Returns:
+            The selected capture mode,  or None if no mode  is
+            available. With policy BANDWIDTH_BUDGET, the least
+            demanding mode is selected when no mode fits in the
+            bandwidth share.
+        '''
+        if not modes:
+            return None
+        
+        if policy == cls.MAX_RESOLUTION:
+            return max( modes, key=lambda m: (m.pixels_count, m.fps, -m.bandwidth_mbps) )
+        
+        if policy == cls.BANDWIDTH_BUDGET and bandwidth_mbps is not None:
+            fitting_modes = [ m for m in modes if m.bandwidth_mbps <= bandwidth_mbps ]
+            if not fitting_modes:
+                return min( modes, key=lambda m: m.bandwidth_mbps )
+            modes = fitting_modes
+        
+        return max( modes, key=lambda m: (m.fps, m.pixels_count, -m.bandwidth_mbps) )
+
+#=====   end of   src.Cameras.capture_mode   =====#
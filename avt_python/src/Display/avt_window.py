@@ -25,15 +25,18 @@ SOFTWARE.
 #=============================================================================
 import cv2
 import numpy as np
+import threading
 import time
 
 from typing      import ForwardRef, Tuple
-from threading   import Lock
+from threading   import RLock
 
 from src.App.avt_config              import AVTConfig
 from src.GUIItems.Cursor.cursor      import Cursor_NORMAL
-from src.Buffers.flip_flop_buffer    import FlipFlopBuffer
-from src.Utils.rgb_color             import RGBColor
+from src.Buffers.triple_buffer       import TripleBuffer
+from .frame_transform                import FrameTransform
+from .monitors                       import Monitors
+from src.Utils.rgb_color             import Palette, RGBColor
 from .view                           import View
 from src.GUIItems.viewable           import Viewable
 
@@ -53,7 +56,9 @@ class AVTWindow( Viewable ):
                        height  : int = None,
                        bg_color: RGBColor = AVTConfig.DEFAULT_BACKGROUND,
                        *,
-                       full_screen: bool = False) -> None:
+                       full_screen  : bool = False,
+                       monitor_index: int  = None,
+                       b_zero_copy  : bool = None ) -> None:
         '''Constructor.
         
         Args:
@@ -84,6 +89,21 @@ class AVTWindow( Viewable ):
                 takes precedence over 'width'  and  'height'  when
                 set  to  True.  Defaults  to  False (i.e. not full
                 screen). This argument must be named at call time.
+            monitor_index: int
+                The index of the monitor on which this window is
+                to be displayed.  If None,  the  window  is  left
+                where  the  windowing  system  places it.  This
+                argument must be named at call time. Defaults to
+                None.
+            b_zero_copy: bool
+                Set this to True to get the contents of the views
+                of this window as sub-views of the window content:
+                views then draw in place and are never copied into
+                this window content.  Set it to False to get  views
+                drawn  in  their own contents and then copied.  If
+                None, 'AVTConfig.ZERO_COPY_VIEWS' is used.  This
+                argument must be named at call time.  Defaults to
+                None.
         
         Raises:
             ValueError: width and height must be both set or both 
@@ -91,13 +111,14 @@ class AVTWindow( Viewable ):
                 Furthermore,  this exception is raised when width
                 or size are negative or zero.
         '''
-        self.lock = Lock()
+        self.lock = RLock()  # views drawing in place may hold it while calling back this window
         
         self.name = self._get_default_name() if name is None else str(name)
         
-        self.bg_color = bg_color
+        self.bg_color = Palette.freeze( bg_color )
         self.full_screen = full_screen
         self.fixed_size = True
+        self.b_zero_copy = AVTConfig.ZERO_COPY_VIEWS if b_zero_copy is None else b_zero_copy
         
         if full_screen:
             cv2.namedWindow( self.name, cv2.WINDOW_FULLSCREEN )
@@ -116,15 +137,19 @@ class AVTWindow( Viewable ):
             cv2.namedWindow( self.name, cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO | cv2.WINDOW_GUI_EXPANDED )
             cv2.resizeWindow( self.name, width, height )
             Cursor_NORMAL.activate()
+        
+        self.monitor_index = monitor_index
+        if monitor_index is not None:
+            self._move_to_monitor( monitor_index )
 
         self.set_title( f"AVT Window # {self.__WINDOWS_COUNT}" if title is None else title )
 
         width, height = self.get_size()
         super().__init__( 0, 0, width, height, bg_color )
-        self.content_buffer = FlipFlopBuffer()
-        self.content_buffer.set( self.content )
-        self.content_buffer.set( self.content )  # intentionally done twice
+        self.content_buffer = TripleBuffer()  # the shown canvases
+        self.scaling = FrameTransform( border_gray=0 )
         self.last_time = time.perf_counter()
+        self.b_dirty = True
             
     #-------------------------------------------------------------------------
     def draw(self, b_forced    : bool = False,
@@ -135,6 +160,12 @@ class AVTWindow( Viewable ):
                 the  window  current  size  if this window has 
                 been created with a specified size.
         
+        Notice: OpenCV windows must be shown by the main thread
+                only.  When called by any other thread, this
+                method just marks the content as to be presented,
+                which is then done by the presenter tick of the
+                event loop - see method 'present_if_dirty()'.
+        
         Args:
             b_forced: bool
                 Set this to True to get immediate  drawing  of
@@ -157,13 +188,58 @@ class AVTWindow( Viewable ):
             displaying   this  content,   or  -1 if no key was
             hit after expressed delay.
         '''
-        current_time = time.perf_counter()
-        if not b_forced and current_time - self.last_time < 0.007:
+        self.b_dirty = True
+        if threading.current_thread() is not threading.main_thread():
+            return -1
+        
+        if not b_forced and time.perf_counter() - self.last_time < 0.007:
             # Notice: this is NOT satisfactory but it avoids  nearly  all
             #         video sync issues with the displayed buffer content
             return -1
-       
-        self.last_time = current_time
+        
+        self.present()
+        return cv2.waitKey( hit_delay_ms )
+
+    #-------------------------------------------------------------------------
+    def on_mouse(self, mouse_data: object) -> None:
+        '''Handles the mouse events that occur in this window.
+        
+        May be overwritten in inheriting classes.  In this base
+        class, does nothing.
+        
+        Args:
+            mouse_data: Event.MouseData
+                A reference to the data of the mouse event, with
+                coordinates in this window content.
+        '''
+        pass
+
+    #-------------------------------------------------------------------------
+    def present(self) -> None:
+        '''Shows the current content of this window.
+        
+        Every window gets its own lock,  content and scaling
+        cache, so that windows displayed on monitors of very
+        different resolutions do not throttle each other.
+        Views draw into the content of this window while the
+        canvases of the triple buffer 'content_buffer' are
+        shown:  the content is copied or warped into its back
+        canvas, which is then published as the front one and
+        shown. This is done under the lock of this window,
+        which views drawing in place hold also, so that no
+        half-drawn view is ever shown.  Any other thread may
+        get the last shown canvas with 'content_buffer.get()',
+        without lock and without copy.
+        When this window has been created with  a  specified
+        size,  its content is letterboxed into the current
+        size of the window with a single affine warp  whose
+        matrix  is  evaluated only when one of both  sizes
+        changes.
+        
+        Must be called by the main thread only.
+        '''
+        self.b_dirty = False
+        self.last_time = time.perf_counter()
         
     #===========================================================================
     #     with self.lock:
@@ -206,45 +282,22 @@ class AVTWindow( Viewable ):
     #         ##self.content = self.content_buffer.get()
     #===========================================================================
         with self.lock:
-            window_content = self.content.copy()
-    
-        #=======================================================================
-        # if not self.fixed_size:
-        #     #-- the window size automatically adapts itself to the content size
-        #     pass
-        # else:
-        #=======================================================================
-        if self.fixed_size:
-            #-- the content size adapts itself to the window size
-            content_height, content_width = window_content.shape[:2]
-            window_width, window_height = self.get_size()
-            
-            height_ratio = window_height / content_height
-            width_ratio  = window_width  / content_width
-            ratio = height_ratio if height_ratio <= width_ratio else width_ratio
-        
-            if ratio != 1.0 and ratio > 0.0:
-                window_content = np.zeros( (window_height, window_width, 3), np.uint8 )
-                new_content = cv2.resize( window_content, None,
-                                          fx=ratio, fy=ratio,
-                                          interpolation=cv2.INTER_LINEAR )
-                
-                new_height, new_width = new_content.shape[:2]
-                if new_width > window_width:
-                    new_width = window_width
-                if new_height > window_height:
-                    new_height = window_height
-                    
-                x = (window_width - new_width) // 2
-                y = (window_height - new_height) // 2
-                
-                window_content[ y:y+new_height,
-                                x:x+new_width, : ] = new_content[ :new_height, :new_width, : ] 
-        
-        self.content_buffer.set( window_content )
+            window_content = self._scaled_content() if self.fixed_size else None
+            if window_content is None:
+                window_content = self._swapped_content()
+            self.content_buffer.publish()
         
         cv2.imshow( self.name, window_content )
-        return cv2.waitKey( hit_delay_ms )
+
+    #-------------------------------------------------------------------------
+    def present_if_dirty(self) -> None:
+        '''Shows the content of this window if it has been modified since last shown.
+        
+        This is the presenter tick of the event loop. Must be
+        called by the main thread only.
+        '''
+        if self.b_dirty:
+            self.present()
 
     #-------------------------------------------------------------------------
     def get_pos(self) -> Tuple[int, int]:
@@ -264,15 +317,49 @@ class AVTWindow( Viewable ):
         '''
         return  cv2.getWindowImageRect( self.name )[2:]
 
+    #-------------------------------------------------------------------------
+    def get_view_slice(self, view: View) -> np.ndarray:
+        '''Returns the part of this window content that is covered by a view.
+        
+        The returned array is a sub-view of  this  window
+        content,  not a copy of it:  drawing into it draws
+        in place into this window content.
+        
+        Args:
+            view: View
+                A reference to a view of this window.
+        
+        Returns:
+            The sub-view of this window content,  or None if
+            this window is not in zero-copy mode or if the view
+            is not fully contained in this window content.
+        '''
+        if not self.b_zero_copy:
+            return None
+        with self.lock:
+            if self.content is None:
+                return None
+            content_height, content_width = self.content.shape[:2]
+            if view.x + view.width > content_width or view.y + view.height > content_height:
+                return None
+            return self.content[ view.y:view.y+view.height, view.x:view.x+view.width, : ]
+
     #-------------------------------------------------------------------------
     def insert_view_content(self, view: View) -> None:
         '''Inserts the content of a view in this window content.
         
+        Nothing is copied when the content of the view is a
+        sub-view of this window content - see method
+        'get_view_slice()'.
+        
         Args:
             view: View
                 A reference to the view from which the content
                 is to be inserted in this window content.
         '''
+        if view.content is not None and view.content.base is self.content:
+            return  # drawn in place
+        
         with self.lock:
             content_height, content_width = self.content.shape[:2]
             
@@ -291,6 +378,24 @@ class AVTWindow( Viewable ):
         '''
         return cv2.getWindowProperty( self.name, cv2.WND_PROP_VISIBLE ) >= 1
 
+    #-------------------------------------------------------------------------
+    def set_content_size(self, width: int, height: int) -> None:
+        '''Creates again the content of this window with a new size.
+        
+        The new content is filled with the background color of
+        this window.  Views have then to be inserted  again  in
+        it, or to be attached to it in zero-copy mode  -  see
+        method 'View.set_rect()'.
+        
+        Args:
+            width, height: int
+                The new size of the content,  expressed in pixels.
+        '''
+        with self.lock:
+            self.width, self.height = width, height
+            self.create_content()
+        self.b_dirty = True
+
     #-------------------------------------------------------------------------
     def set_title(self, title: str) -> None:
         '''Sets the title of this window as shown in its top bar.
@@ -301,6 +406,21 @@ class AVTWindow( Viewable ):
         '''
         cv2.setWindowTitle( self.name, str(title) )
 
+    #-------------------------------------------------------------------------
+    def update_layout(self) -> bool:
+        '''Lays out the content of this window again if its size has changed.
+        
+        This is the layout tick of the event loop.  May  be
+        overwritten in inheriting classes.  In this base class,
+        does nothing and returns False: the content  is  then
+        scaled at presentation time.
+        
+        Returns:
+            True if the content of this window has been laid out
+            again, or False otherwise.
+        '''
+        return False
+
     #-------------------------------------------------------------------------
     def _get_default_name(self) -> str:
         '''Returns a unique default name for this window.
@@ -314,6 +434,59 @@ class AVTWindow( Viewable ):
             self.__WINDOWS_COUNT += 1
         return name
 
+    #-------------------------------------------------------------------------
+    def _move_to_monitor(self, monitor_index: int) -> None:
+        '''Moves this window to the top-left corner of the specified monitor.
+        
+        Full screen windows are set full screen  once  moved,
+        which gets them full screen on the specified monitor.
+        '''
+        try:
+            geometry = Monitors().get_geometry( monitor_index )
+        except (IndexError, TypeError):
+            print( f"!!! monitor #{monitor_index} is not connected, window '{self.name}' stays on primary monitor" )
+            return
+        
+        if geometry is not None:
+            cv2.moveWindow( self.name, geometry.x, geometry.y )
+        if self.full_screen:
+            cv2.setWindowProperty( self.name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN )
+
+    #-------------------------------------------------------------------------
+    def _scaled_content(self) -> np.ndarray:
+        '''Returns the content of this window scaled to the window size.
+        
+        Must be called with the lock of this window acquired.
+        The content is warped into the back canvas,  which  is
+        allocated again only when the size of this window
+        changes.
+        
+        Returns:
+            A reference to the back canvas,  or None if the content
+            has not to be scaled.
+        '''
+        window_width, window_height = self.get_size()
+        content_height, content_width = self.content.shape[:2]
+        if window_width <= 0 or window_height <= 0 or \
+                (window_width, window_height) == (content_width, content_height):
+            return None
+        
+        canvas = self.content_buffer.get_back( (window_height, window_width, 3) )
+        self.scaling.apply( self.content, canvas )
+        return canvas
+
+    #-------------------------------------------------------------------------
+    def _swapped_content(self) -> np.ndarray:
+        '''Returns the back canvas, once updated with the content of this window.
+        
+        Must be called with the lock of this window acquired.
+        The back canvas is allocated again only when the size
+        of this window content changes.
+        '''
+        canvas = self.content_buffer.get_back( self.content.shape )
+        np.copyto( canvas, self.content )
+        return canvas
+
     #-------------------------------------------------------------------------
     # Class data
     __WINDOWS_COUNT = 0
@@ -23,21 +23,20 @@ SOFTWARE.
 """
 
 #=============================================================================
-import cv2
-import numpy as np
 from typing import ForwardRef
 
 from src.App.avt_config                  import AVTConfig
 from .avt_view_prop                      import AVTViewProp
 from .avt_window                         import AVTWindowRef
+from .frame_transform                    import FrameTransform
 from src.Cameras.camera                  import Camera
 from src.Cameras.camera_acquisition      import CameraAcquisition
 from src.Cameras.camera_direct_display   import CameraDirectDisplay
-from src.Buffers.camera_frames_buffer    import CameraFramesBuffer
+from src.Buffers.frame_bus               import FrameBus, SubscriptionPolicy
 from src.GUIItems.font                   import Font
 from src.Utils.types                     import Frame
 from src.Display.fps_rate                import FPSRateFrames
-from src.Utils.rgb_color                 import RGBColor, YELLOW
+from src.Utils.rgb_color                 import RED, YELLOW
 from src.GUIItems.label                  import Label
 from src.Shapes.rect                     import Rect
   
@@ -86,18 +85,27 @@ class CameraView( AVTViewProp ):
         self.view_name = f"Cam-{camera.get_id()}"
         self.label = Label( self, self.view_name, 20, 40 )
         self.fps_label = Label( self, "", 20, 70, None, Font(14, YELLOW) )
-        self.fps_rate = FPSRateFrames( 15 )
+        self.health_label = Label( self, "", 20, 100, None, Font(14, RED) )
+        self.fps_rate = FPSRateFrames( AVTConfig.FPS_RATE_FRAMES )
+        self.frame_transform = FrameTransform( b_flip=True )
         self.joined = False
+        self.b_replaying = False  # live frames are not displayed while set - see ReplayEngine
         
         self.camera = camera
         CameraView._CAM_VIEWS_COUNT += 1
 
-        camera_frames_buffer = CameraFramesBuffer( 4 )
+        self.frame_bus = FrameBus( AVTConfig.CAMERA_BUS_CAPACITY )
                 
         super().__init__( parent, x, y, width, height, parent_rect )
 
-        self.acq_thread  = CameraAcquisition(   self.camera, camera_frames_buffer )
-        self.disp_thread = CameraDirectDisplay( self.camera, camera_frames_buffer, self )
+        self.acq_thread  = CameraAcquisition(   self.camera, self.frame_bus )
+        self.disp_thread = CameraDirectDisplay( self.camera,
+                                                self.frame_bus.subscribe( self.LIVE_DISPLAY,
+                                                                          SubscriptionPolicy.DROP_OLDEST,
+                                                                          delay=self.LIVE_DISPLAY_DELAY,
+                                                                          queue_size=self.LIVE_DISPLAY_QUEUE_SIZE ),
+                                                self )
+        self.set_frames_size()
         
         self.draw()
 
@@ -106,6 +114,7 @@ class CameraView( AVTViewProp ):
         '''Draws the content of this view.
         '''
         self.draw_fps()
+        self.draw_health()
         self.label.draw()
         self.draw_borders()
         super().draw()
@@ -114,25 +123,22 @@ class CameraView( AVTViewProp ):
     def draw_borders(self) -> None:
         '''Draws lines on this view borders.
         '''
-        bg_color = RGBColor( *AVTConfig.DEFAULT_BACKGROUND.color )
+        bg_color = AVTConfig.DEFAULT_BACKGROUND
+        color = bg_color.to_bgr()
         
-        self.content[  0,  : ] = bg_color.color
-        self.content[  1,  : ] = bg_color.color
-        self.content[ -1,  : ] = bg_color.color
-        self.content[ -2,  : ] = bg_color.color
-        self.content[  :,  0 ] = bg_color.color
-        self.content[  :,  1 ] = bg_color.color
-        self.content[  :, -1 ] = bg_color.color
-        self.content[  :, -2 ] = bg_color.color
-
-        self.content[ 2, 2:-1 ]  = (bg_color / 1.5).color
-        self.content[ 2:-2, 2 ]  = (bg_color / 1.5).color
-        self.content[ -3, 3:-1 ] = (bg_color * 3).color
-        self.content[ 3:-3, -2 ] = (bg_color * 3).color
-        self.content[ 3, 3:-2 ]  = (bg_color / 2).color
-        self.content[ 4:-3, 3 ]  = (bg_color / 2).color
-        self.content[ -4, 4:-2 ] = (bg_color * 1.5).color
-        self.content[ 4:-3, -3 ] = (bg_color * 1.5).color
+        self.content[  0,  : ] = color
+        self.content[  1,  : ] = color
+        self.content[ -1,  : ] = color
+        self.content[ -2,  : ] = color
+        self.content[  :,  0 ] = color
+        self.content[  :,  1 ] = color
+        self.content[  :, -1 ] = color
+        self.content[  :, -2 ] = color
+
+        self.content[ 2, 2:-1 ]  = self.content[ 2:-2, 2 ]  = bg_color.scaled_bgr( 1 / 1.5 )
+        self.content[ -3, 3:-1 ] = self.content[ 3:-3, -2 ] = bg_color.scaled_bgr( 3 )
+        self.content[ 3, 3:-2 ]  = self.content[ 4:-3, 3 ]  = bg_color.scaled_bgr( 1 / 2 )
+        self.content[ -4, 4:-2 ] = self.content[ 4:-3, -3 ] = bg_color.scaled_bgr( 1.5 )
 
     #-------------------------------------------------------------------------
     def draw_fps(self) -> None:
@@ -146,54 +152,70 @@ class CameraView( AVTViewProp ):
 
     #-------------------------------------------------------------------------
     def draw_frame(self, frame: Frame) -> None:
-        '''Draws a new frame within this camera view
-        '''
-        frame_height, frame_width = frame.shape[:2]
-        
-        if frame_width != self.width or frame_height != self.height:
-            
-            ratio_x = self.width / frame_width
-            ratio_y = self.height / frame_height
-            ratio = min( ratio_x, ratio_y )                    
-            frame = cv2.resize( frame, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_LINEAR )
-            
-            new_height, new_width = frame.shape[:2]
-            if new_width > self.width:
-                new_width = self.width
-            if new_height > self.height:
-                new_height = self.height
-                
-            x = (self.width - new_width) // 2
-            y = (self.height - new_height) // 2
-            
-            self.content = np.zeros( (self.height, self.width, 3), np.uint8 ) + 16
-            self.content[ y:y+new_height,
-                          x:x+new_width, : ] = frame[ :new_height, :new_width, : ] 
+        '''Draws a new frame within this camera view.
         
-        else:
-            self.content = frame
-        
-        self.draw()
+        The frame is mirrored, scaled and letterboxed in one
+        single pass into the content of this view.
+        '''
+        with self.drawing_lock():
+            self.frame_transform.apply( frame, self.content )
+            self.draw()
+
+    #-------------------------------------------------------------------------
+    def draw_health(self) -> None:
+        '''Draws the health status of the camera acquisition when not ok.
+        '''
+        try:
+            health = self.acq_thread.health
+        except AttributeError:
+            return  # acquisition thread not yet created
+        if not health.is_ok():
+            self.health_label.text = f"camera {health.get_text()}"
+            self.health_label.draw()
 
     #-------------------------------------------------------------------------
     def flip_image(self) -> None:
-        '''Modifies the image flipping status of the camera acquisition.
+        '''Modifies the image flipping status of this view.
         
         Facing and sides camera views should be  mirrored, 
         while up and back ones should not. This is then an 
         option that is available to the  user  via  a  GUI 
         control. This method acts as a toggle.
         '''
-        self.acq_thread.flip_image()
+        self.frame_transform.toggle_flip()
+
+    #-------------------------------------------------------------------------
+    def get_health_metrics(self) -> dict:
+        '''Returns the health metrics of the camera acquisition and of its frame bus subscribers.
+        '''
+        return { **self.acq_thread.health.get_metrics(),
+                 'subscribers': self.frame_bus.get_stats() }
+
+    #-------------------------------------------------------------------------
+    def get_threads(self) -> list:
+        '''Returns the threads that are associated with this view.
+        '''
+        return [ self.acq_thread, self.disp_thread ]
 
     #-------------------------------------------------------------------------
     def is_ok(self) -> bool:
         '''Returns True when status of this camera acquisition thread is ok, or False otherwise.
+        
+        The camera must have been open, and its latest capture
+        must have succeeded,  as set in the health of the acqui-
+        sition - see class 'CameraHealth' - so that an unplugged
+        camera gets not ok at once,  rather than once its cached
+        properties are refreshed.
         '''
         try:
-            return self.camera.hw_default_width != 0
+            if self.camera.hw_default_width == 0:
+                return False
         except:
             return False
+        try:
+            return self.acq_thread.health.is_ok()
+        except AttributeError:
+            return True  # acquisition thread not yet created
 
     #-------------------------------------------------------------------------
     def join(self) -> None:
@@ -204,6 +226,34 @@ class CameraView( AVTViewProp ):
             self.disp_thread.join()
             self.joined = True
 
+    #-------------------------------------------------------------------------
+    def on_resize(self) -> None:
+        '''Adapts the size of the acquired frames to the new size of this view.
+        '''
+        self.set_frames_size()
+
+    #-------------------------------------------------------------------------
+    def set_frames_size(self) -> None:
+        '''Sets the size of the frames delivered by the camera acquisition.
+        
+        Frames get scaled by the frame transform of this view,
+        unless they have to be strongly downscaled. They are
+        then scaled at acquisition time to the largest size
+        that fits into this view while preserving their aspect
+        ratio, which avoids aliasing.
+        '''
+        hw_width, hw_height = self.camera.hw_default_width, self.camera.hw_default_height
+        if hw_width <= 0 or hw_height <= 0 or self.width <= 0 or self.height <= 0:
+            return
+        
+        ratio = FrameTransform.fit_ratio( hw_width, hw_height, self.width, self.height )
+        if ratio > FrameTransform.MIN_WARP_RATIO:
+            self.camera.set_frames_size()
+            return
+        
+        self.camera.set_frames_size( max(1, min(self.width , round(hw_width  * ratio))),
+                                     max(1, min(self.height, round(hw_height * ratio))) )
+
     #-------------------------------------------------------------------------
     def start(self) -> None:
         '''Starts every internal thread.
@@ -221,6 +271,11 @@ class CameraView( AVTViewProp ):
         self.join()
 
     #-------------------------------------------------------------------------
+    # Class data
+    LIVE_DISPLAY       = 'live-display'
+    LIVE_DISPLAY_DELAY = AVTConfig.LIVE_DISPLAY_DELAY  # frames, absorbs the jitter of OpenCV capturing
+    LIVE_DISPLAY_QUEUE_SIZE = AVTConfig.LIVE_DISPLAY_QUEUE_SIZE  # frames, bounds the latency of the display
+
     _CAM_VIEWS_COUNT = 0
 
 #=====   end of   src.Display.camera_view   =====#
@@ -31,12 +31,15 @@ from src.App.avt_config              import AVTConfig
 from .avt_view                       import AVTView
 from .view                           import AVTWindowRef, View
 from src.GUIItems.font               import BoldFont, Font
+from src.GUIItems.icons              import Icons, LazyIcon
 from src.Cameras.camera              import Camera, NullCamera
 from src.Cameras.cameras_pool        import CamerasPool
 from src.GUIItems.Controls.sliders   import FloatSlider, IntSlider
 from src.GUIItems.label              import Label
 from src.Utils.periodical_thread     import PeriodicalThread
 from src.Shapes.point                import Point
+from src.Shapes.rect                 import Rect
+from src.Shapes.rects_index          import RectsIndex
 
 
 #=============================================================================
@@ -77,15 +80,18 @@ class ControlView( PeriodicalThread, AVTView ):
         '''
         y = 15 + self.ICON_PADDING
 
+        # Notice: cameras identifiers may not be contiguous, so the
+        #         controls are placed according to the pool order.
         self.cameras_ctrls = [ self._CtrlCamera(camera,
                                                 None,
-                                                y + self.ICON_HEIGHT*camera.cam_id) for camera in cameras_pool ]
-        for cam_id in range( len(cameras_pool), AVTConfig.CAMERAS_MAX_COUNT ):
+                                                y + self.ICON_HEIGHT*index) for index, camera in enumerate(cameras_pool) ]
+        cameras_rows = max( len(cameras_pool), self.MIN_CAMERAS_ROWS )
+        for cam_id in range( len(cameras_pool), cameras_rows ):
             self.cameras_ctrls.append( self._CtrlCamera( NullCamera( cam_id ),
                                                          None,
                                                          y + self.ICON_HEIGHT*cam_id ) )
         
-        y += AVTConfig.CAMERAS_MAX_COUNT * self.ICON_HEIGHT + 6
+        y += cameras_rows * self.ICON_HEIGHT + 6
         self.target_ctrl = self._CtrlTarget( 5, y, False, False )
         
         y += 2 * self.ICON_PADDING + self.ICON_HEIGHT
@@ -126,36 +132,40 @@ class ControlView( PeriodicalThread, AVTView ):
                                 self.time_ctrl    ,
                                 self.exit_ctrl      ]
         
+        self.hit_index = RectsIndex( (ctrl.get_rect(), ctrl) for ctrl in self.controls_list )
+        self.hovered_ctrl = None
+        
     #-------------------------------------------------------------------------
     def draw(self) -> None:
         '''Draws this view content within the parent window.
         '''
-        self.draw_borders()
-        self.draw_controls()
-        super().draw()
+        with self.drawing_lock():
+            self.draw_borders()
+            self.draw_controls()
+            super().draw()
 
     #-------------------------------------------------------------------------
     def draw_borders(self) -> None:
         '''Draws lines on this view borders.
         '''
         bg_color = self.bg_color
-        self.content = cv2.rectangle( self.content,
-                                      (3, 3), (self.width-2, self.height-2),
-                                      (bg_color / 2).color,
-                                      1, cv2.LINE_4 )
-        self.content = cv2.rectangle( self.content,
-                                      (4, 4), (self.width-3, self.height-3),
-                                      (bg_color / 2).color,
-                                      1, cv2.LINE_4 )
-
-        self.content = cv2.rectangle( self.content,
-                                      (1, 1), (self.width-4, self.height-4),
-                                      (bg_color * 2).color,
-                                      1, cv2.LINE_4 )
-        self.content = cv2.rectangle( self.content,
-                                      (2, 2), (self.width-5, self.height-5),
-                                      (bg_color * 2).color,
-                                      1, cv2.LINE_4 )
+        cv2.rectangle( self.content,
+                       (3, 3), (self.width-2, self.height-2),
+                       (bg_color / 2).color,
+                       1, cv2.LINE_4 )
+        cv2.rectangle( self.content,
+                       (4, 4), (self.width-3, self.height-3),
+                       (bg_color / 2).color,
+                       1, cv2.LINE_4 )
+
+        cv2.rectangle( self.content,
+                       (1, 1), (self.width-4, self.height-4),
+                       (bg_color * 2).color,
+                       1, cv2.LINE_4 )
+        cv2.rectangle( self.content,
+                       (2, 2), (self.width-5, self.height-5),
+                       (bg_color * 2).color,
+                       1, cv2.LINE_4 )
 
     #-------------------------------------------------------------------------
     def draw_controls(self) -> None:
@@ -170,6 +180,35 @@ class ControlView( PeriodicalThread, AVTView ):
         except:
             pass
         
+    #-------------------------------------------------------------------------
+    def on_mouse(self, mouse_data: object) -> None:
+        '''Handles the mouse events that occur in this view.
+        
+        The control under the mouse cursor is found with the
+        hit-testing index of the controls layout.  Only  the
+        controls that are entered or left get redrawn.
+        
+        Args:
+            mouse_data: Event.MouseData
+                A reference to the data of the mouse event, with
+                coordinates in the parent window content.
+        '''
+        x, y = mouse_data.x - self.x, mouse_data.y - self.y
+        ctrl = self.hit_index.find( x, y )
+        
+        if ctrl is not self.hovered_ctrl:
+            if self.hovered_ctrl is not None:
+                self.hovered_ctrl.on_leave()
+                self.redraw_control( self.hovered_ctrl )
+            if ctrl is not None:
+                ctrl.on_enter()
+                self.redraw_control( ctrl )
+            self.hovered_ctrl = ctrl
+        
+        if ctrl is not None and mouse_data.cv_event == cv2.EVENT_LBUTTONDOWN:
+            if ctrl.on_click( x, y ):
+                self.redraw_control( ctrl )
+
     #-------------------------------------------------------------------------
     def process(self) -> bool:
         '''The processing core of this view thread.
@@ -177,10 +216,52 @@ class ControlView( PeriodicalThread, AVTView ):
         self.draw()
         return True
 
+    #-------------------------------------------------------------------------
+    def redraw_control(self, ctrl: object) -> None:
+        '''Draws one control and then this view content within the parent window.
+        '''
+        with self.drawing_lock():
+            try:
+                ctrl.draw( self )
+            except Exception as e:
+                print( 'caught exception', str(e), 'while drawing control', str(ctrl) )
+            super().draw()
+
+    #-------------------------------------------------------------------------
+    def set_recorder(self, recorder: object) -> None:
+        '''Sets the recorder that is controlled by the record control.
+        
+        The record control is enabled once a recorder is set.
+        
+        Args:
+            recorder: Recorder
+                A reference to the recorder of the cameras,  or
+                None to disable the record control.
+        '''
+        self.record_ctrl.recorder = recorder
+        self.record_ctrl.enabled = recorder is not None
+        self.redraw_control( self.record_ctrl )
+
+    #-------------------------------------------------------------------------
+    def set_replay_engine(self, replay_engine: object) -> None:
+        '''Sets the replay engine that is controlled by the replay control.
+        
+        The replay control is enabled once a replay engine is set.
+        
+        Args:
+            replay_engine: ReplayEngine
+                A reference to the replay engine,  or None  to
+                disable the replay control.
+        '''
+        self.replay_ctrl.engine = replay_engine
+        self.replay_ctrl.enabled = replay_engine is not None
+        self.redraw_control( self.replay_ctrl )
+
     #-------------------------------------------------------------------------
     # Class data
     WIDTH = 96
     ICON_HEIGHT = 40
+    MIN_CAMERAS_ROWS = 4  # rows of cameras controls, NullCamera ones included
     ICON_PADDING = ICON_HEIGHT // 2
         
 
@@ -232,6 +313,7 @@ class ControlView( PeriodicalThread, AVTView ):
             
             self.enabled = enabled
             self.is_active = active
+            self.is_hovered = False
         #---------------------------------------------------------------------
         def draw(self, view: View) -> None:
             '''Draws a control in its embedding content.
@@ -254,10 +336,45 @@ class ControlView( PeriodicalThread, AVTView ):
             except:
                 raise
         #---------------------------------------------------------------------
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            
+            May be overwritten in inheriting classes. In this base
+            class, returns the full-width row of one icon height.
+            '''
+            return Rect( 0, self.y, ControlView.WIDTH, ControlView.ICON_HEIGHT )
+        #---------------------------------------------------------------------
+        def on_click(self, x: int, y: int) -> bool:
+            '''Handles a click on this control.
+            
+            May be overwritten in inheriting classes.  In this base
+            class, does nothing.
+            
+            Args:
+                x, y: int
+                    The position of the click, in view coordinates.
+            
+            Returns:
+                True if this control has to be redrawn, or False
+                otherwise.
+            '''
+            return False
+        #---------------------------------------------------------------------
+        def on_enter(self) -> None:
+            '''Handles the entering of the mouse cursor in this control.
+            '''
+            self.is_hovered = True
+        #---------------------------------------------------------------------
+        def on_leave(self) -> None:
+            '''Handles the leaving of the mouse cursor from this control.
+            '''
+            self.is_hovered = False
+        #---------------------------------------------------------------------
         _FONT_SIZE     = 14
         _FONT_ACTIVE   = Font( _FONT_SIZE, YELLOW )
         _FONT_DISABLED = Font( _FONT_SIZE, DEEP_GRAY )
         _FONT_ENABLED  = Font( _FONT_SIZE, LIGHT_GRAY )
+        _SLIDER_HEIGHT = 20  # slider bar plus its ticks texts
 
 
     #-------------------------------------------------------------------------
@@ -338,13 +455,18 @@ class ControlView( PeriodicalThread, AVTView ):
             '''
             self.is_on = not self.is_on
         #---------------------------------------------------------------------
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( self.x, self.y, self._WIDTH, self._HEIGHT )
+        #---------------------------------------------------------------------
         _FONT_NOT_OK   = BoldFont( 13, ANTHRACITE )
         _FONT_OFF      = BoldFont( 13, GRAY )
         _FONT_ON       = BoldFont( 13, YELLOW )
-        _ICON_OFF      = cv2.imread( '../picts/controls/switch-off.png' )
-        _ICON_ON       = cv2.imread( '../picts/controls/switch-on.png' )
-        _ICON_DISABLED = cv2.imread( '../picts/controls/switch-disabled.png' )
-        _HEIGHT, _WIDTH = _ICON_ON.shape[ :2 ]
+        _ICON_OFF      = LazyIcon( 'switch-off' )
+        _ICON_ON       = LazyIcon( 'switch-on' )
+        _ICON_DISABLED = LazyIcon( 'switch-disabled' )
+        _HEIGHT, _WIDTH = Icons.get_size( 'switch-on' )
         
 
     #-------------------------------------------------------------------------
@@ -389,9 +511,9 @@ class ControlView( PeriodicalThread, AVTView ):
                                      y = (y if y is not None else pos.y) + self._SIZE + 8,
                                      width = ControlView.WIDTH - 12*2,
                                      height = 5,
-                                     min_value = 5,
-                                     max_value = 12,
-                                     current_value = 7,
+                                     min_value = AVTConfig.DELAY_RANGE_S[0],
+                                     max_value = AVTConfig.DELAY_RANGE_S[1],
+                                     current_value = AVTConfig.DELAY_DEFAULT_S,
                                      bar_color = GRAY,
                                      cursor_color = self._TICKS_FONT_ENABLED.color,
                                      text_font = self._TICKS_FONT_ENABLED,
@@ -420,10 +542,15 @@ class ControlView( PeriodicalThread, AVTView ):
             self.slider.draw( view )
 
         #---------------------------------------------------------------------
-        _ICON_DISABLED = cv2.imread( '../picts/controls/delay-disabled.png' )
-        _ICON_OFF      = cv2.imread( '../picts/controls/delay-off.png' )
-        _ICON_ON       = cv2.imread( '../picts/controls/delay-on.png' )
-        _SIZE = _ICON_ON.shape[ 0 ]
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( 0, self.y, ControlView.WIDTH, self._SIZE + 8 + self._SLIDER_HEIGHT )
+        #---------------------------------------------------------------------
+        _ICON_DISABLED = LazyIcon( 'delay-disabled' )
+        _ICON_OFF      = LazyIcon( 'delay-off' )
+        _ICON_ON       = LazyIcon( 'delay-on' )
+        _SIZE = Icons.get_size( 'delay-on' )[ 0 ]
         _TICKS_FONT_SIZE = 8
         _TICKS_FONT_ENABLED = Font( _TICKS_FONT_SIZE, YELLOW // 1.33 )
 
@@ -448,7 +575,7 @@ class ControlView( PeriodicalThread, AVTView ):
                     None.  Defaults to None (i.e. 'pos'  should 
                     be set instead).
             '''
-            self.height, self.width = self._ICON_EXIT.shape[:2]
+            self.height, self.width = Icons.get_size( 'exit-48' )
             super().__init__( (view_width - self.width) // 2,
                               view_height - self.height - 12  )
             
@@ -467,7 +594,12 @@ class ControlView( PeriodicalThread, AVTView ):
                 pass
             
         #---------------------------------------------------------------------
-        _ICON_EXIT = cv2.imread( '../picts/controls/exit-48.png' )
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( self.x, self.y, self.width, self.height )
+        #---------------------------------------------------------------------
+        _ICON_EXIT = LazyIcon( 'exit-48' )
 
 
     #-------------------------------------------------------------------------
@@ -534,10 +666,10 @@ class ControlView( PeriodicalThread, AVTView ):
             view.content[ y:y+self._SIZE, x:x+self._SIZE, : ] = img[ :, :, : ]
 
         #---------------------------------------------------------------------
-        _ICON_DISABLED = cv2.imread( '../picts/controls/match-disabled.png' )
-        _ICON_OFF      = cv2.imread( '../picts/controls/match-off.png' )
-        _ICON_ON       = cv2.imread( '../picts/controls/match-on.png' )
-        _SIZE = _ICON_ON.shape[ 0 ]
+        _ICON_DISABLED = LazyIcon( 'match-disabled' )
+        _ICON_OFF      = LazyIcon( 'match-off' )
+        _ICON_ON       = LazyIcon( 'match-on' )
+        _SIZE = Icons.get_size( 'match-on' )[ 0 ]
 
 
     #-------------------------------------------------------------------------
@@ -561,10 +693,15 @@ class ControlView( PeriodicalThread, AVTView ):
             view.content[ y:y+self._SIZE, x:x+self._SIZE, : ] = img[ :, :, : ]
 
         #---------------------------------------------------------------------
-        _ICON_DISABLED = cv2.imread( '../picts/controls/overlays-disabled.png' )
-        _ICON_OFF      = cv2.imread( '../picts/controls/overlays-off.png' )
-        _ICON_ON       = cv2.imread( '../picts/controls/overlays-on.png' )
-        _SIZE = _ICON_ON.shape[ 0 ]
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( 0, self.y, ControlView.WIDTH, self._SIZE + 5 )
+        #---------------------------------------------------------------------
+        _ICON_DISABLED = LazyIcon( 'overlays-disabled' )
+        _ICON_OFF      = LazyIcon( 'overlays-off' )
+        _ICON_ON       = LazyIcon( 'overlays-on' )
+        _SIZE = Icons.get_size( 'overlays-on' )[ 0 ]
 
 
     #-------------------------------------------------------------------------
@@ -609,9 +746,9 @@ class ControlView( PeriodicalThread, AVTView ):
                                        y = (y if y is not None else pos.y) + self._ICON_SIZE + 8,
                                        width = ControlView.WIDTH - 12*2,
                                        height = 5,
-                                       min_value = 20,
-                                       max_value = 130,
-                                       current_value = 60,
+                                       min_value = AVTConfig.RECORD_RANGE_S[0],
+                                       max_value = AVTConfig.RECORD_RANGE_S[1],
+                                       current_value = AVTConfig.RECORD_DEFAULT_S,
                                        bar_color = GRAY,
                                        cursor_color = self._TICKS_FONT_ENABLED.color,
                                        text_font = self._TICKS_FONT_ENABLED,
@@ -620,6 +757,7 @@ class ControlView( PeriodicalThread, AVTView ):
                                        enabled = enabled,
                                        active = active,
                                        show_cursor_text = False )
+            self.recorder = None
             
         #---------------------------------------------------------------------
         def draw(self, view: View) -> None:
@@ -629,6 +767,8 @@ class ControlView( PeriodicalThread, AVTView ):
                 view: View
                     A reference to the embedding view.
             '''
+            if self.recorder is not None:
+                self.is_active = self.recorder.is_recording()  # sessions stop by themselves
             cursor_text = str( self.slider.value )
 
             if self.enabled:
@@ -656,6 +796,34 @@ class ControlView( PeriodicalThread, AVTView ):
             self.slider.draw( view )
 
         #---------------------------------------------------------------------
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( 0, self.y, ControlView.WIDTH, self._ICON_SIZE + 8 + self._SLIDER_HEIGHT )
+        #---------------------------------------------------------------------
+        def on_click(self, x: int, y: int) -> bool:
+            '''Starts or stops the recording of the cameras on clicks on the icon.
+            
+            The duration of the recording is the current value
+            of the slider.
+            
+            Args:
+                x, y: int
+                    The position of the click, in view coordinates.
+            
+            Returns:
+                True if this control has to be redrawn, or False
+                otherwise.
+            '''
+            if not self.enabled or self.recorder is None or y >= self.y + self._ICON_SIZE + 4:
+                return False
+            if self.recorder.is_recording():
+                self.recorder.stop()
+            else:
+                self.recorder.start( self.slider.value )
+            self.is_active = self.recorder.is_recording()
+            return True
+        #---------------------------------------------------------------------
         _FONT_3_SIZE        = 8
         _FONT_2_SIZE        = 11
         _FONT_3_DISABLED    = Font( _FONT_3_SIZE, GRAY )
@@ -664,10 +832,10 @@ class ControlView( PeriodicalThread, AVTView ):
         _FONT_2_DISABLED    = Font( _FONT_2_SIZE, GRAY )
         _FONT_2_OFF         = Font( _FONT_2_SIZE, LIGHT_GRAY )
         _FONT_2_ON          = Font( _FONT_2_SIZE, YELLOW )
-        _ICON_DISABLED      = cv2.imread( '../picts/controls/record-disabled.png' )
-        _ICON_OFF           = cv2.imread( '../picts/controls/record-off.png' )
-        _ICON_ON            = cv2.imread( '../picts/controls/record-on.png' )
-        _ICON_SIZE          = _ICON_ON.shape[ 0 ]
+        _ICON_DISABLED      = LazyIcon( 'record-disabled' )
+        _ICON_OFF           = LazyIcon( 'record-off' )
+        _ICON_ON            = LazyIcon( 'record-on' )
+        _ICON_SIZE          = Icons.get_size( 'record-on' )[ 0 ]
         _TICKS_FONT_SIZE    = 8
         _TICKS_FONT_ENABLED = Font( _TICKS_FONT_SIZE, YELLOW // 1.33 )
 
@@ -675,7 +843,27 @@ class ControlView( PeriodicalThread, AVTView ):
     #-------------------------------------------------------------------------
     class _CtrlReplay( _CtrlBase ):
         '''The replay control.
+        
+        Its buttons drive the replay engine: step backward,
+        step forward,  play / pause,  fast backward and fast
+        forward.  While playing, the step buttons play in slow
+        motion instead.  The last recorded session is open on
+        the first click.
         '''
+        #---------------------------------------------------------------------
+        def __init__(self, x: int = None,
+                           y: int = None,
+                           enabled: bool = True,
+                           active : bool = False,
+                           *,
+                           pos: Point = None) -> None:
+            '''Constructor.
+            
+            See class '_CtrlBase' for a description of the arguments.
+            '''
+            super().__init__( x, y, enabled, active, pos=pos )
+            self.engine = None
+
         #---------------------------------------------------------------------
         def draw(self, view: View) -> None:
             '''Draws a control in its embedding content.
@@ -684,11 +872,16 @@ class ControlView( PeriodicalThread, AVTView ):
                 view: View
                     A reference to the embedding view.
             '''
+            b_playing = False
+            if self.engine is not None:
+                self.is_active = self.engine.is_open()  # replays close by themselves at end
+                b_playing = self.engine.is_playing()
+            
             if self.enabled:
                 if self.is_active:
                     icons = (self._ICON_STEP_BW_ON,
                              self._ICON_STEP_FW_ON,
-                             self._ICON_PLAY_ON,
+                             self._ICON_PAUSE_ON if b_playing else self._ICON_PLAY_ON,
                              self._ICON_FBW_ON,
                              self._ICON_FFW_ON)
                 else:
@@ -704,12 +897,7 @@ class ControlView( PeriodicalThread, AVTView ):
                          self._ICON_FBW_DISABLED,
                          self._ICON_FFW_DISABLED)
 
-            x0 = self.x + 5
-            y0 = self.y + 23
-            x1 = x0 + self._SIZE
-            x2 = x1 + self._SIZE
-            y1 = y0 + self._SIZE // 2 + 2
-            y2 = y0 + self._SIZE + 3
+            (x0, y0), (x2, _), (x1, y1), (_, y2), _ = self._get_buttons_pos()
             
             view.content[ y0:y0+self._SIZE,
                           x0:x0+self._SIZE, : ] = icons[0][:,:,:]
@@ -727,24 +915,83 @@ class ControlView( PeriodicalThread, AVTView ):
                           x2:x2+self._SIZE, : ] = icons[4][:,:,:]
                                          
         #---------------------------------------------------------------------
-        _ICON_FBW_DISABLED     = cv2.imread( '../picts/controls/fbw-25-disabled.png' )
-        _ICON_FBW_OFF          = cv2.imread( '../picts/controls/fbw-25-off.png' )
-        _ICON_FBW_ON           = cv2.imread( '../picts/controls/fbw-25-on.png' )
-        _ICON_FFW_DISABLED     = cv2.imread( '../picts/controls/ffw-25-disabled.png' )
-        _ICON_FFW_OFF          = cv2.imread( '../picts/controls/ffw-25-off.png' )
-        _ICON_FFW_ON           = cv2.imread( '../picts/controls/ffw-25-on.png' )
-        _ICON_PAUSE_DISABLED   = cv2.imread( '../picts/controls/pause-25-disabled.png' )
-        _ICON_PAUSE_OFF        = cv2.imread( '../picts/controls/pause-25-off.png' )
-        _ICON_PAUSE_ON         = cv2.imread( '../picts/controls/pause-25-on.png' )
-        _ICON_PLAY_DISABLED    = cv2.imread( '../picts/controls/play-25-disabled.png' )
-        _ICON_PLAY_OFF         = cv2.imread( '../picts/controls/play-25-off.png' )
-        _ICON_PLAY_ON          = cv2.imread( '../picts/controls/play-25-on.png' )
-        _ICON_STEP_BW_DISABLED = cv2.imread( '../picts/controls/step-bw-25-disabled.png' )
-        _ICON_STEP_BW_OFF      = cv2.imread( '../picts/controls/step-bw-25-off.png' )
-        _ICON_STEP_BW_ON       = cv2.imread( '../picts/controls/step-bw-25-on.png' )
-        _ICON_STEP_FW_DISABLED = cv2.imread( '../picts/controls/step-fw-25-disabled.png' )
-        _ICON_STEP_FW_OFF      = cv2.imread( '../picts/controls/step-fw-25-off.png' )
-        _ICON_STEP_FW_ON       = cv2.imread( '../picts/controls/step-fw-25-on.png' )
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( 0, self.y, ControlView.WIDTH, 23 + 2 * self._SIZE + 3 )
+        #---------------------------------------------------------------------
+        def on_click(self, x: int, y: int) -> bool:
+            '''Drives the replay engine according to the clicked button.
+            
+            Args:
+                x, y: int
+                    The position of the click, in view coordinates.
+            
+            Returns:
+                True if this control has to be redrawn, or False
+                otherwise.
+            '''
+            if not self.enabled or self.engine is None:
+                return False
+            
+            for button, (bx, by) in zip( self._BUTTONS, self._get_buttons_pos() ):
+                if bx <= x < bx + self._SIZE and by <= y < by + self._SIZE:
+                    break
+            else:
+                return False
+            
+            if not self.engine.is_open() and not self.engine.open_last():
+                return False
+            
+            if button in ('step-bw', 'step-fw'):
+                direction = -1 if button == 'step-bw' else 1
+                if self.engine.is_playing():
+                    self.engine.play( direction * AVTConfig.REPLAY_SLOW_SPEED )
+                else:
+                    self.engine.step( direction )
+            elif button == 'play':
+                if self.engine.is_playing():
+                    self.engine.pause()
+                else:
+                    self.engine.play()
+            elif button == 'fbw':
+                self.engine.play( -AVTConfig.REPLAY_FAST_SPEED )
+            else:
+                self.engine.play( AVTConfig.REPLAY_FAST_SPEED )
+            
+            self.is_active = self.engine.is_open()
+            return True
+        #---------------------------------------------------------------------
+        def _get_buttons_pos(self) -> tuple:
+            '''Returns the top-left positions of the buttons, in the order of '_BUTTONS'.
+            '''
+            x0 = self.x + 5
+            y0 = self.y + 23
+            x1 = x0 + self._SIZE
+            x2 = x1 + self._SIZE
+            y1 = y0 + self._SIZE // 2 + 2
+            y2 = y0 + self._SIZE + 3
+            return (x0, y0), (x2, y0), (x1, y1), (x0, y2), (x2, y2)
+        #---------------------------------------------------------------------
+        _BUTTONS               = ( 'step-bw', 'step-fw', 'play', 'fbw', 'ffw' )
+        _ICON_FBW_DISABLED     = LazyIcon( 'fbw-25-disabled' )
+        _ICON_FBW_OFF          = LazyIcon( 'fbw-25-off' )
+        _ICON_FBW_ON           = LazyIcon( 'fbw-25-on' )
+        _ICON_FFW_DISABLED     = LazyIcon( 'ffw-25-disabled' )
+        _ICON_FFW_OFF          = LazyIcon( 'ffw-25-off' )
+        _ICON_FFW_ON           = LazyIcon( 'ffw-25-on' )
+        _ICON_PAUSE_DISABLED   = LazyIcon( 'pause-25-disabled' )
+        _ICON_PAUSE_OFF        = LazyIcon( 'pause-25-off' )
+        _ICON_PAUSE_ON         = LazyIcon( 'pause-25-on' )
+        _ICON_PLAY_DISABLED    = LazyIcon( 'play-25-disabled' )
+        _ICON_PLAY_OFF         = LazyIcon( 'play-25-off' )
+        _ICON_PLAY_ON          = LazyIcon( 'play-25-on' )
+        _ICON_STEP_BW_DISABLED = LazyIcon( 'step-bw-25-disabled' )
+        _ICON_STEP_BW_OFF      = LazyIcon( 'step-bw-25-off' )
+        _ICON_STEP_BW_ON       = LazyIcon( 'step-bw-25-on' )
+        _ICON_STEP_FW_DISABLED = LazyIcon( 'step-fw-25-disabled' )
+        _ICON_STEP_FW_OFF      = LazyIcon( 'step-fw-25-off' )
+        _ICON_STEP_FW_ON       = LazyIcon( 'step-fw-25-on' )
         _SIZE = 25 ##_ICON_PLAY_ON.shape[0]
         
 
@@ -769,10 +1016,10 @@ class ControlView( PeriodicalThread, AVTView ):
             view.content[ y:y+self._SIZE, x:x+self._SIZE, : ] = img[ :, :, : ]
             
         #---------------------------------------------------------------------
-        _ICON_ACTIVE = cv2.imread( '../picts/controls/target-on.png' )
-        _ICON_INACTIVE = cv2.imread( '../picts/controls/target-off.png' )
-        _ICON_DISABLED = cv2.imread( '../picts/controls/target-disabled.png' )
-        _SIZE          = _ICON_ACTIVE.shape[0]
+        _ICON_ACTIVE = LazyIcon( 'target-on' )
+        _ICON_INACTIVE = LazyIcon( 'target-off' )
+        _ICON_DISABLED = LazyIcon( 'target-disabled' )
+        _SIZE          = Icons.get_size( 'target-on' )[ 0 ]
 
 
     #-------------------------------------------------------------------------
@@ -827,6 +1074,11 @@ class ControlView( PeriodicalThread, AVTView ):
                                           view )
             
         #---------------------------------------------------------------------
+        def get_rect(self) -> Rect:
+            '''Returns the hit-testing rectangle of this control, in view coordinates.
+            '''
+            return Rect( 0, self.y - 3, ControlView.WIDTH, self._FULL_HEIGHT + 7 )
+        #---------------------------------------------------------------------
         _DURATION_TEXT_SIZE = 11
         _PADDING            = 11
         _TIME_TEXT_SIZE     = 15
@@ -854,10 +1106,10 @@ class ControlView( PeriodicalThread, AVTView ):
             view.content[ y:y+self._SIZE, x:x+self._SIZE, : ] = img[ :, :, : ]
 
         #---------------------------------------------------------------------
-        _ICON_DISABLED = cv2.imread( '../picts/controls/timer-disabled.png' )
-        _ICON_OFF      = cv2.imread( '../picts/controls/timer-off.png' )
-        _ICON_ON       = cv2.imread( '../picts/controls/timer-on.png' )
-        _SIZE          = _ICON_ON.shape[ 0 ]
+        _ICON_DISABLED = LazyIcon( 'timer-disabled' )
+        _ICON_OFF      = LazyIcon( 'timer-off' )
+        _ICON_ON       = LazyIcon( 'timer-on' )
+        _SIZE          = Icons.get_size( 'timer-on' )[ 0 ]
 
 
 #=====   end of   src.Display.cantrol_view   =====#
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import cv2
+import numpy as np
+from typing import Tuple
+
+from src.Utils.types  import Frame
+
+
+#=============================================================================
+class FrameTransform:
+    """The class of fused frames transforms.
+    
+    Mirroring, scaling and letterboxed placement of captured
+    frames into a destination view are folded into one single
+    affine warp,  which is applied in one pass over the dest-
+    ination pixels.  The related matrix is computed only when
+    the  flipping  status  or  the geometry of either source
+    frames or destination changes.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, b_flip     : bool = False,
+                       border_gray: int  = 16    ) -> None:
+        '''Constructor.
+        
+        Args:
+            b_flip: bool
+                Set this to True to get frames horizontally mir-
+                rored. Defaults to False.
+            border_gray: int
+                The gray level of the letterbox borders. Defaults
+                to 16.
+        '''
+        self.b_flip = b_flip
+        self.border_value = (border_gray, border_gray, border_gray)
+        self._key = None
+        self._matrix = None
+        self._interpolation = cv2.INTER_NEAREST
+        self.ratio = 1.0
+        self.placement = (0, 0, 0, 0)
+
+    #-------------------------------------------------------------------------
+    def apply(self, frame: Frame, dst: Frame) -> None:
+        '''Transforms a frame into the destination one.
+        
+        Every pixel of the destination is written,  letterbox
+        borders included.
+        
+        Args:
+            frame: Frame
+                A reference to the frame to be transformed.
+            dst: Frame
+                A reference to the destination frame or to  a
+                region of it (i.e. a NumPy view). Its size is
+                the one of the region into which the frame  is
+                placed.
+        '''
+        frame_height, frame_width = frame.shape[:2]
+        dst_height, dst_width = dst.shape[:2]
+        key = (frame_width, frame_height, dst_width, dst_height, self.b_flip)
+        if key != self._key:
+            self._evaluate( *key )
+        
+        cv2.warpAffine( frame, self._matrix, (dst_width, dst_height), dst=dst,
+                        flags=self._interpolation,
+                        borderMode=cv2.BORDER_CONSTANT, borderValue=self.border_value )
+
+    #-------------------------------------------------------------------------
+    def toggle_flip(self) -> None:
+        '''Toggles the horizontal mirroring of frames.
+        '''
+        self.b_flip = not self.b_flip
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def fit_ratio(cls, frame_width : int, frame_height: int,
+                       dst_width   : int, dst_height  : int ) -> float:
+        '''Returns the scaling ratio of a frame letterboxed into a destination.
+        '''
+        return min( dst_width / frame_width, dst_height / frame_height )
+
+    #-------------------------------------------------------------------------
+    def _evaluate(self, frame_width: int, frame_height: int,
+                        dst_width  : int, dst_height  : int,
+                        b_flip     : bool                   ) -> None:
+        '''Evaluates the affine matrix of this transform.
+        
+        Pixels centers are mapped onto pixels centers,  so that
+        a  not  scaled  frame  is  exactly  copied  with nearest
+        neighbour interpolation.
+        '''
+        ratio = self.fit_ratio( frame_width, frame_height, dst_width, dst_height )
+        width  = min( dst_width , round(frame_width  * ratio) )
+        height = min( dst_height, round(frame_height * ratio) )
+        x = (dst_width  - width ) // 2
+        y = (dst_height - height) // 2
+        
+        if b_flip:
+            matrix = [ [-ratio, 0.0  , x + ratio * (frame_width - 0.5) - 0.5],
+                       [ 0.0  , ratio, y + ratio * 0.5 - 0.5               ] ]
+        else:
+            matrix = [ [ ratio, 0.0  , x + ratio * 0.5 - 0.5],
+                       [ 0.0  , ratio, y + ratio * 0.5 - 0.5] ]
+        
+        self._matrix = np.array( matrix, np.float64 )
+        self._interpolation = cv2.INTER_NEAREST if ratio == 1.0 else cv2.INTER_LINEAR
+        self._key = (frame_width, frame_height, dst_width, dst_height, b_flip)
+        self.ratio = ratio
+        self.placement = (x, y, width, height)
+
+    #-------------------------------------------------------------------------
+    # Class data
+    MIN_WARP_RATIO = 0.5  # below this, frames are first downscaled at acquisition time
+
+#=====   end of   src.Display.frame_transform   =====#
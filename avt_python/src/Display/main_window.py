@@ -23,15 +23,23 @@ SOFTWARE.
 """
 
 #=============================================================================
-from typing import Tuple
+from typing import List, Tuple
 
 from src.App                     import __version__
+from src.App.avt_config          import AVTConfig
 from .avt_window                 import AVTWindow
 from src.Cameras.cameras_pool    import CamerasPool
+from src.Recording.recorder      import Recorder
+from src.Replay.replay_engine    import ReplayEngine
 from .camera_view                import CameraView
 from .control_view               import ControlView
 from src.Shapes.rect             import Rect
+from src.Utils.Scheduling.opencv_threads import OpenCVThreads
+from src.Utils.startup_report    import StartupTimer
 from .target_view                import TargetView
+from .view                       import View
+from .view_window                import ViewWindow
+from .views_layout               import ViewsLayout
 
 
 #=============================================================================
@@ -46,15 +54,38 @@ class MainWindow( AVTWindow):
         '''
         if self.__ME is None:
             # creates the Main Window for app AVT
-            super().__init__( name="MainAVT",
-                              title=f"Archery Video Training - {__version__}",
-                              width=self.DEFAULT_WIDTH,
-                              height=self.DEFAULT_HEIGHT )
+            with StartupTimer( 'display', 'main window creation' ):
+                super().__init__( name="MainAVT",
+                                  title=f"Archery Video Training - {__version__}",
+                                  width=self.DEFAULT_WIDTH,
+                                  height=self.DEFAULT_HEIGHT )
             MainWindow.__ME = self
             
             # creates the embedded views, according to the pool of cameras
-            self.cameras_pool = CamerasPool( self )
-            self.create_views( self.cameras_pool, b_target_view=False )  ##True )  ##
+            with StartupTimer( 'cameras', 'cameras probing' ):
+                self.cameras_pool = CamerasPool( self )
+            
+            budgets = OpenCVThreads.configure( len(self.cameras_pool) )
+            if AVTConfig.STARTUP_REPORT:
+                print( "-- OpenCV threads budgets:", ", ".join(f"{stage}={count}" for stage, count in budgets.items()) )
+            with StartupTimer( 'display', 'views creation' ):
+                self.create_views( self.cameras_pool, b_target_view=False )  ##True )  ##
+            
+            # sends views to their own windows, as configured - all
+            # views are found before any of them is detached
+            self.view_windows = []
+            detached_views = [ (self.find_view(view_key), view_key, monitor_index, b_full_screen)
+                                    for view_key, monitor_index, b_full_screen in AVTConfig.DETACHED_VIEWS ]
+            for view, view_key, monitor_index, b_full_screen in detached_views:
+                if view is None:
+                    print( f"!!! no view '{view_key}' to be displayed in its own window" )
+                else:
+                    self.detach_view( view, monitor_index, b_full_screen )
+            
+            self.recorder = Recorder( self )
+            self.control_view.set_recorder( self.recorder )
+            self.replay_engine = ReplayEngine( self )
+            self.control_view.set_replay_engine( self.replay_engine )
             
         else:
             self = MainWindow.__ME
@@ -96,6 +127,10 @@ class MainWindow( AVTWindow):
         except:
             return None
 
+    @property
+    def camera_views(self) -> List[ CameraView ]:
+        return [ view for view in self.views if isinstance(view, CameraView) ]
+
     @property
     def control_view(self) -> ControlView:
         try:
@@ -115,6 +150,10 @@ class MainWindow( AVTWindow):
                            b_target_view: bool = False) -> None:
         '''Creates all the views that are contained in this window.
         
+        The cameras views, and the target view if any, are laid
+        out by the views layout engine in the part of this window
+        which is not used by the control view.
+        
         Args:
             cameras_pool: CamerasPool
                 A reference to the pool of cameras that have
@@ -124,76 +163,180 @@ class MainWindow( AVTWindow):
                 be used to help at aiming at screen,  or set
                 it to False otherwise. Defaults to False.
         '''
-        cameras_count = len( cameras_pool )
-        
-        camera_views_width = self.width - ControlView.WIDTH
-        rect = Rect( 0, 0, camera_views_width, self.height )
-        
-        if cameras_count == 0:
-            self.views = [ ControlView( self, cameras_pool ),
-                           TargetView( self, 0.0, 0.0, 1.0, 1.0, rect ) ]
-                  
-        elif cameras_count == 1:
-            if b_target_view:
-                self.views = [ ControlView( self, cameras_pool ),
-                               CameraView( self, cameras_pool[0], 0.0, 0.0, 0.5, 0.5, rect ),
-                               TargetView( self, 0.5, 0.5, 0.5, 0.5, rect ) ]
-            else:
-                self.views = [ ControlView( self, cameras_pool ),
-                               CameraView( self, cameras_pool[0], 0.0, 0.0, 1.0, 1.0, rect ) ]
-                  
-        elif cameras_count == 2:
-            self.views = [ ControlView( self, cameras_pool ),
-                           CameraView( self, cameras_pool[0], 0.0, 0.0, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[1], 0.5, 0.0, 0.5, 0.5, rect )  ]
-            if b_target_view:
-                self.views.append( TargetView( self, 0.0, 0.5, 1.0, 0.5, rect ) )
-                  
-        elif cameras_count == 3:
-            self.views = [ ControlView( self, cameras_pool ),
-                           CameraView( self, cameras_pool[0], 0.0, 0.0, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[1], 0.5, 0.0, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[2], 0.0, 0.5, 0.5, 0.5, rect )  ]
-            if b_target_view:
-                self.views.append( TargetView( self, 0.5, 0.5, 0.5, 0.5, rect ) )
-          
-        elif cameras_count >= 4:
-            self.views = [ ControlView( self, cameras_pool ),
-                           CameraView( self, cameras_pool[0], 0.0, 0.0, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[1], 0.5, 0.0, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[2], 0.0, 0.5, 0.5, 0.5, rect ),
-                           CameraView( self, cameras_pool[3], 0.5, 0.5, 0.5, 0.5, rect )  ]
-            if b_target_view:
-                self.views.append( TargetView( self, 0.25, 0.25, 0.5, 0.5, rect, True ) )
-        # Notice: not more than 4 cameras in current version of AVT
+        self.views_layout = ViewsLayout( len(cameras_pool),
+                                         b_target_view=b_target_view,
+                                         mode=AVTConfig.LAYOUT_MODE )
+        
+        width, height = self.width - ControlView.WIDTH, self.height
+        self.views_layout.update( width, height )
+        cells = self.views_layout.cells
+        rect = Rect( 0, 0, width, height )
+        
+        self.views = [ ControlView( self, cameras_pool ) ]
+        self.views.extend( CameraView( self, camera, *cell, rect ) for camera, cell in zip(cameras_pool, cells) )
+        if b_target_view:
+            self.views.append( TargetView( self, *cells[-1], rect ) )
+
+    #-------------------------------------------------------------------------
+    def detach_view(self, view         : View,
+                          monitor_index: int  = None,
+                          b_full_screen: bool = False) -> ViewWindow:
+        '''Sends a view of this window to its own window.
+        
+        The remaining views of this window are laid out again.
+        The new window must be added to the event loop, with
+        its own presenter and layout ticks - see 'avt_main()'.
+        
+        Args:
+            view: View
+                A reference to the view to be detached from this
+                window. The control view cannot be detached.
+            monitor_index: int
+                The index of the monitor on which the new window
+                is to be displayed. Defaults to None (i.e. where
+                the windowing system places it).
+            b_full_screen: bool
+                Set this to True to get the new window displayed
+                full screen. Defaults to False.
+        
+        Returns:
+            A reference to the new window.
+        
+        Raises:
+            ValueError: the view is not a view of this window or
+                is the control view.
+        '''
+        if view is self.control_view or view not in self.views:
+            raise ValueError( f"view {view} cannot be detached from the main window" )
+        
+        self.views.remove( view )
+        window = ViewWindow( view,
+                             f"AVT - {getattr(view, 'view_name', type(view).__name__)}",
+                             monitor_index,
+                             b_full_screen )
+        self.view_windows.append( window )
+        
+        self.views_layout = ViewsLayout( len(self.camera_views),
+                                         b_target_view=self.target_view is not None,
+                                         mode=AVTConfig.LAYOUT_MODE )
+        self.update_layout()
+        return window
+
+    #-------------------------------------------------------------------------
+    def find_view(self, view_key: str) -> View:
+        '''Returns the view of this window that is specified by a key.
+        
+        Args:
+            view_key: str
+                Either 'target' or 'camera-<id>', id being the
+                identifier of the camera - see 'Camera.get_id()'.
+        
+        Returns:
+            A reference to the view, or None if this window has
+            no such view.
+        '''
+        if view_key == 'target':
+            return self.target_view
+        try:
+            kind, cam_id = view_key.split( '-' )
+            if kind != 'camera':
+                return None
+            cam_id = int( cam_id )
+        except ValueError:
+            return None
+        for view in self.camera_views:
+            if view.camera.get_id() == cam_id:
+                return view
+        return None
+
+    #-------------------------------------------------------------------------
+    def get_all_views(self) -> List[ View ]:
+        '''Returns the views of this window and the ones that have been detached from it.
+        '''
+        return [ *self.views, *(window.view for window in self.view_windows) ]
 
     #-------------------------------------------------------------------------
     def get_cameras_area_size(self) -> Tuple[int, int]:
         '''Returns the (width, height) of the cameras displays size in this main window.
         '''
-        dims = self.get_size()
-        return [ dims[0] - self.DEFAULT_CONTROL_WIDTH, dims[1] ]
+        width, height = self.get_size()
+        return max( 1, width - ControlView.WIDTH ), max( 1, height )
+
+    #-------------------------------------------------------------------------
+    def get_threads(self) -> list:
+        '''Returns all the threads that are associated with the views of this window.
+        '''
+        return [ thread for view in self.get_all_views() for thread in view.get_threads() ]
+
+    #-------------------------------------------------------------------------
+    def on_mouse(self, mouse_data: object) -> None:
+        '''Routes the mouse events to the view that is under the mouse cursor.
+        
+        Args:
+            mouse_data: Event.MouseData
+                A reference to the data of the mouse event.
+        '''
+        for view in self.views:
+            if view.contains( mouse_data.x, mouse_data.y ):
+                view.on_mouse( mouse_data )
+                return
 
     #-------------------------------------------------------------------------
     def run_views(self) -> None:
         '''Runs the threads associated with views, if any.
         '''
-        for view in self.views:
+        for view in self.get_all_views():
             view.start()
 
+    #-------------------------------------------------------------------------
+    def update_layout(self) -> bool:
+        '''Lays out the views again if the size of this window has changed.
+        
+        This is the layout tick of the event loop: the views
+        are notified only when the size of this window has
+        actually changed,  and the cells of the views layout
+        are cached per size.  Must be called by the main thread
+        only.
+        
+        Returns:
+            True if the views have been laid out again, or False
+            otherwise.
+        '''
+        width, height = self.get_cameras_area_size()
+        if not self.views_layout.update( width, height ):
+            return False
+        
+        self.set_content_size( width + ControlView.WIDTH, height )
+        
+        rect = Rect( 0, 0, width, height )
+        for view, cell in zip( self.views[1:], self.views_layout.cells ):
+            view.set_layout( *cell, rect )
+        control_view = self.control_view
+        control_view.set_rect( width, 0, control_view.width, control_view.height )
+        
+        for view in self.views:
+            self.insert_view_content( view )
+        return True
+
     #-------------------------------------------------------------------------
     def stop_views(self) -> None:
         '''Definitively stops the threads associated with views, if any.
+        
+        The current recording and replay sessions, if any, are
+        stopped first.
         '''
-        for view in self.views:
+        self.recorder.stop()
+        self.replay_engine.close()
+        views = self.get_all_views()
+        for view in views:
             view.stop()
-        for view in self.views:
+        for view in views:
             view.join()
 
     #-------------------------------------------------------------------------
     # Class data
-    DEFAULT_WIDTH  = 2 * 640 + ControlView.WIDTH
-    DEFAULT_HEIGHT = 2 * 480
+    DEFAULT_WIDTH  = AVTConfig.WINDOW_WIDTH + ControlView.WIDTH
+    DEFAULT_HEIGHT = AVTConfig.WINDOW_HEIGHT
 
     __ME = None
 
@@ -24,7 +24,11 @@ SOFTWARE.
 
 #=============================================================================
 import sys
-from PyQt5.QtWidgets     import QApplication
+from threading import Lock
+from typing    import List, Optional
+
+from src.Shapes.rect          import Rect
+from src.Utils.startup_report import StartupTimer
 
 
 #=============================================================================
@@ -35,20 +39,41 @@ class Monitors:
     Once instantiated, it provides access to methods:
         - get_dpi() , i.e. dots per inch
         - get_dpcm(), i.e. dots per cm
+        - get_geometry(), i.e. the rectangle of a monitor in
+          the virtual desktop
+    
+    Monitors features are evaluated lazily,  on first access
+    to  any  of  them,  with  a  Qt GUI application (no widgets
+    are involved).  Should PyQt5 not be available,  a  single
+    monitor with a default DPI value is assumed.
     """
     #-------------------------------------------------------------------------
     def __init__(self) -> None:
         '''Constructor.
         '''
-        if self._ME is None:
-            app = QApplication(sys.argv)
-            self.monitors = app.screens()
-            self.monitors_count = len( self.monitors )
-            self.dpis = [ scr.physicalDotsPerInch() for scr in self.monitors ]
-            self.all_same_dpis = (self.monitors_count <= 1  or
-                                  all( [self.dpis[i] == self.dpis[0] for i in range(1, self.monitors_count) ]) )
-            app.quit()
-            self._ME = self
+        if Monitors._ME is None:
+            Monitors._ME = self
+        
+    #-------------------------------------------------------------------------
+    @property
+    def all_same_dpis(self) -> bool:
+        self._evaluate()
+        return Monitors._all_same_dpis
+
+    @property
+    def dpis(self) -> List[float]:
+        self._evaluate()
+        return Monitors._dpis
+
+    @property
+    def geometries(self) -> List[Optional[Rect]]:
+        self._evaluate()
+        return Monitors._geometries
+
+    @property
+    def monitors_count(self) -> int:
+        self._evaluate()
+        return len( Monitors._dpis )
         
     #-------------------------------------------------------------------------
     def get_dpcm(self, monitor_index: int = None) -> float:
@@ -108,11 +133,69 @@ class Monitors:
         else:
             return self.dpis[ monitor_index ]
         
+    #-------------------------------------------------------------------------
+    def get_geometry(self, monitor_index: int = None) -> Optional[Rect]:
+        '''Returns the rectangle of the specified monitor in the virtual desktop.
+        
+        Args:
+            monitor_index: int
+                The index of the monitor (index starts at 0).  If
+                None,  the  primary  monitor  is  used.  Defaults
+                to None.
+        
+        Returns:
+            The rectangle (x, y, width, height) of the  monitor,
+            expressed in pixels,  or None if it is not known,
+            i.e. when PyQt5 is not available.
+        
+        Raises:
+            IndexError: the index passed as argument is  not  a
+                valid index.
+        '''
+        return self.geometries[ 0 if monitor_index is None else monitor_index ]
+        
     #-------------------------------------------------------------------------
     def __len__(self) -> int:
         return self.monitors_count
         
     #-------------------------------------------------------------------------
+    @classmethod
+    def _evaluate(cls) -> None:
+        '''Evaluates the monitors features, once only.
+        '''
+        with cls._lock:
+            if cls._dpis is not None:
+                return
+            
+            with StartupTimer( 'display', 'monitors evaluation' ):
+                try:
+                    from PyQt5.QtGui import QGuiApplication
+                    app = QGuiApplication.instance()
+                    owned_app = app is None
+                    if owned_app:
+                        app = QGuiApplication( sys.argv )
+                    dpis = [ scr.physicalDotsPerInch() for scr in app.screens() ]
+                    geometries = [ Rect( scr.geometry().x(), scr.geometry().y(),
+                                         scr.geometry().width(), scr.geometry().height() )
+                                   for scr in app.screens() ]
+                    if owned_app:
+                        app.quit()
+                except ImportError:
+                    dpis = []
+                    geometries = []
+            
+            cls._dpis = dpis or [ cls.DEFAULT_DPI ]
+            cls._geometries = geometries or [ None ]
+            cls._all_same_dpis = all( dpi == cls._dpis[0] for dpi in cls._dpis[1:] )
+        
+    #-------------------------------------------------------------------------
+    # Class data
+    DEFAULT_DPI = 96.0
+    
     _ME = None
+    _all_same_dpis: bool = True
+    _dpis: List[float] = None
+    _geometries: List[Optional[Rect]] = None
+    _lock = Lock()
 
 #=====   end of   src.Display.monitors   =====#
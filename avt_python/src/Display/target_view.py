@@ -28,7 +28,7 @@ from threading import Thread
 from src.App.avt_config  import AVTConfig
 from .avt_view_prop      import AVTViewProp
 from .view               import AVTWindowRef
-from src.Utils.rgb_color import BLACK, RGBColor
+from src.Utils.rgb_color import BLACK
 from src.Shapes.rect     import Rect
 
 
@@ -87,15 +87,16 @@ class TargetView( Thread, AVTViewProp ):
         '''Draws the content of this view.
         '''
         if self.b_shown:
-            self.draw_target()
-            self.draw_borders()
-            super().draw()
+            with self.drawing_lock():
+                self.draw_target()
+                self.draw_borders()
+                super().draw()
 
     #-------------------------------------------------------------------------
     def draw_borders(self) -> None:
         '''Draws lines on this view borders.
         '''
-        bg_color = RGBColor( *AVTConfig.DEFAULT_BACKGROUND.color )
+        bg_color = AVTConfig.DEFAULT_BACKGROUND
         
         self.content[  0,  : ] = bg_color.color
         self.content[  1,  : ] = bg_color.color
@@ -133,6 +134,12 @@ class TargetView( Thread, AVTViewProp ):
         '''
         self.b_shown = False
 
+    #-------------------------------------------------------------------------
+    def on_resize(self) -> None:
+        '''Evaluates again the display ratio of the target for the new size of this view.
+        '''
+        self._evaluate_display_ratio()
+
     #-------------------------------------------------------------------------
     def select_distances(self) -> None:
         '''Selects the simulated and the true distances.
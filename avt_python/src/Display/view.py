@@ -24,7 +24,9 @@ SOFTWARE.
 
 #=============================================================================
 import numpy as np
-from typing import ForwardRef
+from contextlib import nullcontext
+from threading import Thread
+from typing import ContextManager, ForwardRef, List
 
 from src.Utils.rgb_color     import RGBColor
 from src.GUIItems.viewable   import Viewable
@@ -39,6 +41,12 @@ class View( Viewable ):
     """The base class for views that are embedded in the main window.
     
     Notice: for simplification purposes, views are rectangular.
+    
+    When the parent window is in zero-copy mode, the content of
+    a view is a sub-view of the content of its  parent  window:
+    it is drawn in place and never copied. Drawing into it must
+    then be done with the lock returned by method 'drawing_lock()'
+    acquired.
     """
     #-------------------------------------------------------------------------
     def __init__(self, parent  : AVTWindowRef,
@@ -81,6 +89,28 @@ class View( Viewable ):
 
         self.draw()
 
+    #-------------------------------------------------------------------------
+    def contains(self, x: int, y: int) -> bool:
+        '''Returns True if the point (x, y) in the parent window coordinates is in this view.
+        '''
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    #-------------------------------------------------------------------------
+    def create_content(self) -> None:
+        '''Creates the content of this view, filled with its background color.
+        
+        In zero-copy mode, the content is the part of the parent
+        window  content  that  this view covers.  Otherwise,  or
+        if this view is not fully contained in its parent window,
+        the view gets its own content.
+        '''
+        content = self.parent_window.get_view_slice( self )
+        if content is None:
+            super().create_content()
+        else:
+            self.content = content
+            self.fill_background()
+
     #-------------------------------------------------------------------------
     def draw(self, b_forced: bool = False) -> None:
         '''Draws this view content within the parent window.
@@ -99,6 +129,40 @@ class View( Viewable ):
         self.parent_window.insert_view_content( self )
         self.parent_window.draw( b_forced )
 
+    #-------------------------------------------------------------------------
+    def drawing_lock(self) -> ContextManager:
+        '''Returns the lock to be held while drawing into the content of this view.
+        
+        This is the lock of the parent window when this view
+        is drawn in place,  so that the parent window never
+        shows a half-drawn view.  Otherwise, it is a no-op
+        context manager.
+        
+        Example:
+            with self.drawing_lock():
+                self.frame_transform.apply( frame, self.content )
+                self.draw()
+        '''
+        return self.parent_window.lock if self.is_in_place() else self._NO_LOCK
+
+    #-------------------------------------------------------------------------
+    def fill_background(self) -> None:
+        '''Fills the content of this view with its background solid color.
+        '''
+        if self.content is not None:
+            self.content[ : ] = (0, 0, 0) if self.bg_color is None else self.bg_color.color
+
+    #-------------------------------------------------------------------------
+    def get_threads(self) -> List[Thread]:
+        '''Returns the threads that are associated with this view.
+        
+        May be overwritten in inheriting classes which  embed
+        threads.  See class 'CameraView' for an example of code.
+        In this base class, returns this view if it inherits
+        also from class Thread.
+        '''
+        return [ self ] if isinstance( self, Thread ) else []
+
     #-------------------------------------------------------------------------
     def get_view_content(self) -> np.ndarray:
         '''Returns a reference to this view content, or None if not yet created.
@@ -108,6 +172,15 @@ class View( Viewable ):
         except:
             return None
 
+    #-------------------------------------------------------------------------
+    def is_in_place(self) -> bool:
+        '''Returns True if the content of this view is drawn in place in its parent window content.
+        '''
+        try:
+            return self.content.base is self.parent_window.content
+        except AttributeError:
+            return False
+
     #-------------------------------------------------------------------------
     def join(self) -> None:
         '''Joins this view, even if it does not inherits from Thread.
@@ -117,6 +190,74 @@ class View( Viewable ):
         except:
             pass
 
+    #-------------------------------------------------------------------------
+    def on_mouse(self, mouse_data: object) -> None:
+        '''Handles the mouse events that occur in this view.
+        
+        May be overwritten in inheriting classes.  In this base
+        class, does nothing.
+        
+        Args:
+            mouse_data: Event.MouseData
+                A reference to the data of the mouse event, with
+                coordinates in the parent window content.
+        '''
+        pass
+
+    #-------------------------------------------------------------------------
+    def on_resize(self) -> None:
+        '''Handles the resizing of this view.
+        
+        Called by method 'set_rect()' once the content of this
+        view has been created again with its new size.
+        May be overwritten in inheriting classes.  In this base
+        class, does nothing.
+        '''
+        pass
+
+    #-------------------------------------------------------------------------
+    def set_rect(self, x: int, y: int, width: int, height: int) -> bool:
+        '''Moves and resizes this view in its parent window.
+        
+        The content of this view is created again with its
+        background color only if the size of this view  has
+        changed, in which case method 'on_resize()' is called.
+        In zero-copy mode, a view which keeps its size is
+        attached again to its parent window content at its new
+        place,  with its current content,  since this window
+        content may have been created again.
+        
+        Args:
+            x, y: int
+                The new coordinates of the top-left corner of
+                this view, expressed as pixels in the parent
+                window coordinates.
+            width, height: int
+                The new size of this view, expressed as pixels.
+        
+        Returns:
+            True if the size of this view has changed, or False
+            otherwise.
+        
+        Raises:
+            ValueError: coordinates get  negative  values,  or
+                width or height get negative or null values.
+        '''
+        if x < 0 or y < 0:
+            raise ValueError( f"position coordinates ({x}, {y}) cannot be negative.")
+        if width <= 0 or height <= 0:
+            raise ValueError( f"sizes ({width}, {height}) must be greater than 0.")
+        
+        self.x, self.y = x, y
+        if width == self.width and height == self.height:
+            self._attach_content()
+            return False
+        
+        self.width, self.height = width, height
+        self.create_content()
+        self.on_resize()
+        return True
+
     #-------------------------------------------------------------------------
     def start(self) -> None:
         '''Starts the thread that may be associated with this view.
@@ -136,13 +277,27 @@ class View( Viewable ):
         'CameraView' for an example of code.
         '''
         pass
-#===============================================================================
-# 
-#     #-------------------------------------------------------------------------
-#     def fill_background(self) -> None:
-#         '''Fills the parent window content with the background solid color of this view.
-#         '''
-#         self.content = (np.zeros( (self.height, self.width, 3) ) + self.bg_color.color).astype( np.uint8 )
-#===============================================================================
+
+    #-------------------------------------------------------------------------
+    def _attach_content(self) -> None:
+        '''Attaches the current content of this view to its parent window content.
+        
+        Does nothing when the parent window is not in zero-copy
+        mode or when this view is already drawn in place at its
+        current position.
+        '''
+        content = self.parent_window.get_view_slice( self )
+        if content is None:
+            return
+        if self.is_in_place() and \
+                self.content.__array_interface__[ 'data' ] == content.__array_interface__[ 'data' ]:
+            return  # already attached at this place
+        if self.content is not None and self.content.shape == content.shape:
+            content[ : ] = self.content
+        self.content = content
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _NO_LOCK = nullcontext()
 
 #=====   end of   src.Display.view   =====#
@@ -73,10 +73,7 @@ class ViewProp( View ):
             ValueError:  Some  of  the  coordinates  or  sizes 
                 values are outside interval [0.0, 1.0].
         '''
-        if not 0.0 <= x <= 1.0  or  not 0.0 <= y <= 1.0:
-            raise ValueError( f"position coordinates ({x}, {y}) must be in [0.0, 1.0].")
-        if not 0.0 <= width <= 1.0  or  not 0.0 <= height <= 1.0:
-            raise ValueError( f"sizes ({width}, {height}) must be in [0.0, 1.0].")
+        self._check_props( x, y, width, height )
         
         self.prop_x = x
         self.prop_y = y
@@ -91,4 +88,64 @@ class ViewProp( View ):
                           round( height * self.rect.height ),
                           bg_color )
 
+    #-------------------------------------------------------------------------
+    def set_layout(self, x          : float,
+                         y          : float,
+                         width      : float,
+                         height     : float,
+                         parent_rect: Rect  ) -> bool:
+        '''Lays out this view again in its parent window.
+        
+        This is called by the parent window when its  views
+        layout  has  changed,  mostly  when it gets resized.
+        
+        Args:
+            x, y: float
+                The coordinates of the top-left corner of this
+                view,  expressed as percentages of resp. width
+                and height of the parent rectangle.  Values must
+                be included in [0.0, 1.0]
+            width, height: float
+                The size of this view,  expressed as  percent-
+                ages of the parent rectangle size.
+            parent_rect: Rect
+                A reference to the  rectangle  in  which  this
+                proportional  view takes place into the parent
+                window.
+        
+        Returns:
+            True if the size of this view has changed, or False
+            otherwise.
+        
+        Raises:
+            ValueError:  Some  of  the  coordinates  or  sizes 
+                values are outside interval [0.0, 1.0].
+        '''
+        self._check_props( x, y, width, height )
+        
+        self.prop_x = x
+        self.prop_y = y
+        self.prop_width = width
+        self.prop_height = height
+        self.rect = parent_rect
+        
+        return self.set_rect( round( x * parent_rect.width  ),
+                              round( y * parent_rect.height ),
+                              max( 1, round( width  * parent_rect.width  ) ),
+                              max( 1, round( height * parent_rect.height ) ) )
+
+    #-------------------------------------------------------------------------
+    @staticmethod
+    def _check_props(x: float, y: float, width: float, height: float) -> None:
+        '''Checks the proportional values of the coordinates and sizes of a view.
+        
+        Raises:
+            ValueError:  Some  of  the  coordinates  or  sizes 
+                values are outside interval [0.0, 1.0].
+        '''
+        if not 0.0 <= x <= 1.0  or  not 0.0 <= y <= 1.0:
+            raise ValueError( f"position coordinates ({x}, {y}) must be in [0.0, 1.0].")
+        if not 0.0 <= width <= 1.0  or  not 0.0 <= height <= 1.0:
+            raise ValueError( f"sizes ({width}, {height}) must be in [0.0, 1.0].")
+
 #=====   end of   src.Display.view_prop   =====#
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from threading import Thread
+from typing    import List
+
+from .avt_window     import AVTWindow
+from .view           import View
+
+
+#=============================================================================
+class ViewWindow( AVTWindow ):
+    """The class of windows that display one single view.
+    
+    Any view of the main window - a camera view or the target
+    view for instance - may be sent to its own window,  on a
+    chosen monitor.  The view then fills the whole content of
+    this window and is laid out again each time this window
+    gets resized.  As every window,  it gets its own lock,
+    content, presenter and scaling cache.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, view         : View,
+                       title        : str  = None,
+                       monitor_index: int  = None,
+                       b_full_screen: bool = False) -> None:
+        '''Constructor.
+        
+        Args:
+            view: View
+                A reference to the view to be displayed in this
+                window.  Its parent window is set to this window.
+            title: str
+                The title of this window, as displayed in its top
+                bar. Defaults to None.
+            monitor_index: int
+                The index of the monitor on which this window is
+                to be displayed. If None, the window is left where
+                the windowing system places it. Defaults to None.
+            b_full_screen: bool
+                Set this to True to get this window  displayed  full
+                screen on its monitor, or set it to False otherwise.
+                Defaults to False.
+        '''
+        super().__init__( title=title,
+                          width=view.width,
+                          height=view.height,
+                          full_screen=b_full_screen,
+                          monitor_index=monitor_index )
+        self.view = view
+        view.parent_window = self
+        self.layout_size = None
+        self.update_layout()
+
+    #-------------------------------------------------------------------------
+    def get_threads(self) -> List[Thread]:
+        '''Returns the threads that are associated with the view of this window.
+        '''
+        return self.view.get_threads()
+
+    #-------------------------------------------------------------------------
+    def on_mouse(self, mouse_data: object) -> None:
+        '''Routes the mouse events to the view of this window.
+        '''
+        self.view.on_mouse( mouse_data )
+
+    #-------------------------------------------------------------------------
+    def update_layout(self) -> bool:
+        '''Resizes the view of this window if the size of this window has changed.
+        
+        Returns:
+            True if the view has been laid out again, or False
+            otherwise.
+        '''
+        width, height = self.get_size()
+        if width <= 0 or height <= 0 or (width, height) == self.layout_size:
+            return False
+        self.layout_size = (width, height)
+        
+        self.set_content_size( width, height )
+        self.view.set_rect( 0, 0, width, height )
+        self.insert_view_content( self.view )
+        return True
+
+#=====   end of   src.Display.view_window   =====#
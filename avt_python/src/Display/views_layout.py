@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class LayoutMode
+#    class ViewsLayout
+#
+
+#=============================================================================
+import math
+from typing import Dict, List, Tuple
+
+
+#=============================================================================
+CellProps = Tuple[ float, float, float, float ]  # proportional (x, y, width, height)
+
+
+#=============================================================================
+class LayoutMode:
+    """The enumeration of the modes for laying out views.
+    """
+    GRID     = 0  # all views get cells of the same size
+    PRIORITY = 1  # the first view gets the largest cell, the others share the remaining space
+    
+    NAMES = { GRID    : 'grid',
+              PRIORITY: 'priority' }
+
+
+#=============================================================================
+class ViewsLayout:
+    """The class of the layout engine for the views of the cameras area.
+    
+    The cameras area of the main window gets cells for any count  of
+    camera views,  plus optional delayed views and an optional target
+    view.  Cells are  expressed  as  proportional  (x, y, width, height)
+    values within the cameras area,  as expected by the constructors
+    of class 'ViewProp' and by its method 'set_layout()'.
+    
+    The shape of the grid depends on the aspect ratio of the  cameras
+    area: the chosen count of columns is the one that gets the largest
+    frames displayed in cells while preserving the frames aspect ratio.
+    Cells are cached per area size,  and method 'update()' tells  when
+    views have to be laid out again,  i.e. only when the area size has
+    actually changed.
+    
+    Cells are ordered: cameras views first, then delayed  views,  then
+    the target view.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, cameras_count: int,
+                       delayed_count: int   = 0,
+                       b_target_view: bool  = False,
+                       mode         : int   = LayoutMode.GRID,
+                       frames_ratio : float = 4 / 3 ) -> None:
+        '''Constructor.
+        
+        Args:
+            cameras_count: int
+                The count of cameras views to be laid out.
+            delayed_count: int
+                The count of delayed views to be laid out. Defaults
+                to 0.
+            b_target_view: bool
+                Set this to True to get a cell for the target view,
+                or  set  it  to False otherwise.  Defaults to False.
+            mode: int
+                The layout mode,  as defined in class  LayoutMode.
+                Defaults to LayoutMode.GRID.
+            frames_ratio: float
+                The aspect ratio (width / height) of the frames that
+                are displayed in cells. Defaults to 4/3.
+        
+        Raises:
+            ValueError: counts are negative, or mode is unknown.
+        '''
+        if cameras_count < 0 or delayed_count < 0:
+            raise ValueError( f"views counts ({cameras_count}, {delayed_count}) cannot be negative" )
+        if mode not in LayoutMode.NAMES:
+            raise ValueError( f"unknown layout mode {mode}" )
+        
+        self.cameras_count = cameras_count
+        self.delayed_count = delayed_count
+        self.b_target_view = b_target_view
+        self.mode = mode
+        self.frames_ratio = frames_ratio
+        
+        self.size = None
+        self.cells = []
+        self._cache: Dict[ Tuple[int, int], List[CellProps] ] = {}
+
+    #-------------------------------------------------------------------------
+    def get_cells(self, width: int, height: int) -> List[CellProps]:
+        '''Returns the cells of the views for a cameras area size.
+        
+        Cells are evaluated once per area size.  The  cache
+        keeps the most recent sizes only,  which is enough to
+        follow interactive resizing of the main window.
+        
+        Args:
+            width, height: int
+                The size of the cameras area, expressed in pixels.
+        
+        Returns:
+            The list of the proportional cells of the views.
+        '''
+        key = (width, height)
+        try:
+            return self._cache[ key ]
+        except KeyError:
+            pass
+        
+        cells = self._evaluate( width, height )
+        if len( self._cache ) >= self.CACHE_SIZE:
+            del self._cache[ next(iter(self._cache)) ]
+        self._cache[ key ] = cells
+        return cells
+
+    #-------------------------------------------------------------------------
+    def get_views_count(self) -> int:
+        '''Returns the count of the views laid out by this engine.
+        '''
+        return self.cameras_count + self.delayed_count + (1 if self.b_target_view else 0)
+
+    #-------------------------------------------------------------------------
+    def update(self, width: int, height: int) -> bool:
+        '''Updates the current cells of the views for a cameras area size.
+        
+        Args:
+            width, height: int
+                The current size of the cameras area,  expressed
+                in pixels.
+        
+        Returns:
+            True if the area size has changed since last call,
+            in which case the views have to be laid out again
+            according to attribute 'cells',  or False otherwise.
+        '''
+        if (width, height) == self.size:
+            return False
+        self.size = (width, height)
+        self.cells = self.get_cells( width, height )
+        return True
+
+    #-------------------------------------------------------------------------
+    def _evaluate(self, width: int, height: int) -> List[CellProps]:
+        '''Evaluates the cells of the views for a cameras area size.
+        '''
+        count = self.get_views_count()
+        if count == 0 or width <= 0 or height <= 0:
+            return []
+        
+        if self.mode == LayoutMode.GRID or count == 1:
+            return self._grid( count, 0.0, 0.0, 1.0, 1.0, width, height )
+        
+        # priority mode: the first view gets the main part of the area,
+        # the other views share a strip along its longest side
+        main = self.PRIORITY_MAIN_PART
+        if width >= height * self.frames_ratio:
+            return [ (0.0, 0.0, main, 1.0),
+                     *self._grid( count - 1, main, 0.0, 1.0 - main, 1.0, width, height ) ]
+        else:
+            return [ (0.0, 0.0, 1.0, main),
+                     *self._grid( count - 1, 0.0, main, 1.0, 1.0 - main, width, height ) ]
+
+    #-------------------------------------------------------------------------
+    def _grid(self, count : int  ,
+                    x     : float,
+                    y     : float,
+                    w     : float,
+                    h     : float,
+                    width : int  ,
+                    height: int   ) -> List[CellProps]:
+        '''Returns the cells of a grid of views within a proportional part of the area.
+        
+        The count of columns maximizes the size of the frames
+        displayed in cells.  When two grids display frames of
+        the same size, the one with less empty cells and then
+        with less rows is preferred.
+        '''
+        part_width, part_height = w * width, h * height
+        
+        best_key, best_cols = None, 1
+        for cols in range( 1, count + 1 ):
+            rows = math.ceil( count / cols )
+            cell_width, cell_height = part_width / cols, part_height / rows
+            frame_width = min( cell_width, cell_height * self.frames_ratio )
+            key = (round(frame_width), -(cols * rows - count), -rows)
+            if best_key is None or key > best_key:
+                best_key, best_cols = key, cols
+        
+        cols = best_cols
+        rows = math.ceil( count / cols )
+        cell_w, cell_h = w / cols, h / rows
+        return [ (x + (index % cols) * cell_w, y + (index // cols) * cell_h, cell_w, cell_h)
+                    for index in range(count) ]
+
+    #-------------------------------------------------------------------------
+    # Class data
+    CACHE_SIZE = 8
+    PRIORITY_MAIN_PART = 2 / 3
+
+#=====   end of   src.Display.views_layout   =====#
@@ -27,6 +27,7 @@ import cv2
 import numpy as np
 
 from src.App.avt_config  import AVTConfig
+from src.GUIItems.icons  import Icons
 from src.Utils.rgb_color import *
 
 
@@ -782,6 +783,19 @@ def prepare_timer_icons() -> None:
         print( 'failed due to exception', str(e) )
 
 
+#-------------------------------------------------------------------------
+def prepare_icons_atlas() -> None:
+    '''Packs all the controls icons into the single icons atlas.
+    '''
+    print( 'icons atlas packing: ', end='' )
+    try:
+        Icons.build_atlas()
+        print( ' ok' )
+
+    except Exception as e:
+        print( 'failed due to exception', str(e) )
+
+
 #=============================================================================
 if __name__ == '__main__':
     """Script description.
@@ -797,6 +811,7 @@ if __name__ == '__main__':
     prepare_switch_buttons()
     prepare_target_button()
     prepare_timer_icons()
+    prepare_icons_atlas()
     
     print( "\n-- done!" )
 
@@ -34,7 +34,7 @@ SOFTWARE.
 import cv2
 from typing import List, Tuple
 
-from src.Utils.rgb_color                     import DARK_RED, GRAY, RGBColor, WHITE
+from src.Utils.rgb_color                     import DARK_RED, GRAY, Palette, RGBColor, WHITE
 from src.GUIItems.font                       import Font
 from src.GUIItems.Controls.gui_control_base  import GUIControlBase
 from src.Utils.types                         import Numeric
@@ -146,8 +146,8 @@ class SliderBase( GUIControlBase ):
         self.max_value = max_value
         self.value     = current_value
         
-        self.bar_color = bar_color
-        self.cursor_color = cursor_color
+        self.bar_color = Palette.freeze( bar_color )
+        self.cursor_color = Palette.freeze( cursor_color )
         self.show_cursor_text = show_cursor_text
         self.set_font( text_font )
         self.shadow_height = shadow_height
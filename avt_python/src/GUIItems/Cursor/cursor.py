@@ -95,25 +95,52 @@ class Cursor( _Cursor ):
     """
 
 #=============================================================================
+# Notice: cursors instances are lazily created on their first access, see
+#         module function '__getattr__()' below.
+_CURSORS_IDS = {
+    'Cursor_NORMAL'         : CursorID.NORMAL         ,
+    'Cursor_CROSSHAIR'      : CursorID.CROSSHAIR      ,
+    'Cursor_HAND'           : CursorID.HAND           ,
+    'Cursor_HELP'           : CursorID.HELP           ,
+    'Cursor_NO'             : CursorID.NO             ,
+    'Cursor_SIZE'           : CursorID.SIZE           ,
+    'Cursor_SIZE_DOWN'      : CursorID.SIZE_DOWN      ,
+    'Cursor_SIZE_DOWN_LEFT' : CursorID.SIZE_DOWN_LEFT ,
+    'Cursor_SIZE_DOWN_RIGHT': CursorID.SIZE_DOWN_RIGHT,
+    'Cursor_SIZE_LEFT'      : CursorID.SIZE_LEFT      ,
+    'Cursor_SIZE_LEFT_RIGHT': CursorID.SIZE_LEFT_RIGHT,
+    'Cursor_SIZE_RIGHT'     : CursorID.SIZE_RIGHT     ,
+    'Cursor_SIZE_UP'        : CursorID.SIZE_UP        ,
+    'Cursor_SIZE_UP_DOWN'   : CursorID.SIZE_UP_DOWN   ,
+    'Cursor_SIZE_UP_LEFT'   : CursorID.SIZE_UP_LEFT   ,
+    'Cursor_SIZE_UP_RIGHT'  : CursorID.SIZE_UP_RIGHT  ,
+    'Cursor_TEXT'           : CursorID.TEXT           ,
+    'Cursor_WAIT'           : CursorID.WAIT           ,
+    'Cursor_WAIT_ARROW'     : CursorID.WAIT_ARROW     ,
+}
 
-Cursor_NORMAL          = Cursor( CursorID.NORMAL         , True )
-Cursor_CROSSHAIR       = Cursor( CursorID.CROSSHAIR      , True )
-Cursor_HAND            = Cursor( CursorID.HAND           , True )
-Cursor_HELP            = Cursor( CursorID.HELP           , True )
-Cursor_NO              = Cursor( CursorID.NO             , True )
-Cursor_SIZE            = Cursor( CursorID.SIZE           , True )
-Cursor_SIZE_DOWN       = Cursor( CursorID.SIZE_DOWN      , True )
-Cursor_SIZE_DOWN_LEFT  = Cursor( CursorID.SIZE_DOWN_LEFT , True )
-Cursor_SIZE_DOWN_RIGHT = Cursor( CursorID.SIZE_DOWN_RIGHT, True )
-Cursor_SIZE_LEFT       = Cursor( CursorID.SIZE_LEFT      , True )
-Cursor_SIZE_LEFT_RIGHT = Cursor( CursorID.SIZE_LEFT_RIGHT, True )
-Cursor_SIZE_RIGHT      = Cursor( CursorID.SIZE_RIGHT     , True )
-Cursor_SIZE_UP         = Cursor( CursorID.SIZE_UP        , True )
-Cursor_SIZE_UP_DOWN    = Cursor( CursorID.SIZE_UP_DOWN   , True )
-Cursor_SIZE_UP_LEFT    = Cursor( CursorID.SIZE_UP_LEFT   , True )
-Cursor_SIZE_UP_RIGHT   = Cursor( CursorID.SIZE_UP_RIGHT  , True )
-Cursor_TEXT            = Cursor( CursorID.TEXT           , True )
-Cursor_WAIT            = Cursor( CursorID.WAIT           , True )
-Cursor_WAIT_ARROW      = Cursor( CursorID.WAIT_ARROW     , True )
+
+#-------------------------------------------------------------------------
+def __getattr__(name: str) -> Cursor:
+    '''Creates the specified cursor instance on its first access.
+    
+    Once created, the cursor is stored in this module namespace
+    and this function is no more called for it.
+    
+    Args:
+        name: str
+            The name of the cursor instance, e.g. 'Cursor_NORMAL'.
+    
+    Raises:
+        AttributeError: the specified name is not the name of
+            a cursor instance.
+    '''
+    try:
+        cursor_id = _CURSORS_IDS[ name ]
+    except KeyError:
+        raise AttributeError( f"module '{__name__}' has no attribute '{name}'" )
+    
+    cursor = globals()[ name ] = Cursor( cursor_id, True )
+    return cursor
 
 #=====   end of   src.GUIItems.Cursor.cursor   =====#
@@ -35,9 +35,8 @@ SOFTWARE.
 import cv2
 from typing import ForwardRef, Optional
 
-from src.Shapes.offset       import Offset
 from src.Shapes.point        import Point
-from src.Utils.rgb_color     import RGBColor, WHITE
+from src.Utils.rgb_color     import Palette, RGBColor, WHITE
 from src.Display.view        import View
 from src.GUIItems.viewable   import Viewable
 
@@ -99,7 +98,7 @@ class Font:
         
         self.size = None
         self.set_color( color )
-        self.bg_color = bg_color.copy() if bg_color is not None else None
+        self.bg_color = Palette.freeze( bg_color )
         self.bold = bold
         self.italic = italic
         self.sans_serif = sans_serif
@@ -130,14 +129,14 @@ class Font:
         if other is None:
             return Font( self.size,
                          self.color,
-                         self.bg_color if self.bg_color is not None else None,
+                         self.bg_color,
                          self.bold,
                          self.italic,
                          self.sans_serif )
         else:
             self.size = other.size
             self.set_color( other.color )
-            self.bg_color = other.bg_color.copy() if other.bg_color is not None else None,
+            self.bg_color = other.bg_color
             self.bold = other.bold
             self.italic = other.italic
             self.sans_serif = other.sans_serif
@@ -179,33 +178,31 @@ class Font:
                 bg_color = (0,0,0)
                 offset = 1
     
-                view.content = cv2.putText( view.content,
-                                            text,
-                                            (pos + offset).to_tuple(),
-                                            self.cv_font,
-                                            self.font_scale,
-                                            bg_color,
-                                            self.thickness,
-                                            cv2.LINE_AA )
+                cv2.putText( view.content,
+                             text,
+                             pos.to_tuple( offset, offset ),
+                             self.cv_font,
+                             self.font_scale,
+                             bg_color,
+                             self.thickness,
+                             cv2.LINE_AA )
         else:
             # put chars over background solid color
             _text_size, _baseline = cv2.getTextSize( text, self.cv_font, self.font_scale, self.thickness )
-            pt1 = pos + Offset(0, -self.thickness)
-            pt2 = pos + Offset(*_text_size)
             cv2.rectangle( view.content,
-                           (pt1.x, pt1.y),
-                           (pt2.x, pt2.y),
+                           pos.to_tuple( 0, -self.thickness ),
+                           pos.to_tuple( *_text_size ),
                            self.bg_color.color,
                            -1 )
 
-        view.content = cv2.putText( view.content,
-                                    text,
-                                    pos.to_tuple(),
-                                    self.cv_font,
-                                    self.font_scale,
-                                    self.color.color,
-                                    self.thickness,
-                                    cv2.LINE_AA )
+        cv2.putText( view.content,
+                     text,
+                     pos.to_tuple(),
+                     self.cv_font,
+                     self.font_scale,
+                     self.color.color,
+                     self.thickness,
+                     cv2.LINE_AA )
         if b_forced:
             view.draw()
 
@@ -255,6 +252,10 @@ class Font:
     def set_color(self, new_color: RGBColor) -> FontRef:
         '''Changes the color of this font.
         
+        The color is interned in the palette, so  that  the
+        shades  derived from it while drawing are cached and
+        never rebuilt.
+        
         Args:
             new_color: RGBColor
                 A reference to the new color.
@@ -262,7 +263,7 @@ class Font:
         Returns:
             A reference to this instance of Font.
         '''
-        self.color = new_color.copy()
+        self.color = Palette.freeze( new_color )
         return self
 
     #-------------------------------------------------------------------------
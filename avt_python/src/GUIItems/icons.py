@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class Icons
+#    class LazyIcon
+#
+#  and constants
+#    PICTS_DIR
+#    CONTROLS_PICTS_DIR
+#
+
+
+#=============================================================================
+import cv2
+import json
+import numpy as np
+import os
+import struct
+from threading   import Lock
+import time
+from typing      import Any, Dict, Iterable, Tuple
+
+from src.Utils.startup_report import StartupReport
+
+
+#=============================================================================
+PICTS_DIR = os.path.normpath( os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                           '..', '..', '..', 'picts') )
+CONTROLS_PICTS_DIR = os.path.join( PICTS_DIR, 'controls' )
+
+
+#=============================================================================
+class Icons:
+    """The cache of the icons pictures of application AVT.
+    
+    This is a namespace for class methods only.  Icons are
+    loaded lazily on their first use and are then cached.
+    
+    When the pre-packed icons atlas is available (see method
+    'build_atlas()'),  all icons are  memory-mapped  at once
+    from  this  single  file and each icon is a sub-view of
+    the atlas array. Otherwise, each icon is read from  its
+    own picture file.
+    
+    Icons sizes are available without loading the pictures,
+    either from the atlas index or from the  header  of  the
+    PNG files.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def build_atlas(cls, names: Iterable[str] = None) -> None:
+        '''Packs the icons pictures into one single atlas file.
+        
+        Icons are packed on shelves sorted by height. The atlas
+        is  saved  as  a NumPy '.npy' file,  which can be memory
+        mapped at load time, and its index is saved as a  JSON
+        file.
+        
+        Args:
+            names: Iterable[str]
+                The names of the icons to be packed, without
+                extension.  Defaults to None, in which  case
+                all the PNG pictures in the controls pictures
+                directory are packed.
+        '''
+        if names is None:
+            names = [ os.path.splitext(f)[0] for f in sorted(os.listdir(CONTROLS_PICTS_DIR))
+                                                 if f.endswith('.png') ]
+        
+        pictures = { name: cv2.imread(cls._get_file_path(name)) for name in names }
+        pictures = { name: img for name, img in pictures.items() if img is not None }
+        
+        # shelves packing
+        index = {}
+        x = y = shelf_height = atlas_width = 0
+        for name, img in sorted( pictures.items(), key=lambda item: -item[1].shape[0] ):
+            height, width = img.shape[:2]
+            if x > 0 and x + width > cls.ATLAS_MAX_WIDTH:
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            index[ name ] = (y, x, height, width)
+            x += width
+            shelf_height = max( shelf_height, height )
+            atlas_width  = max( atlas_width, x )
+        
+        atlas = np.zeros( (y + shelf_height, atlas_width, 3), np.uint8 )
+        for name, (y, x, height, width) in index.items():
+            atlas[ y:y+height, x:x+width, : ] = pictures[ name ]
+        
+        np.save( cls.ATLAS_PATH, atlas )
+        with open( cls.ATLAS_INDEX_PATH, 'w' ) as fp:
+            json.dump( index, fp, indent=1, sort_keys=True )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get(cls, name: str) -> np.ndarray:
+        '''Returns the picture of an icon.
+        
+        Args:
+            name: str
+                The name of the icon,  i.e. the name  of  its 
+                picture file in the controls pictures directory,
+                without extension.
+        
+        Returns:
+            A reference to the BGR picture of the icon, or None
+            if this icon cannot be found.
+        '''
+        try:
+            return cls._cache[ name ]
+        except KeyError:
+            pass
+        
+        with cls._lock:
+            if name not in cls._cache:
+                start_time = time.perf_counter()
+                cls._load_atlas()
+                try:
+                    y, x, height, width = cls._atlas_index[ name ]
+                    img = cls._atlas[ y:y+height, x:x+width, : ]
+                except (KeyError, TypeError):
+                    img = cv2.imread( cls._get_file_path(name) )
+                cls._cache[ name ] = img
+                StartupReport.add( 'assets', name, time.perf_counter() - start_time )
+            return cls._cache[ name ]
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_size(cls, name: str) -> Tuple[int, int]:
+        '''Returns the (height, width) of an icon without loading its picture.
+        
+        Args:
+            name: str
+                The name of the icon,  i.e. the name  of  its 
+                picture file in the controls pictures directory,
+                without extension.
+        
+        Returns:
+            The (height, width) of the icon,  in pixels,  or
+            (0, 0) if this icon cannot be found.
+        '''
+        with cls._lock:
+            cls._load_atlas_index()
+            try:
+                return tuple( cls._atlas_index[name][2:] )
+            except (KeyError, TypeError):
+                pass
+        
+        try:
+            with open( cls._get_file_path(name), 'rb' ) as fp:
+                header = fp.read( 24 )
+            width, height = struct.unpack( '>II', header[16:24] )
+            return (height, width)
+        except (OSError, struct.error):
+            return (0, 0)
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _get_file_path(cls, name: str) -> str:
+        '''Returns the path to the picture file of an icon.
+        '''
+        return os.path.join( CONTROLS_PICTS_DIR, f"{name}.png" )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _load_atlas(cls) -> None:
+        '''Memory-maps the icons atlas, if available.
+        
+        Must be called with the class lock acquired.
+        '''
+        if cls._atlas is None and cls._load_atlas_index():
+            try:
+                cls._atlas = np.load( cls.ATLAS_PATH, mmap_mode='r' )
+            except (OSError, ValueError):
+                cls._atlas_index = {}
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _load_atlas_index(cls) -> bool:
+        '''Loads the index of the icons atlas, if available.
+        
+        Must be called with the class lock acquired.
+        
+        Returns:
+            True if the atlas index is available, or False otherwise.
+        '''
+        if cls._atlas_index is None:
+            try:
+                with open( cls.ATLAS_INDEX_PATH ) as fp:
+                    cls._atlas_index = json.load( fp )
+            except (OSError, ValueError):
+                cls._atlas_index = {}
+        return len( cls._atlas_index ) > 0
+
+    #-------------------------------------------------------------------------
+    # Class data
+    ATLAS_MAX_WIDTH  = 1024
+    ATLAS_PATH       = os.path.join( CONTROLS_PICTS_DIR, 'icons-atlas.npy' )
+    ATLAS_INDEX_PATH = os.path.join( CONTROLS_PICTS_DIR, 'icons-atlas.json' )
+
+    _atlas      : np.ndarray = None
+    _atlas_index: Dict[ str, Tuple[int, int, int, int] ] = None
+    _cache      : Dict[ str, np.ndarray ] = {}
+    _lock = Lock()
+
+
+#=============================================================================
+class LazyIcon:
+    """The class of lazily loaded icons.
+    
+    This is a descriptor to be used as a class attribute. The
+    icon picture is loaded on first access only, e.g.:
+        class _CtrlExample:
+            _ICON_ON = LazyIcon( 'example-on' )
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, name: str) -> None:
+        '''Constructor.
+        
+        Args:
+            name: str
+                The name of the icon,  i.e. the name  of  its 
+                picture file in the controls pictures directory,
+                without extension.
+        '''
+        self.name = name
+
+    #-------------------------------------------------------------------------
+    def __get__(self, instance: Any, owner: type = None) -> np.ndarray:
+        '''Returns the picture of this icon.
+        '''
+        return Icons.get( self.name )
+
+#=====   end of   src.GUIItems.icons   =====#
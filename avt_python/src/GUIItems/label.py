@@ -27,7 +27,7 @@ from .avt_fonts          import AVTDefaultFont
 from src.GUIItems.Controls.gui_control_base   import GUIControlBase
 from .font               import Font
 from src.Shapes.point    import Point
-from src.Utils.rgb_color import RGBColor
+from src.Utils.rgb_color import Palette, RGBColor
 from src.Display.view    import View
 
 
@@ -192,7 +192,7 @@ class Label( GUIControlBase ):
         if color != self.font.bg_color:
             if self.font is AVTDefaultFont:
                 self.font = AVTDefaultFont.copy()
-            self.font.bg_color = color.copy()
+            self.font.bg_color = Palette.freeze( color )
 
     #-------------------------------------------------------------------------
     def set_color(self, color: RGBColor) -> None:
@@ -206,7 +206,7 @@ class Label( GUIControlBase ):
         if color != self.font.color:
             if self.font is AVTDefaultFont:
                 self.font = AVTDefaultFont.copy()
-            self.font.color = color.copy()
+            self.font.color = Palette.freeze( color )
 
     #-------------------------------------------------------------------------
     def set_font(self, font: Font = None, size: int = None) -> None:
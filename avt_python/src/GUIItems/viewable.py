@@ -25,7 +25,7 @@ SOFTWARE.
 #=============================================================================
 import numpy as np
 
-from src.Utils.rgb_color import RGBColor
+from src.Utils.rgb_color import Palette, RGBColor
 
 
 #=============================================================================
@@ -64,13 +64,22 @@ class Viewable:
         self.y        = y
         self.width    = width
         self.height   = height
-        self.bg_color = bg_color
+        self.bg_color = Palette.freeze( bg_color )
+        self.create_content()
 
+    #-------------------------------------------------------------------------
+    def create_content(self) -> None:
+        '''Creates the content of this viewable item, filled with its background color.
+        
+        The content gets the current width and height of this
+        viewable item.  It is set to None if  it  cannot  be
+        created.
+        '''
         try:
-            if bg_color is None:
-                self.content = np.zeros( (height,width,3), np.uint8 )
+            if self.bg_color is None:
+                self.content = np.zeros( (self.height,self.width,3), np.uint8 )
             else:
-                self.content = (np.zeros((height,width,3), np.uint8) + bg_color.color).astype( np.uint8 )
+                self.content = np.full( (self.height,self.width,3), self.bg_color.to_array(), np.uint8 )
         
         except:
             self.content = None
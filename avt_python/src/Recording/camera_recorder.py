@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import cv2
+import numpy as np
+import os
+from threading   import Event, Thread
+import time
+from typing      import Any, Dict, ForwardRef
+
+from src.App.avt_config                  import AVTConfig
+from .frame_index                        import FrameIndex
+from .thumbnails_writer                  import ThumbnailsWriter
+from src.Utils.Scheduling                import Scheduler
+from src.Utils.Scheduling.opencv_threads import OpenCVStage, OpenCVThreads
+from src.Utils.Scheduling.threads_policy import ThreadsPolicy
+from src.Utils.types                     import Frame
+
+
+#=============================================================================
+CameraViewRef = ForwardRef( "CameraView" )
+SessionRef    = ForwardRef( "Session" )
+
+
+#=============================================================================
+class CameraRecorder( Thread ):
+    """The class of the background encoders of cameras streams.
+    
+    Every camera gets its own recorder thread while recording.
+    The recorder subscribes to the frame bus of the camera:  the
+    bounded queue of the subscriber - see 'FrameBus.subscribe()'
+    - decouples the encoding from the acquisition,  which is
+    never stalled,  or for a bounded time only with policy
+    LOSSLESS.  Every read frame is copied into a preallocated
+    buffer, so that its slot in the frame bus is released at
+    once, and is then encoded with OpenCV 'VideoWriter'.  The
+    frames index of the video file is saved with it - see class
+    'FrameIndex' - and so is its thumbnails strip - see class
+    'ThumbnailsWriter'.
+    
+    Recorders run on the shared CPUs, in background, and within
+    the encoding stage of the OpenCV threads budget.  Notice:
+    OpenCV releases the GIL while encoding,  so that cameras
+    are encoded in parallel.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, camera_view: CameraViewRef,
+                       session    : SessionRef   ,
+                       codec      : str   = None ,
+                       duration_s : float = None ,
+                       origin_time: float = None  ) -> None:
+        '''Constructor.
+        
+        Args:
+            camera_view: CameraView
+                A reference to the view of the recorded camera.
+            session: Session
+                A reference to the recording session. The video file
+                is created in the directory of the session, and its
+                stream is added to the session once recorded.
+            codec: str
+                The name of the codec,  one of the keys of 'CODECS'.
+                If None, 'AVTConfig.RECORD_CODEC' is used. Defaults
+                to None.
+            duration_s: float
+                The max duration of the recording,  in seconds.
+                If None, the recording lasts until method 'stop()'
+                is called. Defaults to None.
+            origin_time: float
+                The 'time.perf_counter()' value of the start of the
+                recording session, from which the timestamps of the
+                frames are evaluated. If None, the start time of this
+                recorder is used. Defaults to None.
+        
+        Raises:
+            ValueError: the codec is unknown.
+        '''
+        codec = AVTConfig.RECORD_CODEC if codec is None else codec
+        if codec not in self.CODECS:
+            raise ValueError( f"unknown codec '{codec}', expected one of {', '.join(self.CODECS)}" )
+        
+        self.camera_view = camera_view
+        self.codec       = codec
+        self.duration_s  = duration_s
+        self.file_path   = os.path.join( session.path, f"camera-{camera_view.camera.get_id()}{self.CODECS[codec][1]}" )
+        self.frame_index = FrameIndex( self.CODECS[codec][2] )
+        self.origin_time = origin_time
+        self.session     = session
+        self.thumbnails  = ThumbnailsWriter( self.file_path )
+        self.stop_event  = Event()
+        self.subscriber  = None
+        
+        self.frames_count = 0   # count of encoded frames
+        self.torn_count   = 0   # count of frames overwritten in the bus while being copied
+        self.encode_time_s = 0.0
+        self.start_time   = None
+        self.end_time     = None
+        self._buffer      = None
+        
+        super().__init__( name=f"cam-rec-{camera_view.camera.get_id()}-thrd" )
+
+    #-------------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        '''Returns the statistics of this recorder.
+        
+        Returns:
+            A dictionary with the file path,  the count of encoded
+            and of dropped frames,  the current depth and the size
+            of the queue,  the encoding rate in frames per second
+            and the mean encoding duration per frame in ms.
+        '''
+        subscriber = self.subscriber
+        elapsed_s = 0.0
+        if self.start_time is not None:
+            elapsed_s = (self.end_time or time.perf_counter()) - self.start_time
+        return { 'file'          : self.file_path,
+                 'frames_count'  : self.frames_count,
+                 'dropped_count' : self.torn_count + (0 if subscriber is None else subscriber.dropped_count),
+                 'queue_depth'   : 0 if subscriber is None else subscriber.get_stats()[ 'lag' ],
+                 'queue_size'    : 0 if subscriber is None else subscriber.queue_size,
+                 'encode_fps'    : self.frames_count / elapsed_s if elapsed_s > 0.0 else 0.0,
+                 'encode_ms'     : 1000.0 * self.encode_time_s / self.frames_count if self.frames_count else 0.0,
+                 'running'       : self.is_alive() }
+
+    #-------------------------------------------------------------------------
+    def run(self) -> None:
+        '''The running loop of this thread.
+        
+        Full resolution frames are requested to the acquisition
+        of the camera while recording.  The video file is open
+        on the first frame,  with the full H/W resolution of the
+        camera.  Frames of another size - i.e. the few scaled ones
+        that are delivered just before full resolution is in effect
+        - are resized.
+        '''
+        queue_size = min( AVTConfig.RECORD_QUEUE_SIZE, self.camera_view.frame_bus.capacity )
+        self.subscriber = self.camera_view.frame_bus.subscribe( self.SUBSCRIBER_NAME,
+                                                                AVTConfig.RECORD_POLICY,
+                                                                queue_size=queue_size )
+        # requested once subscribed only, so that it is always released
+        acq_thread = self.camera_view.acq_thread
+        acq_thread.request_full_resolution()
+        writer = None
+        self.start_time = time.perf_counter()
+        origin_time = self.start_time if self.origin_time is None else self.origin_time
+        deadline = None if self.duration_s is None else self.start_time + self.duration_s
+        
+        try:
+            with Scheduler( 3 ) as scheduler, OpenCVStage( OpenCVThreads.ENCODING ):
+                ThreadsPolicy.set_encoding_thread( scheduler )
+                
+                while not self.stop_event.is_set():
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+                    
+                    indexed_frame = self.subscriber.get_next( self.WAIT_TIMEOUT_S )
+                    if indexed_frame is None:
+                        continue
+                    capture_time = indexed_frame.capture_time
+                    if capture_time is None:
+                        capture_time = time.perf_counter()
+                    
+                    frame = self._copied( indexed_frame.frame, writer is None )
+                    if not self.subscriber.is_valid():
+                        self.torn_count += 1
+                        continue
+                    
+                    if writer is None:
+                        writer = self._open_writer( frame )
+                        if writer is None:
+                            break
+                    
+                    start = time.perf_counter()
+                    writer.write( frame )
+                    self.encode_time_s += time.perf_counter() - start
+                    self.frame_index.append( capture_time - origin_time )
+                    self.frames_count += 1
+                    self._append_thumbnail( frame, capture_time - origin_time )
+        
+        finally:
+            self.end_time = time.perf_counter()
+            if writer is not None:
+                writer.release()
+                self._add_stream()
+            self.subscriber.unsubscribe()
+            acq_thread.release_full_resolution()
+
+    #-------------------------------------------------------------------------
+    def stop(self) -> None:
+        '''Definitively stops this recorder.
+        
+        The frames that are still in the queue are not encoded.
+        '''
+        self.stop_event.set()
+
+    #-------------------------------------------------------------------------
+    def _add_stream(self) -> None:
+        '''Adds the recorded stream to the session, with its index, its thumbnails and its properties.
+        
+        Errors are printed on console:  the video file is kept
+        anyway.
+        '''
+        camera = self.camera_view.camera
+        height, width = self._buffer.shape[:2]
+        thumbnails = None
+        try:
+            if self.thumbnails is not None:
+                thumbnails = self.thumbnails.close()
+        except OSError as e:
+            print( f"!!! cannot save the thumbnails of '{self.file_path}': {e}" )
+        
+        try:
+            self.session.add_stream( camera.get_id(),
+                                     self.file_path,
+                                     self.frame_index,
+                                     codec         = self.codec,
+                                     width         = width,
+                                     height        = height,
+                                     fps           = camera.get_fps() or self.DEFAULT_FPS,
+                                     capture_mode  = camera.get_mode().to_dict(),
+                                     dropped_count = self.get_stats()[ 'dropped_count' ],
+                                     thumbnails    = thumbnails )
+        except (OSError, ValueError) as e:
+            print( f"!!! cannot save the index of '{self.file_path}': {e}" )
+
+    #-------------------------------------------------------------------------
+    def _append_thumbnail(self, frame: Frame, timestamp_s: float) -> None:
+        '''Appends the thumbnail of a recorded frame to the thumbnails strip, once per period.
+        
+        Thumbnails are given up on error,  the video file being
+        recorded anyway.
+        '''
+        if self.thumbnails is not None:
+            try:
+                self.thumbnails.append( frame, timestamp_s )
+            except OSError as e:
+                print( f"!!! cannot write the thumbnails of '{self.file_path}': {e}" )
+                self.thumbnails = None
+
+    #-------------------------------------------------------------------------
+    def _copied(self, frame: Frame, b_first: bool) -> Frame:
+        '''Copies a frame into the preallocated buffer of this recorder.
+        
+        The buffer is allocated with the first frame,  at the
+        full H/W resolution of the camera  -  or at the size of
+        the frame when this resolution is not known - so that a
+        first frame that has been scaled before full resolution
+        was in effect does not set the size of the recording.
+        Frames of another size are resized into it.
+        
+        Args:
+            frame: Frame
+                A reference to the frame to be copied.
+            b_first: bool
+                True for the first frame of the recording.
+        
+        Returns:
+            A reference to the buffer.
+        '''
+        if b_first or self._buffer is None:
+            camera = self.camera_view.camera
+            if camera.hw_default_width and camera.hw_default_height:
+                self._buffer = np.empty( (camera.hw_default_height, camera.hw_default_width, *frame.shape[2:]), frame.dtype )
+            else:
+                self._buffer = np.empty_like( frame )
+        
+        if frame.shape == self._buffer.shape:
+            np.copyto( self._buffer, frame )
+        else:
+            height, width = self._buffer.shape[:2]
+            cv2.resize( frame, (width, height), dst=self._buffer, interpolation=cv2.INTER_AREA )
+        return self._buffer
+
+    #-------------------------------------------------------------------------
+    def _open_writer(self, frame: Frame) -> cv2.VideoWriter:
+        '''Opens the video file with the size of a frame.
+        
+        Returns:
+            A reference to the video writer,  or None if the video
+            file cannot be open, in which case an error message is
+            printed on console.
+        '''
+        height, width = frame.shape[:2]
+        fourcc = cv2.VideoWriter_fourcc( *self.CODECS[self.codec][0] )
+        fps = self.camera_view.camera.get_fps() or self.DEFAULT_FPS
+        
+        writer = cv2.VideoWriter( self.file_path, fourcc, fps, (width, height) )
+        if not writer.isOpened():
+            print( f"!!! cannot open '{self.file_path}' for recording with codec '{self.codec}'" )
+            return None
+        return writer
+
+    #-------------------------------------------------------------------------
+    # Class data
+    CODECS = { 'mjpg': ('MJPG', '.avi',  1),  # codec name: (fourcc, file extension, keyframes interval)
+               'mp4v': ('mp4v', '.mp4', 12),  # OpenCV FFmpeg encoders emit one intra frame every 12 frames
+               'raw' : ('I420', '.avi',  1),  # uncompressed YUV 4:2:0
+               'xvid': ('XVID', '.avi', 12) }
+    
+    DEFAULT_FPS     = 30.0
+    SUBSCRIBER_NAME = 'recorder'
+    WAIT_TIMEOUT_S  = 0.1  # period of the checks of the stop request while no frame is captured
+
+#=====   end of   src.Recording.camera_recorder   =====#
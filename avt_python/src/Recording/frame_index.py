@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from bisect      import bisect_right
+import numpy as np
+from typing      import ForwardRef
+
+
+#=============================================================================
+FrameIndexRef = ForwardRef( "FrameIndex" )
+
+
+#=============================================================================
+class FrameIndex:
+    """The class of the frames indexes of recorded video streams.
+    
+    The index of a video stream gets, for each frame  of  the
+    stream,  its timestamp - in seconds since the start of the
+    recording session - and its keyframe status.  Frames  are
+    designated  by their position in the stream,  which is the
+    position used by OpenCV  'VideoCapture'  for  seeking,  so
+    that the video container itself maps positions to bytes
+    offsets.
+    
+    Finding the frame displayed at some time is a binary search,
+    i.e. O(log n),  and finding the keyframe from which a frame
+    is to be decoded is bounded by the keyframes interval of the
+    codec - see 'CameraRecorder.CODECS'.
+    
+    Indexes are saved as NumPy arrays of packed (timestamp,
+    keyframe) records - 9 bytes per frame - which are loaded
+    memory-mapped,  so that loading an index does not depend on
+    the duration of the stream.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, keyframes_interval: int = 1) -> None:
+        '''Constructor.
+        
+        Args:
+            keyframes_interval: int
+                The interval between keyframes of the indexed
+                stream, in frames.  Intra-only codecs get 1. De-
+                faults to 1.
+        '''
+        self.keyframes_interval = keyframes_interval
+        self.timestamps = []
+        self.keyframes  = []
+
+    #-------------------------------------------------------------------------
+    def __len__(self) -> int:
+        '''Returns the count of indexed frames.
+        '''
+        return len( self.timestamps )
+
+    #-------------------------------------------------------------------------
+    @property
+    def duration_s(self) -> float:
+        return float( self.timestamps[-1] ) if len( self.timestamps ) else 0.0
+
+    #-------------------------------------------------------------------------
+    def append(self, timestamp_s: float) -> None:
+        '''Appends the next frame of the stream to this index.
+        
+        Args:
+            timestamp_s: float
+                The timestamp of the frame,  in seconds since the
+                start of the recording session.
+        '''
+        self.keyframes.append( len(self.timestamps) % self.keyframes_interval == 0 )
+        self.timestamps.append( timestamp_s )
+
+    #-------------------------------------------------------------------------
+    def find(self, time_s: float) -> int:
+        '''Returns the position of the frame that is displayed at some time.
+        
+        This is the last frame with a timestamp not  greater
+        than the specified time, or the first frame when the
+        time precedes it.
+        
+        Args:
+            time_s: float
+                The time, in seconds since the start of the re-
+                cording session.
+        
+        Returns:
+            The position of the frame in the stream, or -1 if
+            this index is empty.
+        '''
+        if len( self.timestamps ) == 0:
+            return -1
+        return max( 0, bisect_right(self.timestamps, time_s) - 1 )
+
+    #-------------------------------------------------------------------------
+    def get_keyframe(self, position: int) -> int:
+        '''Returns the position of the keyframe from which a frame is to be decoded.
+        '''
+        while position > 0 and not self.keyframes[ position ]:
+            position -= 1
+        return position
+
+    #-------------------------------------------------------------------------
+    def get_timestamp(self, position: int) -> float:
+        '''Returns the timestamp of a frame, in seconds since the start of the recording session.
+        '''
+        return float( self.timestamps[position] )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def load(cls, file_path: str, keyframes_interval: int = 1) -> FrameIndexRef:
+        '''Loads a saved index, memory-mapped.
+        
+        Args:
+            file_path: str
+                The path of the index file.
+            keyframes_interval: int
+                The interval between keyframes of the indexed
+                stream, in frames. Defaults to 1.
+        
+        Raises:
+            OSError: the file cannot be read.
+            ValueError: the file is not a valid index.
+        '''
+        records = np.load( file_path, mmap_mode='r' )
+        if records.ndim != 1 or records.dtype != cls.DTYPE:
+            raise ValueError( f"'{file_path}' is not a frames index" )
+        index = cls( keyframes_interval )
+        index.timestamps = records[ 'timestamp' ]
+        index.keyframes  = records[ 'keyframe' ]
+        return index
+
+    #-------------------------------------------------------------------------
+    def save(self, file_path: str) -> None:
+        '''Saves this index as a NumPy array of (timestamp, keyframe) records.
+        '''
+        records = np.empty( len(self.timestamps), self.DTYPE )
+        records[ 'timestamp' ] = self.timestamps
+        records[ 'keyframe' ]  = self.keyframes
+        np.save( file_path, records )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    DTYPE = np.dtype( [('timestamp', '<f8'), ('keyframe', '?')] )
+
+#=====   end of   src.Recording.frame_index   =====#
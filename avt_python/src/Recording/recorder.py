@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from threading   import Lock
+import time
+from typing      import Any, Dict, ForwardRef, List
+
+from src.App.avt_config          import AVTConfig
+from .camera_recorder            import CameraRecorder
+from .session                    import Session
+
+
+#=============================================================================
+MainWindowRef = ForwardRef( "MainWindow" )
+
+
+#=============================================================================
+class Recorder:
+    """The class of the recorder of the cameras of the AVT application.
+    
+    A recording session records all the running cameras of a
+    window in parallel,  each one with its own background en-
+    coder - see class 'CameraRecorder'.  The video files of a
+    session are stored in their own directory,  named after
+    the starting date and time of the session,  within direct-
+    ory 'AVTConfig.RECORDS_PATH',  with their indexes and the
+    manifest of the session - see class 'Session'.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, window: MainWindowRef) -> None:
+        '''Constructor.
+        
+        Args:
+            window: MainWindow
+                A reference to the window whose camera views are
+                recorded.
+        '''
+        self.window = window
+        self.camera_recorders = []
+        self.session = None
+        self.lock = Lock()
+
+    #-------------------------------------------------------------------------
+    def get_stats(self) -> List[ Dict[str, Any] ]:
+        '''Returns the statistics of the cameras recorders of the current or last session.
+        
+        See method 'CameraRecorder.get_stats()'.
+        '''
+        return [ recorder.get_stats() for recorder in self.camera_recorders ]
+
+    #-------------------------------------------------------------------------
+    def is_recording(self) -> bool:
+        '''Returns True while at least one camera is being recorded.
+        '''
+        return any( recorder.is_alive() for recorder in self.camera_recorders )
+
+    #-------------------------------------------------------------------------
+    def start(self, duration_s: float = None, codec: str = None) -> str:
+        '''Starts a new recording session.
+        
+        Does nothing if a session is already running.
+        
+        Args:
+            duration_s: float
+                The duration of the session,  in seconds. If None,
+                the session lasts until method 'stop()' is called.
+                Defaults to None.
+            codec: str
+                The name of the codec of the video files  -  see
+                'CameraRecorder.CODECS'. If None, 'AVTConfig.RECORD_
+                CODEC' is used. Defaults to None.
+        
+        Returns:
+            The path of the directory of the session,  or None if
+            no camera can be recorded.
+        
+        Raises:
+            ValueError: the codec is unknown.
+        '''
+        with self.lock:
+            if self.is_recording():
+                return self.session.path
+            
+            camera_views = [ view for view in self.window.camera_views if view.is_ok() ]
+            if not camera_views:
+                print( "!!! no running camera to be recorded" )
+                return None
+            
+            origin_time = time.perf_counter()
+            self.session = Session.create( self._get_metadata(codec, duration_s) )
+            
+            self.camera_recorders = [ CameraRecorder( view,
+                                                      self.session,
+                                                      codec,
+                                                      duration_s,
+                                                      origin_time ) for view in camera_views ]
+            for recorder in self.camera_recorders:
+                recorder.start()
+            
+            print( f"-- recording {len(camera_views)} camera(s) into '{self.session.path}'" )
+            return self.session.path
+
+    #-------------------------------------------------------------------------
+    def stop(self) -> None:
+        '''Stops the current recording session, if any, and prints its statistics.
+        '''
+        with self.lock:
+            recorders = [ recorder for recorder in self.camera_recorders if recorder.is_alive() ]
+            for recorder in recorders:
+                recorder.stop()
+            for recorder in recorders:
+                recorder.join()
+            
+            for stats in self.get_stats():
+                print( f"-- recorded '{stats['file']}': {stats['frames_count']} frames, "
+                       f"{stats['dropped_count']} dropped, {stats['encode_fps']:.1f} fps, "
+                       f"{stats['encode_ms']:.1f} ms per frame" )
+
+    #-------------------------------------------------------------------------
+    def _get_metadata(self, codec: str, duration_s: float) -> Dict[str, Any]:
+        '''Returns the metadata of a new session, as set in the window.
+        
+        Args:
+            codec: str
+                The name of the codec of the video files,  or None
+                for 'AVTConfig.RECORD_CODEC'.
+            duration_s: float
+                The duration of the session, in seconds, or None.
+        '''
+        control_view = self.window.control_view
+        target_view  = self.window.target_view
+        policy = AVTConfig.ENUMERATIONS[ 'RECORD_POLICY' ]
+        layout = AVTConfig.ENUMERATIONS[ 'LAYOUT_MODE' ]
+        
+        return { 'profile'      : AVTConfig.PROFILE,
+                 'codec'        : codec or AVTConfig.RECORD_CODEC,
+                 'duration_s'   : duration_s,
+                 'record_policy': policy.NAMES.get( AVTConfig.RECORD_POLICY ),
+                 'layout_mode'  : layout.NAMES.get( self.window.views_layout.mode ),
+                 'cameras'      : [ view.camera.get_id() for view in self.window.camera_views ],
+                 'delay_s'      : None if control_view is None else control_view.delay_ctrl.slider.value,
+                 'target'       : None if target_view is None or target_view.target is None else {
+                                        'name'          : str( target_view.target ),
+                                        'simulated_dist': target_view.simulated_dist,
+                                        'true_dist'     : target_view.true_dist } }
+
+#=====   end of   src.Recording.recorder   =====#
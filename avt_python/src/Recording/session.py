@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import json
+import numpy as np
+import os
+from threading   import Lock
+import time
+from typing      import Any, Dict, ForwardRef, List, Tuple
+
+from src.App                     import __version__
+from src.App.avt_config          import AVTConfig
+from .frame_index                import FrameIndex
+
+
+#=============================================================================
+SessionRef = ForwardRef( "Session" )
+
+
+#=============================================================================
+class Session:
+    """The class of the containers of recorded training sessions.
+    
+    A session is stored in its own directory,  named after its
+    starting date and time, with:
+        - one video file per recorded camera,  'camera-<id>.<ext>';
+        - one frames index per video file,  'camera-<id>-index.npy',
+          a compact NumPy array of (timestamp, keyframe) records
+          which is loaded memory-mapped - see class 'FrameIndex';
+        - one thumbnails strip per video file,  'camera-<id>-thumbs
+          .raw',  with its own index - see class 'ThumbnailsWriter';
+        - the manifest of the session,  'session.json',  with the
+          metadata of the session - application version, profile,
+          codec, delay, target - and the description of every
+          stream - camera, capture mode, frames size and rate,
+          frames count and duration.
+    
+    Opening a session reads its manifest and maps its indexes
+    only:  video files are neither scanned nor decoded, so that
+    it is near-instant whatever the duration of the session.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, path: str, metadata: Dict[str, Any] = None) -> None:
+        '''Constructor.
+        
+        Sessions should be created with class methods 'create()'
+        and 'open()'.
+        
+        Args:
+            path: str
+                The path of the directory of the session.
+            metadata: Dict[str, Any]
+                The metadata of the session. Defaults to None.
+        '''
+        self.path = path
+        self.metadata = { 'format'     : self.FORMAT,
+                          'version'    : self.VERSION,
+                          'app_version': __version__,
+                          **(metadata or {}),
+                          'streams'    : (metadata or {}).get('streams', []) }
+        self.lock = Lock()
+
+    #-------------------------------------------------------------------------
+    @property
+    def streams(self) -> List[ Dict[str, Any] ]:
+        return self.metadata[ 'streams' ]
+
+    #-------------------------------------------------------------------------
+    def add_stream(self, camera_id   : int  ,
+                         video_file  : str  ,
+                         frame_index : FrameIndex,
+                         **properties: Any   ) -> None:
+        '''Adds the description of a recorded stream to this session and saves its manifest.
+        
+        Called once the stream has been recorded,  its index
+        being saved then.
+        
+        Args:
+            camera_id: int
+                The identifier of the recorded camera.
+            video_file: str
+                The path of the video file of the stream.
+            frame_index: FrameIndex
+                A reference to the frames index of the stream.
+            properties: Any
+                The other properties of the stream,  e.g. codec,
+                frames size and rate, capture mode, as named
+                arguments.
+        '''
+        index_file = self.get_index_file( video_file )
+        frame_index.save( os.path.join(self.path, index_file) )
+        
+        with self.lock:
+            self.metadata[ 'streams' ] = [ *(s for s in self.streams if s['camera_id'] != camera_id),
+                                           { 'camera_id'         : camera_id,
+                                             'video'             : os.path.basename( video_file ),
+                                             'index'             : index_file,
+                                             'frames_count'      : len( frame_index ),
+                                             'duration_s'        : frame_index.duration_s,
+                                             'keyframes_interval': frame_index.keyframes_interval,
+                                             **properties } ]
+            self.metadata[ 'streams' ].sort( key=lambda s: s['camera_id'] )
+            self.save()
+
+    #-------------------------------------------------------------------------
+    def get_index_path(self, stream: Dict[str, Any]) -> str:
+        '''Returns the path of the frames index of a stream of this session.
+        '''
+        return os.path.join( self.path, stream['index'] )
+
+    #-------------------------------------------------------------------------
+    def get_video_path(self, stream: Dict[str, Any]) -> str:
+        '''Returns the path of the video file of a stream of this session.
+        '''
+        return os.path.join( self.path, stream['video'] )
+
+    #-------------------------------------------------------------------------
+    def load_index(self, stream: Dict[str, Any]) -> FrameIndex:
+        '''Loads the frames index of a stream of this session, memory-mapped.
+        
+        Raises:
+            OSError: the index file cannot be read.
+            ValueError: the index file is not valid.
+        '''
+        return FrameIndex.load( self.get_index_path(stream), stream.get('keyframes_interval', 1) )
+
+    #-------------------------------------------------------------------------
+    def load_thumbnails(self, stream: Dict[str, Any]) -> Tuple[np.ndarray, FrameIndex]:
+        '''Loads the thumbnails strip of a stream of this session, memory-mapped.
+        
+        Returns:
+            The array of the thumbnails,  with shape (count, height,
+            width, 3),  and their index,  or None if the stream has
+            no thumbnails.
+        
+        Raises:
+            OSError: the thumbnails files cannot be read.
+            ValueError: the thumbnails files are not valid.
+        '''
+        thumbnails = stream.get( 'thumbnails' )
+        if not thumbnails or thumbnails[ 'count' ] == 0:
+            return None
+        strip = np.memmap( os.path.join(self.path, thumbnails['file']), np.uint8, 'r',
+                           shape=(thumbnails['count'], thumbnails['height'], thumbnails['width'], 3) )
+        frame_index = FrameIndex.load( os.path.join(self.path, thumbnails['index']) )
+        if len( frame_index ) != thumbnails[ 'count' ]:
+            raise ValueError( f"invalid thumbnails index for '{stream['video']}'" )
+        return strip, frame_index
+
+    #-------------------------------------------------------------------------
+    def save(self) -> None:
+        '''Saves the manifest of this session.
+        
+        The manifest is written into a temporary file which
+        then replaces the former one,  so that an interrupted
+        save never leaves a truncated manifest.
+        '''
+        manifest_path = os.path.join( self.path, self.MANIFEST )
+        with open( manifest_path + '.tmp', 'w', encoding='utf-8' ) as fp:
+            json.dump( self.metadata, fp, indent=2 )
+        os.replace( manifest_path + '.tmp', manifest_path )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def create(cls, metadata: Dict[str, Any] = None, root_path: str = None) -> SessionRef:
+        '''Creates a new session directory, named after the current date and time.
+        
+        Sessions that are created within the same second get a
+        '-<n>' suffix,  so that no session directory is ever
+        shared.
+        
+        Args:
+            metadata: Dict[str, Any]
+                The metadata of the new session. Defaults to None.
+            root_path: str
+                The path of the directory of the sessions.  If None,
+                'AVTConfig.RECORDS_PATH' is used. Defaults to None.
+        
+        Returns:
+            A reference to the new session, the manifest of which
+            is saved already.
+        '''
+        root_path = root_path or AVTConfig.RECORDS_PATH
+        os.makedirs( root_path, exist_ok=True )
+        name = time.strftime( '%Y%m%d-%H%M%S' )
+        path = os.path.join( root_path, name )
+        suffix = 1
+        while True:
+            try:
+                os.mkdir( path )
+                break
+            except FileExistsError:
+                suffix += 1
+                path = os.path.join( root_path, f"{name}-{suffix}" )
+        
+        session = cls( path, { 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), **(metadata or {}) } )
+        session.save()
+        return session
+
+    #-------------------------------------------------------------------------
+    @staticmethod
+    def get_index_file(video_file: str) -> str:
+        '''Returns the file name of the frames index of a video file.
+        '''
+        return os.path.splitext( os.path.basename(video_file) )[ 0 ] + '-index.npy'
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_sessions(cls, root_path: str = None) -> List[str]:
+        '''Returns the sorted paths of the recorded sessions, the last one last.
+        
+        Args:
+            root_path: str
+                The path of the directory of the sessions.  If None,
+                'AVTConfig.RECORDS_PATH' is used. Defaults to None.
+        '''
+        root_path = root_path or AVTConfig.RECORDS_PATH
+        try:
+            paths = [ entry.path for entry in os.scandir(root_path)
+                                     if entry.is_dir() and os.path.isfile(os.path.join(entry.path, cls.MANIFEST)) ]
+        except OSError:
+            return []
+        # date and time first, then '-<n>' suffixes in numerical order
+        return sorted( paths, key=lambda path: (os.path.basename(path)[:15], len(path), path) )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def open(cls, path: str) -> SessionRef:
+        '''Opens a recorded session.
+        
+        Only the manifest of the session is read.
+        
+        Args:
+            path: str
+                The path of the directory of the session.
+        
+        Returns:
+            A reference to the open session.
+        
+        Raises:
+            OSError: the manifest cannot be read.
+            ValueError: the manifest is not a valid one.
+        '''
+        with open( os.path.join(path, cls.MANIFEST), 'r', encoding='utf-8' ) as fp:
+            metadata = json.load( fp )
+        if not isinstance( metadata, dict ) or metadata.get( 'format' ) != cls.FORMAT:
+            raise ValueError( f"'{path}' is not an AVT session" )
+        if metadata.get( 'version', 0 ) > cls.VERSION:
+            raise ValueError( f"session '{path}' has been recorded with a newer version of AVT" )
+        return cls( path, metadata )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    FORMAT   = 'avt-session'
+    MANIFEST = 'session.json'
+    VERSION  = 1
+
+#=====   end of   src.Recording.session   =====#
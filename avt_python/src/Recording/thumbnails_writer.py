@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+import cv2
+import numpy as np
+import os
+from typing      import Any, Dict
+
+from src.App.avt_config          import AVTConfig
+from .frame_index                import FrameIndex
+from src.Utils.types             import Frame
+
+
+#=============================================================================
+class ThumbnailsWriter:
+    """The class of the writers of the thumbnails strips of recorded streams.
+    
+    A thumbnails strip is the low resolution proxy of a recorded
+    stream:  one frame every 'AVTConfig.THUMBNAILS_PERIOD_S',
+    downscaled by 'AVTConfig.THUMBNAILS_SCALE'. It is displayed
+    instead of the full frames while the replay is played fast,
+    since reading a thumbnail is a copy out of a memory-mapped
+    file rather than the decoding of a keyframes interval.
+    
+    Thumbnails are appended raw to their file while recording,
+    so that the memory of the recorder does not grow with the
+    duration of the recording,  and they are indexed by their
+    timestamps - see class 'FrameIndex'.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, video_path: str, period_s: float = None, scale: int = None) -> None:
+        '''Constructor.
+        
+        Args:
+            video_path: str
+                The path of the recorded video file.  The thumb-
+                nails files are named after it.
+            period_s: float
+                The period of the thumbnails,  in seconds. If None,
+                'AVTConfig.THUMBNAILS_PERIOD_S' is used. Defaults
+                to None.
+            scale: int
+                The downscaling factor of the thumbnails. If None,
+                'AVTConfig.THUMBNAILS_SCALE' is used. Defaults to
+                None.
+        '''
+        name = os.path.splitext( video_path )[ 0 ]
+        self.file_path   = name + '-thumbs.raw'
+        self.index_path  = name + '-thumbs-index.npy'
+        self.period_s    = AVTConfig.THUMBNAILS_PERIOD_S if period_s is None else period_s
+        self.scale       = AVTConfig.THUMBNAILS_SCALE if scale is None else scale
+        self.frame_index = FrameIndex()
+        self.next_time_s = 0.0
+        self._file       = None
+        self._thumbnail  = None
+
+    #-------------------------------------------------------------------------
+    def append(self, frame: Frame, timestamp_s: float) -> bool:
+        '''Appends a thumbnail of a recorded frame, once per period.
+        
+        The thumbnails file is open with the first thumbnail.
+        
+        Args:
+            frame: Frame
+                A reference to the recorded frame.  All the frames
+                of a stream have the same size.
+            timestamp_s: float
+                The timestamp of the frame,  in seconds since the
+                start of the recording session.
+        
+        Returns:
+            True if a thumbnail has been appended, or False other-
+            wise.
+        
+        Raises:
+            OSError: the thumbnails file cannot be written.
+        '''
+        if timestamp_s < self.next_time_s:
+            return False
+        
+        if self._file is None:
+            height, width = frame.shape[:2]
+            self._thumbnail = np.empty( (max(1, height // self.scale), max(1, width // self.scale), 3), np.uint8 )
+            self._file = open( self.file_path, 'wb' )
+        
+        cv2.resize( frame, self._thumbnail.shape[1::-1], dst=self._thumbnail, interpolation=cv2.INTER_AREA )
+        self._file.write( self._thumbnail.data )
+        self.frame_index.append( timestamp_s )
+        self.next_time_s += self.period_s
+        if self.next_time_s <= timestamp_s:  # frames have been missed
+            self.next_time_s = timestamp_s + self.period_s
+        return True
+
+    #-------------------------------------------------------------------------
+    def close(self) -> Dict[str, Any]:
+        '''Closes the thumbnails file and saves its index.
+        
+        Returns:
+            The description of the thumbnails strip, as stored in
+            the manifest of the session - see class 'Session' -
+            or None if no thumbnail has been written.
+        
+        Raises:
+            OSError: the index cannot be saved.
+        '''
+        if self._file is None:
+            return None
+        self._file.close()
+        self._file = None
+        self.frame_index.save( self.index_path )
+        
+        height, width = self._thumbnail.shape[:2]
+        return { 'file'    : os.path.basename( self.file_path ),
+                 'index'   : os.path.basename( self.index_path ),
+                 'count'   : len( self.frame_index ),
+                 'width'   : width,
+                 'height'  : height,
+                 'period_s': self.period_s }
+
+#=====   end of   src.Recording.thumbnails_writer   =====#
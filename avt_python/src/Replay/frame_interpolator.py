@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from collections        import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import cv2
+import numpy as np
+from threading          import RLock
+from typing             import List, Tuple
+
+from src.App.avt_config                  import AVTConfig
+from .replay_stream                      import ReplayStream
+from src.Utils.Scheduling.opencv_threads import OpenCVStage, OpenCVThreads
+from src.Utils.types                     import Frame
+
+
+#=============================================================================
+class FrameInterpolator:
+    """The class of the synthesizers of slow-motion in-between frames.
+    
+    In slow motion,  every pair of successive recorded frames
+    gets  'steps - 1'  synthesized frames in between,  'steps'
+    being the slowing factor. Two modes are available:
+        - 'flow': motion-compensated interpolation.  The dense
+          optical flow between both frames is evaluated once per
+          pair,  on downscaled gray images,  and both frames are
+          then warped to the in-between time and blended;
+        - 'blend': cross-fading of both frames,  a much cheaper
+          tier.
+    
+    Interpolations are computed by a pool of background workers,
+    ahead of the replay position - see method  'prefetch()' -
+    within the analysis stage of the OpenCV threads budget. Their
+    results are kept in a LRU cache of pairs. Method 'get()' never
+    waits for a worker:  it returns None when the in-between frame
+    is not yet available,  in which case the recorded frame is to
+    be displayed instead.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, mode: str = None) -> None:
+        '''Constructor.
+        
+        Args:
+            mode: str
+                The interpolation mode, 'flow' or 'blend'. If None,
+                'AVTConfig.SLOWMO_MODE' is used. Defaults to None.
+        
+        Raises:
+            ValueError: the mode is unknown.
+        '''
+        mode = AVTConfig.SLOWMO_MODE if mode is None else mode
+        if mode not in self.MODES:
+            raise ValueError( f"unknown interpolation mode '{mode}', expected one of {', '.join(self.MODES)}" )
+        
+        self.mode     = mode
+        self.cache    = OrderedDict()  # (stream, position, steps) -> in-between frames
+        self.pending  = {}             # (stream, position, steps) -> Future
+        self.lock     = RLock()  # done callbacks may run in the submitting thread
+        self.executor = None
+        self._grids   = {}             # (height, width) -> pixels coordinates grids
+
+    #-------------------------------------------------------------------------
+    def clear(self) -> None:
+        '''Cancels the pending interpolations and empties the cache.
+        
+        The workers pool is shut down. It is created again on
+        the next prefetch.  The running interpolations cannot
+        be cancelled:  they are waited for,  so that no worker
+        reads any stream once this method has returned - which
+        allows the streams to be released then.
+        '''
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.pending = {}
+            self.cache.clear()
+        
+        # waited for out of the lock, which the done callbacks of the workers acquire
+        if executor is not None:
+            executor.shutdown( wait=True, cancel_futures=True )
+
+    #-------------------------------------------------------------------------
+    def get(self, stream  : ReplayStream,
+                  position: int         ,
+                  step    : int         ,
+                  steps   : int          ) -> Frame:
+        '''Returns an in-between frame, if already computed.
+        
+        Args:
+            stream: ReplayStream
+                A reference to the replayed stream.
+            position: int
+                The position of the first frame of the pair.
+            step: int
+                The index of the in-between frame,  in interval
+                [1, steps-1].
+            steps: int
+                The slowing factor.
+        
+        Returns:
+            A reference to the in-between frame, or None if it
+            is not yet available.
+        '''
+        with self.lock:
+            frames = self.cache.get( (stream, position, steps) )
+            if frames is None:
+                return None
+            self.cache.move_to_end( (stream, position, steps) )
+            return frames[ step - 1 ]
+
+    #-------------------------------------------------------------------------
+    def interpolate(self, frame0: Frame, frame1: Frame, steps: int) -> List[Frame]:
+        '''Synthesizes the in-between frames of a pair of frames.
+        
+        Args:
+            frame0, frame1: Frame
+                References to both frames of the pair. They must
+                get the same shape.
+            steps: int
+                The slowing factor.
+        
+        Returns:
+            The list of the 'steps - 1' in-between frames.
+        '''
+        alphas = [ step / steps for step in range(1, steps) ]
+        if self.mode == 'blend' or frame0.shape != frame1.shape:
+            return [ cv2.addWeighted(frame0, 1.0 - alpha, frame1, alpha, 0.0) for alpha in alphas ]
+        
+        height, width = frame0.shape[:2]
+        scale = AVTConfig.SLOWMO_FLOW_SCALE
+        gray0 = cv2.cvtColor( cv2.resize(frame0, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY )
+        gray1 = cv2.cvtColor( cv2.resize(frame1, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY )
+        flow = cv2.calcOpticalFlowFarneback( gray0, gray1, None, 0.5, 3, 15, 3, 5, 1.2, 0 )
+        flow = cv2.resize( flow, (width, height), interpolation=cv2.INTER_LINEAR ) * (1.0 / scale)
+        
+        grid_x, grid_y = self._get_grids( height, width )
+        flow_x, flow_y = flow[ ..., 0 ], flow[ ..., 1 ]
+        frames = []
+        for alpha in alphas:
+            # the pixel at p at time alpha comes from p - alpha.flow in frame0 and from p + (1-alpha).flow in frame1
+            warped0 = cv2.remap( frame0, grid_x - alpha * flow_x, grid_y - alpha * flow_y,
+                                 cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE )
+            warped1 = cv2.remap( frame1, grid_x + (1.0 - alpha) * flow_x, grid_y + (1.0 - alpha) * flow_y,
+                                 cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE )
+            frames.append( cv2.addWeighted(warped0, 1.0 - alpha, warped1, alpha, 0.0) )
+        return frames
+
+    #-------------------------------------------------------------------------
+    def prefetch(self, stream   : ReplayStream,
+                       position : int         ,
+                       steps    : int         ,
+                       direction: int = 1      ) -> None:
+        '''Schedules the interpolation of the pairs ahead of some position.
+        
+        The pairs that are already cached or pending are not
+        scheduled again.
+        
+        Args:
+            stream: ReplayStream
+                A reference to the replayed stream.
+            position: int
+                The current position in the stream.
+            steps: int
+                The slowing factor.
+            direction: int
+                +1 when playing forwards, -1 when playing back-
+                wards. Defaults to +1.
+        '''
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor( AVTConfig.SLOWMO_WORKERS, 'slowmo' )
+            
+            for offset in range( AVTConfig.SLOWMO_LOOKAHEAD_PAIRS ):
+                pair_position = position + direction * offset
+                if not 0 <= pair_position < stream.frames_count - 1:
+                    break
+                key = (stream, pair_position, steps)
+                if key in self.cache or key in self.pending:
+                    continue
+                future = self.executor.submit( self._compute, stream, pair_position, steps )
+                self.pending[ key ] = future
+                future.add_done_callback( lambda f, key=key: self._store(key, f) )
+
+    #-------------------------------------------------------------------------
+    def _compute(self, stream: ReplayStream, position: int, steps: int) -> List[Frame]:
+        '''Computes the in-between frames of one pair. Runs in a worker of the pool.
+        '''
+        frame0 = stream.read( position )
+        frame1 = stream.read( position + 1 )
+        if frame0 is None or frame1 is None:
+            return None
+        with OpenCVStage( OpenCVThreads.ANALYSIS ):
+            return self.interpolate( frame0, frame1, steps )
+
+    #-------------------------------------------------------------------------
+    def _get_grids(self, height: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        '''Returns the x and y pixels coordinates grids of some frames size, evaluated once per size.
+        '''
+        grids = self._grids.get( (height, width) )
+        if grids is None:
+            grid_y, grid_x = np.indices( (height, width), np.float32 )
+            grids = self._grids[ (height, width) ] = (grid_x, grid_y)
+        return grids
+
+    #-------------------------------------------------------------------------
+    def _store(self, key: Tuple[ReplayStream, int, int], future: Future) -> None:
+        '''Caches the result of a completed interpolation.
+        '''
+        with self.lock:
+            if self.pending.pop( key, None ) is not future or future.cancelled():
+                return  # cleared meanwhile
+            frames = future.result() if future.exception() is None else None
+            if frames is None:
+                return
+            self.cache[ key ] = frames
+            while len( self.cache ) > AVTConfig.SLOWMO_CACHE_PAIRS:
+                self.cache.popitem( last=False )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    MODES = ( 'blend', 'flow' )
+
+#=====   end of   src.Replay.frame_interpolator   =====#
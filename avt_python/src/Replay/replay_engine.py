@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class ReplayEngine
+#    class ReplayPlayer
+#
+
+
+#=============================================================================
+import numpy as np
+from threading   import Lock
+from typing      import Any, Dict, ForwardRef, Tuple
+
+from src.App.avt_config                  import AVTConfig
+from .frame_interpolator                 import FrameInterpolator
+from .replay_stream                      import ReplayStream
+from .thumbnails_cache                   import ThumbnailsCache
+from src.Recording.frame_index           import FrameIndex
+from src.Recording.session               import Session
+from src.Utils.types                     import Frame
+from src.Utils.periodical_thread         import PeriodicalThread
+from src.Utils.Scheduling.opencv_threads import OpenCVThreads
+
+
+#=============================================================================
+MainWindowRef   = ForwardRef( "MainWindow" )
+ReplayEngineRef = ForwardRef( "ReplayEngine" )
+
+
+#=============================================================================
+class ReplayEngine:
+    """The class of the replay engine of recorded sessions.
+    
+    The replay engine displays the recorded streams of a session
+    in the views of their cameras,  synchronized on their frames
+    timestamps.  While replaying,  these views do not display
+    their live frames any more.
+    
+    The replay position is a time, in seconds since the start of
+    the recording session. Every command - play at some speed,
+    pause, step, seek - is served by the streams indexes and
+    their caches of decoded frames - see class  'ReplayStream'
+    - so that stepping and scrubbing never decode a stream from
+    its start.  Playing is driven by a periodical thread -  see
+    class 'ReplayPlayer'.
+    
+    When playing slower than real time,  in-between frames are
+    synthesized ahead of the replay position by a frame inter-
+    polator - see class 'FrameInterpolator'. Recorded frames are
+    displayed instead of the in-between ones that are not yet
+    available, so that the replay never waits for them.
+    
+    When playing fast - i.e. with the fast-backward and fast-
+    forward controls -,  the low resolution proxies of the frames
+    are displayed - see method  'ReplayStream.read_
+    proxy()' - so that the replay keeps up with the display rate
+    whatever the codec.  Full frames are decoded again once the
+    replay is paused or played at a normal speed.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, window: MainWindowRef) -> None:
+        '''Constructor.
+        
+        Args:
+            window: MainWindow
+                A reference to the window whose camera views dis-
+                play the replayed streams.
+        '''
+        self.window       = window
+        self.streams      = {}  # replayed streams, indexed by their camera views
+        self.session_path = None
+        self.position_s   = 0.0
+        self.duration_s   = 0.0
+        self.speed        = 0.0  # 0.0 while paused, negative when playing backwards
+        self.player       = None
+        self.lock         = Lock()
+        self.thumbnails_cache = ThumbnailsCache()
+        
+        self.interpolator = None  # slow-motion frames are repeated if None
+        if AVTConfig.SLOWMO_MODE is not None:
+            try:
+                self.interpolator = FrameInterpolator()
+            except ValueError as e:
+                print( f"!!! {e}, slow-motion frames will be blended" )
+                self.interpolator = FrameInterpolator( 'blend' )
+
+    #-------------------------------------------------------------------------
+    def close(self) -> None:
+        '''Stops replaying, and gets the camera views back to live display.
+        '''
+        with self.lock:
+            self._close()
+
+    #-------------------------------------------------------------------------
+    def get_position(self) -> float:
+        '''Returns the current replay position, in seconds since the start of the session.
+        '''
+        return self.position_s
+
+    #-------------------------------------------------------------------------
+    def is_open(self) -> bool:
+        '''Returns True while a session is being replayed.
+        '''
+        return len( self.streams ) > 0
+
+    #-------------------------------------------------------------------------
+    def is_playing(self) -> bool:
+        '''Returns True while the replayed session is being played, forwards or backwards.
+        '''
+        return self.is_open() and self.speed != 0.0
+
+    #-------------------------------------------------------------------------
+    def open(self, session_path: str) -> bool:
+        '''Opens a recorded session for replay.
+        
+        Any formerly replayed session is closed first. The
+        session is paused at its start.
+        
+        Args:
+            session_path: str
+                The path of the directory of the recorded session.
+                Its streams are displayed in the views of the
+                cameras they have been recorded from. Only the
+                manifest and the indexes of the session are read
+                - see class 'Session'.
+        
+        Returns:
+            True if at least one stream of the session can be
+            replayed, or False otherwise.
+        '''
+        with self.lock:
+            self._close()
+            
+            try:
+                session = Session.open( session_path )
+            except (OSError, ValueError) as e:
+                print( f"!!! cannot open session '{session_path}': {e}" )
+                return False
+            
+            views = { view.camera.get_id(): view for view in self.window.camera_views }
+            for stream in session.streams:
+                if stream[ 'camera_id' ] not in views:
+                    continue
+                try:
+                    self.streams[ views[stream['camera_id']] ] = ReplayStream( session.get_video_path(stream),
+                                                                               session.load_index(stream),
+                                                                               self._load_thumbnails(session, stream),
+                                                                               self.thumbnails_cache )
+                except (OSError, ValueError) as e:
+                    print( f"!!! {e}" )
+            
+            if not self.streams:
+                print( f"!!! no replayable stream in '{session_path}'" )
+                return False
+            
+            self.session_path = session_path
+            self.duration_s = max( stream.duration_s for stream in self.streams.values() )
+            for view in self.streams:
+                view.b_replaying = True
+            self.player = ReplayPlayer( self )
+            self.player.start()
+            self._seek( 0.0 )
+            return True
+
+    #-------------------------------------------------------------------------
+    def open_last(self) -> bool:
+        '''Opens the last recorded session for replay.
+        
+        Returns:
+            True if the session has been open, or False otherwise.
+        '''
+        sessions = Session.get_sessions()
+        if not sessions:
+            print( "!!! no recorded session to be replayed" )
+            return False
+        return self.open( sessions[-1] )
+
+    #-------------------------------------------------------------------------
+    def pause(self) -> None:
+        '''Pauses the replay.
+        
+        The full frames at the current position are displayed.
+        '''
+        with self.lock:
+            self.speed = 0.0
+            if self.streams:
+                self._seek( self.position_s )
+
+    #-------------------------------------------------------------------------
+    def play(self, speed: float = 1.0) -> None:
+        '''Plays the replayed session.
+        
+        Args:
+            speed: float
+                The replay speed, as a factor of the real time.
+                Negative speeds play backwards.  Speeds less than
+                1.0 play in slow motion. Defaults to 1.0.
+        '''
+        if self.is_open():
+            if speed > 0.0 and self.position_s >= self.duration_s:
+                self.seek( 0.0 )  # replays from start once at end
+            self.speed = speed
+
+    #-------------------------------------------------------------------------
+    def seek(self, time_s: float) -> None:
+        '''Displays the replayed frames at some time.
+        
+        This is a binary search in the streams indexes  plus
+        the decoding of one keyframes interval at most, so it
+        may be called at every move of a scrubbing cursor.
+        
+        Args:
+            time_s: float
+                The time,  in seconds since the start of the ses-
+                sion. It is clipped into the session duration.
+        '''
+        with self.lock:
+            self._seek( time_s )
+
+    #-------------------------------------------------------------------------
+    def step(self, count: int) -> None:
+        '''Pauses the replay and steps some frames forwards or backwards.
+        
+        Frames are counted in the stream of the first replayed
+        camera, which the other streams are synchronized on.
+        
+        Args:
+            count: int
+                The count of frames to step,  negative to step
+                backwards.
+        '''
+        with self.lock:
+            if not self.streams:
+                return
+            self.speed = 0.0
+            stream = next( iter(self.streams.values()) )
+            position = max( 0, min(stream.find(self.position_s) + count, stream.frames_count - 1) )
+            self._seek( stream.frame_index.get_timestamp(position) )
+
+    #-------------------------------------------------------------------------
+    def tick(self, period_s: float) -> bool:
+        '''Moves the replay position forward by one period of the player, when playing.
+        
+        Called by the replay player.  Once the end of the
+        session has been reached,  the replay is closed and
+        the camera views get back to live display.  The replay
+        is paused once its start has been reached backwards.
+        
+        Args:
+            period_s: float
+                The period of the player, in seconds.
+        
+        Returns:
+            True if the player has to keep on running,  or False
+            once the replay has been closed.
+        '''
+        with self.lock:
+            if not self.streams:
+                return False
+            if self.speed == 0.0:
+                return True
+            
+            position_s = self.position_s + self.speed * period_s
+            if position_s > self.duration_s:
+                self._close( b_stop_player=False )
+                return False
+            if position_s <= 0.0:
+                position_s, self.speed = 0.0, 0.0
+            self._seek( position_s, abs(self.speed) >= AVTConfig.THUMBNAILS_MIN_SPEED )
+            return True
+
+    #-------------------------------------------------------------------------
+    def _close(self, b_stop_player: bool = True) -> None:
+        '''Closes the replayed session.  Must be called with the lock acquired.
+        '''
+        if b_stop_player and self.player is not None:
+            self.player.stop()
+        self.player = None
+        if self.interpolator is not None:
+            self.interpolator.clear()
+        self.thumbnails_cache.clear()
+        for view, stream in self.streams.items():
+            view.b_replaying = False
+            stream.release()
+        self.streams = {}
+        self.session_path = None
+        self.speed = 0.0
+
+    #-------------------------------------------------------------------------
+    def _get_slowmo_steps(self) -> int:
+        '''Returns the slowing factor of the replay, or 1 when not playing in slow motion.
+        '''
+        speed = abs( self.speed )
+        if self.interpolator is None or speed == 0.0 or speed >= 1.0:
+            return 1
+        return min( AVTConfig.SLOWMO_MAX_STEPS, round(1.0 / speed) )
+
+    #-------------------------------------------------------------------------
+    def _load_thumbnails(self, session: Session, stream: Dict[str, Any]) -> Tuple[np.ndarray, FrameIndex]:
+        '''Loads the thumbnails strip of a recorded stream, or returns None.
+        
+        Streams without valid thumbnails are replayed  with
+        their full frames only.
+        '''
+        try:
+            return session.load_thumbnails( stream )
+        except (OSError, ValueError) as e:
+            print( f"!!! cannot load the thumbnails of '{stream['video']}': {e}" )
+            return None
+
+    #-------------------------------------------------------------------------
+    def _read_frame(self, stream: ReplayStream, steps: int) -> Frame:
+        '''Returns the frame of a stream to be displayed at the current position.
+        
+        In slow motion, this is the in-between frame  that
+        is the nearest to the current position, if it is al-
+        ready available,  and the interpolations ahead  of
+        the position are scheduled.
+        '''
+        position = stream.find( self.position_s )
+        if steps > 1 and position < stream.frames_count - 1:
+            self.interpolator.prefetch( stream, position, steps, 1 if self.speed > 0.0 else -1 )
+            time0 = stream.frame_index.get_timestamp( position )
+            time1 = stream.frame_index.get_timestamp( position + 1 )
+            if time1 > time0:
+                step = int( (self.position_s - time0) / (time1 - time0) * steps )
+                if 0 < step < steps:
+                    frame = self.interpolator.get( stream, position, step, steps )
+                    if frame is not None:
+                        return frame
+        return stream.read( position )
+
+    #-------------------------------------------------------------------------
+    def _seek(self, time_s: float, b_proxy: bool = False) -> None:
+        '''Displays the replayed frames at some time. Must be called with the lock acquired.
+        
+        Args:
+            time_s: float
+                The time,  in seconds since the start of the ses-
+                sion. It is clipped into the session duration.
+            b_proxy: bool
+                Set this to True to display the proxies of the
+                frames rather than the full frames. Defaults to
+                False.
+        '''
+        self.position_s = max( 0.0, min(time_s, self.duration_s) )
+        steps = self._get_slowmo_steps()
+        for view, stream in self.streams.items():
+            frame = stream.read_proxy( self.position_s ) if b_proxy else self._read_frame( stream, steps )
+            if frame is not None:
+                view.draw_frame( frame )
+
+
+#=============================================================================
+class ReplayPlayer( PeriodicalThread ):
+    """The class of the periodical threads that play replayed sessions.
+    
+    One player thread is started for each replayed session. It
+    moves the replay position forward  at  the  pace  of  the
+    replay speed, within the display stage of the OpenCV threads
+    budget.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, engine: ReplayEngineRef) -> None:
+        '''Constructor.
+        
+        Args:
+            engine: ReplayEngine
+                A reference to the replay engine that is driven
+                by this player.
+        '''
+        self.engine = engine
+        super().__init__( AVTConfig.REPLAY_PERIOD_S, 'replay-thrd' )
+
+    #-------------------------------------------------------------------------
+    def finalize_run_loop(self) -> None:
+        '''Leaves the display stage of the OpenCV threads budget.
+        '''
+        OpenCVThreads.leave_stage( OpenCVThreads.DISPLAY )
+
+    #-------------------------------------------------------------------------
+    def initialize_run_loop(self) -> None:
+        '''Enters the display stage of the OpenCV threads budget.
+        '''
+        OpenCVThreads.enter_stage( OpenCVThreads.DISPLAY )
+
+    #-------------------------------------------------------------------------
+    def process(self) -> bool:
+        '''The processing core of this periodical thread.
+        
+        Returns:
+            True if processing is to be kept on,  or False  if
+            this thread must be definitively stopped.
+        '''
+        return self.engine.tick( self.period_s )
+
+#=====   end of   src.Replay.replay_engine   =====#
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from collections import OrderedDict
+import cv2
+import numpy as np
+import os
+from threading   import Lock
+from typing      import Tuple
+
+from src.App.avt_config              import AVTConfig
+from src.Recording.frame_index       import FrameIndex
+from .thumbnails_cache               import ThumbnailsCache
+from src.Utils.types                 import Frame
+
+
+#=============================================================================
+class ReplayStream:
+    """The class of seekable recorded video streams.
+    
+    A replay stream reads the frames of a recorded video file
+    by  their  position or by their timestamp,  through the
+    frames index of the file - see class 'FrameIndex'.
+    
+    Decoded frames are kept in a small LRU cache.  Reading the
+    next frame decodes one frame only.  Any other position is
+    reached by seeking to its keyframe and decoding forward from
+    there,  every decoded frame being cached:  stepping  back-
+    wards is then served by the cache,  and a seek costs at most
+    one keyframes interval of decoding,  whatever the position
+    in the stream.
+    
+    When the stream has been recorded with its thumbnails strip,
+    its low resolution proxy frames are read without any decod-
+    ing - see method 'read_proxy()'.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, file_path       : str                                  ,
+                       frame_index     : FrameIndex                           ,
+                       thumbnails      : Tuple[np.ndarray, FrameIndex] = None ,
+                       thumbnails_cache: ThumbnailsCache               = None  ) -> None:
+        '''Constructor.
+        
+        The video file is open on the first read of a frame,
+        so that opening a stream costs the loading of its in-
+        dex only.
+        
+        Args:
+            file_path: str
+                The path of the recorded video file.
+            frame_index: FrameIndex
+                A reference to the frames index of the  video
+                file - see method 'Session.load_index()'.
+        
+        Raises:
+            OSError: the video file does not exist.
+        '''
+        if not os.path.isfile( file_path ):
+            raise OSError( f"cannot find video file '{file_path}'" )
+        
+        self.file_path = file_path
+        self.frame_index = frame_index
+        self.frames_count = len( frame_index )
+        self.capture = None
+        self.thumbnails = thumbnails
+        self.thumbnails_cache = thumbnails_cache
+        self.next_position = 0  # the position of the next frame to be decoded
+        self.cache = OrderedDict()
+        self.lock = Lock()
+        self.b_released = False
+
+    #-------------------------------------------------------------------------
+    @property
+    def duration_s(self) -> float:
+        return self.frame_index.get_timestamp( self.frames_count - 1 ) if self.frames_count > 0 else 0.0
+
+    #-------------------------------------------------------------------------
+    def find(self, time_s: float) -> int:
+        '''Returns the position of the frame that is displayed at some time.
+        
+        See method 'FrameIndex.find()'.
+        '''
+        return min( self.frame_index.find(time_s), self.frames_count - 1 )
+
+    #-------------------------------------------------------------------------
+    def read(self, position: int) -> Frame:
+        '''Returns the frame at some position in this stream.
+        
+        Args:
+            position: int
+                The position of the frame.  It is clipped into
+                the positions of this stream.
+        
+        Returns:
+            A reference to the decoded frame,  or None if it
+            cannot be decoded or if this stream has been re-
+            leased.  The frame belongs to the cache of this
+            stream and must not be modified.
+        '''
+        with self.lock:
+            if self.b_released:
+                return None
+            
+            position = max( 0, min(position, self.frames_count - 1) )
+            
+            frame = self.cache.get( position )
+            if frame is not None:
+                self.cache.move_to_end( position )
+                return frame
+            
+            if self.capture is None:
+                self.capture = cv2.VideoCapture( self.file_path )
+                if not self.capture.isOpened():
+                    print( f"!!! cannot open video file '{self.file_path}'" )
+                    self.frames_count = 0
+                    return None
+            
+            if not self.next_position <= position < self.next_position + self.frame_index.keyframes_interval:
+                keyframe = self.frame_index.get_keyframe( position )
+                if not keyframe <= self.next_position <= position:
+                    self.capture.set( cv2.CAP_PROP_POS_FRAMES, keyframe )
+                    self.next_position = keyframe
+            
+            while self.next_position <= position:
+                ok, frame = self.capture.read()
+                if not ok:
+                    self.next_position = self.frames_count  # forces a seek on next read
+                    return None
+                self._cache( self.next_position, frame )
+                self.next_position += 1
+            return frame
+
+    #-------------------------------------------------------------------------
+    def read_at(self, time_s: float) -> Frame:
+        '''Returns the frame that is displayed at some time.
+        
+        Args:
+            time_s: float
+                The time, in seconds since the start of the re-
+                cording session.
+        '''
+        return self.read( self.find(time_s) )
+
+    #-------------------------------------------------------------------------
+    def read_proxy(self, time_s: float) -> Frame:
+        '''Returns the low resolution proxy of the frame that is displayed at some time.
+        
+        This is the thumbnail that precedes the time,  read out
+        of the thumbnails strip or of the thumbnails cache. The
+        full frame is returned instead for streams without any
+        thumbnails.
+        
+        Args:
+            time_s: float
+                The time, in seconds since the start of the re-
+                cording session.
+        
+        Returns:
+            A reference to the frame,  or None if it cannot be
+            read.  It must not be modified.
+        '''
+        if self.thumbnails is None:
+            return self.read_at( time_s )
+        
+        strip, thumbnails_index = self.thumbnails
+        position = thumbnails_index.find( time_s )
+        if self.thumbnails_cache is None:
+            return strip[ position ]
+        
+        key = (self.file_path, position)
+        thumbnail = self.thumbnails_cache.get( key )
+        if thumbnail is None:
+            thumbnail = np.array( strip[position] )  # copied out of the memory map
+            self.thumbnails_cache.put( key, thumbnail )
+        return thumbnail
+
+    #-------------------------------------------------------------------------
+    def release(self) -> None:
+        '''Releases the video file, the thumbnails strip and the cached frames.
+        
+        The memory map of the thumbnails strip is closed once the
+        thumbnails that are still displayed are released too. The
+        video file is not open again:  this stream reads no frame
+        once released.
+        '''
+        with self.lock:
+            self.b_released = True
+            if self.capture is not None:
+                self.capture.release()
+                self.capture = None
+            self.thumbnails = None
+            self.cache.clear()
+
+    #-------------------------------------------------------------------------
+    def _cache(self, position: int, frame: Frame) -> None:
+        '''Caches a decoded frame, evicting the least recently used one if full.
+        '''
+        self.cache[ position ] = frame
+        if len( self.cache ) > AVTConfig.REPLAY_CACHE_FRAMES:
+            self.cache.popitem( last=False )
+
+#=====   end of   src.Replay.replay_stream   =====#
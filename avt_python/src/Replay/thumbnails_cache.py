@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from collections import OrderedDict
+from threading   import Lock
+from typing      import Hashable
+
+from src.App.avt_config          import AVTConfig
+from src.Utils.types             import Frame
+
+
+#=============================================================================
+class ThumbnailsCache:
+    """The class of the in-memory caches of replayed thumbnails.
+    
+    Thumbnails are copied out of their memory-mapped strips -
+    see method 'Session.load_thumbnails()' - on their first read
+    and are then kept in memory,  least recently used first out,
+    within a budget of bytes for all the replayed streams to-
+    gether.  Playing fast back and forth over a session is then
+    served from memory, without any disk access.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, budget_bytes: int = None) -> None:
+        '''Constructor.
+        
+        Args:
+            budget_bytes: int
+                The max size of the cached thumbnails, in bytes.
+                If None,  'AVTConfig.THUMBNAILS_CACHE_MB' is used.
+                Defaults to None.
+        '''
+        self.budget_bytes = AVTConfig.THUMBNAILS_CACHE_MB * 1024 * 1024 if budget_bytes is None else budget_bytes
+        self.nbytes = 0
+        self.cache = OrderedDict()
+        self.lock = Lock()
+
+    #-------------------------------------------------------------------------
+    def clear(self) -> None:
+        '''Empties this cache.
+        '''
+        with self.lock:
+            self.cache.clear()
+            self.nbytes = 0
+
+    #-------------------------------------------------------------------------
+    def get(self, key: Hashable) -> Frame:
+        '''Returns a cached thumbnail, or None if it is not cached.
+        '''
+        with self.lock:
+            thumbnail = self.cache.get( key )
+            if thumbnail is not None:
+                self.cache.move_to_end( key )
+            return thumbnail
+
+    #-------------------------------------------------------------------------
+    def put(self, key: Hashable, thumbnail: Frame) -> None:
+        '''Caches a thumbnail, evicting the least recently used ones while over budget.
+        
+        Thumbnails that are larger than the whole budget are
+        not cached.
+        '''
+        if thumbnail.nbytes > self.budget_bytes:
+            return
+        with self.lock:
+            former = self.cache.pop( key, None )
+            if former is not None:
+                self.nbytes -= former.nbytes
+            self.cache[ key ] = thumbnail
+            self.nbytes += thumbnail.nbytes
+            while self.nbytes > self.budget_bytes:
+                self.nbytes -= self.cache.popitem( last=False )[ 1 ].nbytes
+
+#=====   end of   src.Replay.thumbnails_cache   =====#
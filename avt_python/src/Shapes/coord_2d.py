@@ -35,7 +35,14 @@ Coord2DRef = ForwardRef( "Coord2D" )
 #=============================================================================
 class Coord2D:
     """The class of 2D integer coordinates.
+    
+    Notice: coordinates are hot value types.  They are  slotted
+            and they provide in-place operators plus tuple-re-
+            turning methods,  which should be preferred to the
+            allocating operators in per-frame code.
     """
+    __slots__ = ( 'x', 'y' )
+    
     #-------------------------------------------------------------------------
     def __init__(self, x: int = 0, y: int = 0, *, copy: Coord2DRef = None) -> None:
         '''Constructor.
@@ -60,10 +67,28 @@ class Coord2D:
         return Coord2D( self.x, self.y )
 
     #-------------------------------------------------------------------------
-    def to_tuple(self) -> Tuple[int, int]:
+    def set(self, x: int, y: int) -> Coord2DRef:
+        '''Sets in place both coordinates.
+        
+        Returns:
+            A reference to this 2D coordinates.
+        '''
+        self.x = self._clipped( x )
+        self.y = self._clipped( y )
+        return self
+
+    #-------------------------------------------------------------------------
+    def to_tuple(self, dx: int = 0, dy: int = 0) -> Tuple[int, int]:
         '''Returns a tuple containing the two coordinates, x first.
+        
+        This is also the allocation-free equivalent of
+        '(self + Offset(dx, dy)).to_tuple()'.
+        
+        Args:
+            dx, dy: int
+                Offsets added to resp. x and y. Default to 0.
         '''
-        return (self.x, self.y)
+        return (self.x + dx, self.y + dy)
 
     #-------------------------------------------------------------------------
     def _clip(self) -> None:
@@ -175,7 +200,7 @@ class Coord2D:
             val = round( val )
             self.x -= val
             self.y -= val
-        self.clip()
+        self._clip()
         return self
 
     #-------------------------------------------------------------------------
@@ -38,6 +38,8 @@ class Offset( Coord2D ):
     
     Notice: offset coordinates are '.dx' and '.dy'.
     """
+    __slots__ = ()
+    
     #-------------------------------------------------------------------------
     def __init__(self, dx: int = 0, dy: int = 0, *, copy: OffsetRef = None) -> None:
         '''Constructor.
@@ -38,6 +38,8 @@ class Point( Coord2D ):
     
     Notice: 2D points are just 2D coordinates.
     """
+    __slots__ = ()
+    
     #-------------------------------------------------------------------------
     def __init__(self, x: int = 0,
                        y: int = 0,
@@ -38,6 +38,8 @@ RectRef = ForwardRef( "Rect" )
 class Rect:
     """The class of Rectangles.
     """
+    __slots__ = ( 'x', 'y', 'width', 'height' )
+    
     #-------------------------------------------------------------------------
     def __init__(self, x     : int = 0,
                        y     : int = 0,
@@ -163,6 +165,14 @@ class Rect:
     def surface(self) -> int:
         return self.width * self.height
         
+    #-------------------------------------------------------------------------
+    def contains(self, x: int, y: int) -> bool:
+        '''Returns True if the point (x, y) is inside this rectangle.
+        
+        This is the allocation-free equivalent of operator 'in'.
+        '''
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
     #-------------------------------------------------------------------------
     def copy(self, other: RectRef = None) -> Optional[ RectRef ]:
         '''Copy of rectangles.
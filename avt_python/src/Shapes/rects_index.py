@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from bisect import bisect_right
+from typing import Any, Iterable, List, Tuple
+
+from .rect import Rect
+
+
+#=============================================================================
+class RectsIndex:
+    """The class of hit-testing indexes over rectangles.
+    
+    This is a sorted interval index:  the vertical axis is cut
+    into  bands  at the top and bottom borders of all indexed
+    rectangles, and each band gets the list of the rectangles
+    that cover it.  Finding the rectangles that contain a point
+    is then a binary search of the band, plus a test of the X
+    coordinate on the very few rectangles of this band.
+    
+    Indexes are immutable:  they are built once per layout and
+    must be built again when the layout changes.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, items: Iterable[ Tuple[Rect, Any] ]) -> None:
+        '''Constructor.
+        
+        Args:
+            items: Iterable[ Tuple[Rect, Any] ]
+                The indexed pairs (rectangle, associated item).
+                Should rectangles overlap,  the last one in this
+                iterable is the topmost one.
+        '''
+        items = [ (rect, item) for rect, item in items if rect.width > 0 and rect.height > 0 ]
+        
+        self.bounds = sorted( {rect.y for rect, _ in items} | {rect.y + rect.height for rect, _ in items} )
+        self.bands: List[ List[Tuple[Rect, Any]] ] = []
+        for top_y in self.bounds:
+            # topmost rectangles first
+            self.bands.append( [ (rect, item) for rect, item in reversed(items)
+                                                if rect.y <= top_y < rect.y + rect.height ] )
+
+    #-------------------------------------------------------------------------
+    def find(self, x: int, y: int) -> Any:
+        '''Returns the item of the topmost rectangle that contains (x, y).
+        
+        Returns:
+            The associated item, or None if no indexed rectangle
+            contains the point.
+        '''
+        band_index = bisect_right( self.bounds, y ) - 1
+        if band_index < 0:
+            return None
+        
+        for rect, item in self.bands[ band_index ]:
+            if rect.x <= x < rect.x + rect.width:
+                return item
+        return None
+
+    #-------------------------------------------------------------------------
+    def find_all(self, x: int, y: int) -> List[Any]:
+        '''Returns the items of all the rectangles that contain (x, y), topmost first.
+        '''
+        band_index = bisect_right( self.bounds, y ) - 1
+        if band_index < 0:
+            return []
+        return [ item for rect, item in self.bands[ band_index ] if rect.x <= x < rect.x + rect.width ]
+
+    #-------------------------------------------------------------------------
+    def __len__(self) -> int:
+        '''Returns the number of bands of this index.
+        '''
+        return len( self.bands )
+
+#=====   end of   src.Shapes.rects_index   =====#
@@ -38,6 +38,8 @@ class Size( Coord2D ):
     
     Notice: sizes cannot be negative.
     """
+    __slots__ = ()
+    
     #-------------------------------------------------------------------------
     def __init__(self, width: int = 0, height: int = 0, *, copy: SizeRef = None) -> None:
         '''Constructor.
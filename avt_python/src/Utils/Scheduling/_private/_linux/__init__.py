@@ -23,13 +23,48 @@ SOFTWARE.
 """
 
 #=============================================================================
+import ctypes
+import ctypes.util
+import os
+import threading
+from typing import Iterable
+
+try:
+    libc = ctypes.CDLL( ctypes.util.find_library('c') or 'libc.so.6', use_errno=True )
+except OSError:
+    libc = None
+
 from .._scheduler_base import _SchedulerBase
 
 
 #=============================================================================
 class Scheduler( _SchedulerBase):
     """The class of the Linux scheduler.
+    
+    Linux schedules threads as tasks of their own.  Priority,
+    scheduling policy, CPU affinity and timer slack are  then
+    all set per thread, by means of the thread native id.
+    
+    The  Linux  kernel gets no global timer period  as Windows
+    does.  The time slices duration is mapped on  the  timer
+    slack  of  the currently active thread,  which is the max
+    delay that the kernel may add to any of its  wake-ups  so
+    that timers expirations can be grouped.
     """
+    #-------------------------------------------------------------------------
+    def __init__(self, slice_duration_ms: int) -> None:
+        '''Constructor.
+        
+        Args:
+            slice_duration_ms: int
+                The new duration of time slices to be  set  for
+                the currently active thread, expressed as inte-
+                ger milliseconds. See method '_set_slice_dura-
+                tion()' for its mapping on Linux timer slack.
+        '''
+        self._prev_timer_slack = None
+        self._prev_sched_state = None
+        super().__init__( slice_duration_ms )
 
     #-------------------------------------------------------------------------
     def restore_slice_duration(self) -> None:
@@ -41,22 +76,46 @@ class Scheduler( _SchedulerBase):
         way  to  ensure  proper  use  of both methods is to use
         schedulers with Python statement 'with'.
         
-        In this base class, this method does nothing.  Inherit-
-        ing classes SHOULD overwrite this method.  They can get
-        access to protected  attribute  '._slice_duration'  set
-        on call to method 'set_slice_duration()'.
+        Restores the timer slack of the  currently  active
+        thread as it was before the first call to 'set_slice_
+        duration()'.
+        '''
+        if self._prev_timer_slack is not None:
+            self.set_timer_slack( self._prev_timer_slack )
+            self._prev_timer_slack = None
+
+    #-------------------------------------------------------------------------
+    def set_thread_affinity(self, cpus: Iterable[int]) -> bool:
+        '''Pins the currently active thread on the specified CPUs.
+        
+        Args:
+            cpus: Iterable[int]
+                The indexes of the CPUs (cores) on which  the
+                currently  active thread is allowed to run. An
+                empty iterable restores the  whole  set  of
+                CPUs available to the process.
+        
+        Returns:
+            True if the affinity of the  currently  active
+            thread has been modified, or False otherwise.
         '''
-        ...
-        super().restore_slice_duration()
+        cpus = set( cpus ) or set( self.get_available_cpus() )
+        try:
+            os.sched_setaffinity( threading.get_native_id(), cpus )
+            return True
+        except (OSError, ValueError):
+            print( f"!!! Linux system error - thread affinity is not modified to CPUs {sorted(cpus)}." )
+            return False
 
     #-------------------------------------------------------------------------
     def set_thread_background(self, bg: bool = True) -> None:
         '''Sets the background status of the currently active thread.
         
-        Should be overwritten in inheriting classes, accord-
-        ing to the underlying OS platform.
-        
-        In this base class, does nothing.
+        Background threads are scheduled with  Linux  policy
+        SCHED_IDLE, i.e. they only run when no other thread 
+        of the system is ready to run.  Should this  policy
+        not be available,  the  nice  value of the thread is
+        set to its lowest priority (19) instead.
         
         Args:
             bg: bool
@@ -66,15 +125,38 @@ class Scheduler( _SchedulerBase):
                 initial  running  status.  Defaults  to True
                 (i.e. put thread in background).
         '''
-        ...
-        super().set_thread_background( bg )
+        tid = threading.get_native_id()
+        
+        if bg:
+            self._save_sched_state()
+            try:
+                os.sched_setscheduler( tid, os.SCHED_IDLE, os.sched_param(0) )
+            except (AttributeError, OSError):
+                self._set_nice( self._NICE_MAP[self.PRI_IDLE] )
+        
+        elif self._prev_sched_state is not None:
+            policy, nice = self._prev_sched_state
+            self._prev_sched_state = None
+            try:
+                os.sched_setscheduler( tid, policy, os.sched_param(0) )
+            except OSError:
+                print( "!!! Linux system error - thread background status is not modified." )
+            self._set_nice( nice )
         
     #-------------------------------------------------------------------------
     def set_thread_priority(self, priority_offset: int) -> None:
         '''Modifies the priority level of the currently active thread.
         
-        Must be overwritten in inheriting class, according to the
-        underlying OS platform.
+        Priorities offsets are mapped on Linux nice values.
+        PRI_IDLE puts the currently active thread in back-
+        ground (see 'set_thread_background()')  while  PRI_
+        MAX  tries  first to get real-time policy SCHED_RR,
+        which is granted only to privileged processes  (i.e.
+        with capability CAP_SYS_NICE or some RLIMIT_RTPRIO).
+        Negative  nice  values  are  also  restricted  to
+        privileged processes:  a warning is printed and the
+        priority  is  left  unchanged  when  the  request is
+        denied.
         
         Args:
             priority_offset: int
@@ -82,20 +164,85 @@ class Scheduler( _SchedulerBase):
                 of the currently active  thread.  See  predefined
                 values at the end of this base class definition.
         '''
-        ...
-        super().set_thread_priority( priority_offset )
+        if priority_offset not in self._NICE_MAP:
+            print( f"warning - priority offset {priority_offset} may not be a valid value for Linux" )
+            priority_offset = max( self.PRI_MINUS_2, min(self.PRI_PLUS_2, priority_offset) )
+        
+        if priority_offset == self.PRI_IDLE:
+            self.set_thread_background( True )
+            return
+        
+        if priority_offset == self.PRI_MAX and self.set_thread_realtime():
+            return
+
+        # back to the default policy, should real-time or background policy have been set
+        self.set_thread_background( False )
+        self._set_nice( self._NICE_MAP[priority_offset] )
+    
+    #-------------------------------------------------------------------------
+    def set_thread_realtime(self, fifo       : bool = False,
+                                  rt_priority: int  = None ) -> bool:
+        '''Sets a real-time scheduling policy for the currently active thread.
+        
+        Real-time threads always preempt the threads that are
+        scheduled with the default Linux policy.  They should
+        then be kept for short and periodical processings, as
+        are frames acquisitions.
+        
+        Args:
+            fifo: bool
+                Set this to True to get policy SCHED_FIFO,  or
+                set it to False to get policy SCHED_RR (round-
+                robin between  same  priority  real-time  thre-
+                ads). Defaults to False.
+            rt_priority: int
+                The real-time priority of the currently active
+                thread,  clipped  within  the  platform min and
+                max values. Defaults to None, in which case the
+                class attribute 'RT_PRIORITY' is used instead.
+        
+        Returns:
+            True if the real-time policy has been granted, or
+            False otherwise (for instance if this process  is
+            not privileged enough).
+        '''
+        try:
+            policy = os.SCHED_FIFO if fifo else os.SCHED_RR
+            prio = self.RT_PRIORITY if rt_priority is None else rt_priority
+            prio = max( os.sched_get_priority_min(policy),
+                        min(os.sched_get_priority_max(policy), prio) )
+            self._save_sched_state()
+            os.sched_setscheduler( threading.get_native_id(), policy, os.sched_param(prio) )
+            return True
+        except (AttributeError, OSError):
+            return False
+    
+    #-------------------------------------------------------------------------
+    def set_timer_slack(self, slack_ns: int) -> bool:
+        '''Sets the timer slack of the currently active thread.
+        
+        Args:
+            slack_ns: int
+                The new timer slack,  expressed in nanoseconds.
+                The  value  0  resets  the timer slack of the
+                currently active thread to its default value.
+        
+        Returns:
+            True if the timer slack has been modified,  or
+            False otherwise.
+        '''
+        if libc is None:
+            return False
+        return libc.prctl( self._PR_SET_TIMERSLACK, ctypes.c_ulong(slack_ns), 0, 0, 0 ) == 0
     
     #-------------------------------------------------------------------------
     def _platform_clipped(self, slice_duration_ms ) -> int:
         '''Returns a clipped value for the passed argument.
         
-        This method  should  be  overwritten  in  inheriting
-        classes, as long as the minb and max values for time
-        slices  can  be  asked  for  to  the  underlying  OS 
-        platform.
-        
-        In this base class, returns the passed value without
-        any clipping but a minimal time slice of 1 ms.
+        Linux gets no min and max values for time slices to
+        be queried.  The passed  value  is  clipped  within
+        [1, MAX_SLICE_MS] so that the mapped timer slack is
+        never greater than the Linux default one (50 us).
         
         Returns:
             A time slice duration, expressed in milliseconds,
@@ -103,8 +250,36 @@ class Scheduler( _SchedulerBase):
             for time slices according to  the  underlying  OS
             platform.
         '''
-        ...
-        super()._platform_clipped( slice_duration_ms )
+        return 1 if slice_duration_ms <= 1 else min( slice_duration_ms, self.MAX_SLICE_MS )
+    
+    #-------------------------------------------------------------------------
+    def _save_sched_state(self) -> None:
+        '''Remembers the scheduling policy and the nice value of the currently active thread.
+        
+        Only the very first state is remembered,  so that it
+        can be restored after successive modifications.
+        '''
+        if self._prev_sched_state is None:
+            tid = threading.get_native_id()
+            try:
+                self._prev_sched_state = ( os.sched_getscheduler(tid),
+                                           os.getpriority(os.PRIO_PROCESS, tid) )
+            except OSError:
+                self._prev_sched_state = ( os.SCHED_OTHER, 0 )
+    
+    #-------------------------------------------------------------------------
+    def _set_nice(self, nice: int) -> None:
+        '''Sets the nice value of the currently active thread.
+        
+        Args:
+            nice: int
+                The new nice value,  in interval [-20, 19].
+                The lower, the higher the thread priority.
+        '''
+        try:
+            os.setpriority( os.PRIO_PROCESS, threading.get_native_id(), nice )
+        except OSError:
+            print( f"!!! Linux system error - thread priority is not modified to nice value {nice}." )
     
     #-------------------------------------------------------------------------
     def _set_slice_duration(self, slice_duration_ms: int) -> None:
@@ -114,20 +289,41 @@ class Scheduler( _SchedulerBase):
         relates  to the underlying OS platform.  It embeds all
         the code that is dedicated to the OS platform.
         
-        It must be implemented in inheriting classes.
+        The time slice duration is mapped on the timer  slack
+        of  the  currently active thread:  each  millisecond
+        of time slice maps to 'TIMER_SLACK_NS_PER_MS' nanose-
+        conds of timer slack, so that short time slices lead
+        to very accurate wake-ups of sleeping threads.
         
         Args:
             slice_duration_ms: int
                 The new duration of time slices to be  set  for
-                the OS platform scheduler, expressed as integer 
-                milliseconds.  When they are accessible the  OS 
-                platform  min  and  max values are used to clip 
-                the passed duration  value.  If  they  are  not 
-                accessible with the underlying OS platform,  it 
-                is the responsibility of the caller  to  ensure 
-                proper value for the passed argument.
+                the currently active thread, expressed as inte-
+                ger milliseconds,  clipped  within  [1, MAX_SLI-
+                CE_MS].
         '''
-        ...
-        super()._set_slice_duration( slice_duration_ms )
+        if libc is None:
+            return
+        if self._prev_timer_slack is None:
+            self._prev_timer_slack = libc.prctl( self._PR_GET_TIMERSLACK, 0, 0, 0, 0 )
+        if not self.set_timer_slack( slice_duration_ms * self.TIMER_SLACK_NS_PER_MS ):
+            print( "!!! Linux system error - timer slack is not modified." )
+    
+    #-------------------------------------------------------------------------
+    # Class data
+    MAX_SLICE_MS          = 50
+    RT_PRIORITY           = 5
+    TIMER_SLACK_NS_PER_MS = 1_000
+
+    _NICE_MAP = { _SchedulerBase.PRI_IDLE   :  19,
+                  _SchedulerBase.PRI_MINUS_2:  10,
+                  _SchedulerBase.PRI_MINUS_1:   5,
+                  _SchedulerBase.PRI_NORMAL :   0,
+                  _SchedulerBase.PRI_PLUS_1 :  -5,
+                  _SchedulerBase.PRI_PLUS_2 : -10,
+                  _SchedulerBase.PRI_MAX    : -20 }
+
+    _PR_SET_TIMERSLACK = 29
+    _PR_GET_TIMERSLACK = 30
     
-#=====   end of   src.Utils.Scheduling._private._linux.__init__   =====#
\ No newline at end of file
+#=====   end of   src.Utils.Scheduling._private._linux.__init__   =====#
@@ -23,7 +23,8 @@ SOFTWARE.
 """
 
 #=============================================================================
-from typing  import Tuple, Type
+import os
+from typing  import Iterable, List, Tuple, Type
 from types   import TracebackType
 
 from ...context_manager import ContextManager
@@ -104,6 +105,28 @@ class _SchedulerBase( ContextManager ):
         self._slice_duration = self._platform_clipped( slice_duration_ms )
         self._set_slice_duration( self._slice_duration )
 
+    #-------------------------------------------------------------------------
+    def set_thread_affinity(self, cpus: Iterable[int]) -> bool:
+        '''Pins the currently active thread on the specified CPUs.
+
+        Should be overwritten in inheriting classes, accord-
+        ing to the underlying OS platform.
+
+        In this base class, does nothing.
+
+        Args:
+            cpus: Iterable[int]
+                The indexes of the CPUs (cores) on which  the
+                currently  active thread is allowed to run. An
+                empty iterable restores the  whole  set  of
+                CPUs available to the process.
+
+        Returns:
+            True if the affinity of the  currently  active
+            thread has been modified, or False otherwise.
+        '''
+        return False
+
     #-------------------------------------------------------------------------
     def set_thread_background(self, bg: bool = True) -> None:
         '''Sets the background status of the currently active thread.
@@ -140,6 +163,16 @@ class _SchedulerBase( ContextManager ):
         '''
         ...
 
+    #-------------------------------------------------------------------------
+    @staticmethod
+    def get_available_cpus() -> List[int]:
+        '''Returns the sorted list of the CPUs indexes available to this process.
+        '''
+        try:
+            return sorted( os.sched_getaffinity(0) )
+        except AttributeError:
+            return list( range(os.cpu_count() or 1) )
+
     #-------------------------------------------------------------------------
     def cmp_enter(self) -> None:
         '''Defines the actions to be taken when entering the 'with' statement.
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class OpenCVThreads
+#    class OpenCVStage
+#
+
+#=============================================================================
+import cv2
+from threading   import Lock
+from types       import TracebackType
+from typing      import Dict
+
+from src.App.avt_config          import AVTConfig
+from src.Utils.context_manager   import BaseExceptionType, ContextManager
+from src.Utils.Scheduling        import Scheduler
+
+
+#=============================================================================
+class OpenCVThreads:
+    """The threads budget of the OpenCV internal threads pool.
+    
+    This is a namespace for class methods only.  OpenCV  fans
+    out  functions  such  as 'resize()', 'warpAffine()' or the
+    video encoders over an internal pool of threads,  which by
+    default spans every CPU.  With one acquisition and  one
+    display thread per camera,  this pool then competes with
+    the application threads for the CPUs.
+    
+    Each pipeline stage gets a threads budget: acquisition,
+    display, analysis and encoding.  Budgets are configured in
+    'AVTConfig.OPENCV_THREADS', a None value meaning that the
+    budget is evaluated automatically as the count of CPUs
+    shared by the concurrently running threads of the stage
+    (i.e. one per camera for the acquisition,  display  and
+    encoding stages, one for the analysis stage).
+    
+    Notice: OpenCV gets one single threads count for the whole
+    process,  so budgets are not enforced per stage.  While
+    stages are active,  the effective count is the smallest of
+    the budgets of the active stages,  and it applies to every
+    thread of the process:  the most constrained stage wins.
+    As the acquisition stage is active as long as cameras run,
+    the budget of a stage only takes effect when it is lower
+    than the acquisition one,  and it then also lowers the
+    threads count of the acquisition and display stages while
+    the stage is active,  e.g. a budget of 1 for the encoding
+    stage gets the whole process single-threaded in OpenCV
+    while recording.  Budgets should then be set from the
+    results of benchmark 'src.Benchmarks.opencv_threads' on the
+    target PC - see 'AVTConfig.OPENCV_THREADS'.  When no stage is
+    active,  the global budget 'AVTConfig.OPENCV_THREADS_GLOBAL'
+    is set,  or the budget of the acquisition stage if it is
+    None.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def configure(cls, cameras_count: int) -> Dict[str, int]:
+        '''Evaluates the threads budgets for a count of cameras and applies them.
+        
+        Args:
+            cameras_count: int
+                The count of cameras that are used concurrently.
+        
+        Returns:
+            The threads budgets of the stages, plus the global
+            one, keyed by stage names.
+        '''
+        budgets = cls.evaluate_budgets( cameras_count )
+        with cls._lock:
+            cls._budgets = budgets
+            cls._apply()
+        return dict( budgets )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def enter_stage(cls, stage: str) -> None:
+        '''Declares that the currently active thread runs some stage.
+        
+        Must be paired with a call to 'leave_stage()' - see also
+        class OpenCVStage for a use in 'with' statements.
+        
+        Args:
+            stage: str
+                The name of the stage, as defined in this class.
+        '''
+        with cls._lock:
+            cls._active[ stage ] = cls._active.get( stage, 0 ) + 1
+            cls._apply()
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def evaluate_budgets(cls, cameras_count: int, cpus_count: int = None) -> Dict[str, int]:
+        '''Evaluates the threads budgets of the stages for a count of cameras.
+        
+        Args:
+            cameras_count: int
+                The count of cameras that are used concurrently.
+            cpus_count: int
+                The count of available CPUs. If None, the CPUs
+                available to this process are counted. Defaults
+                to None.
+        
+        Returns:
+            The threads budgets of the stages, plus the global
+            one, keyed by stage names.
+        '''
+        if cpus_count is None:
+            cpus_count = len( Scheduler.get_available_cpus() )
+        cameras_count = max( 1, cameras_count )
+        
+        budgets = {}
+        for stage in cls.STAGES:
+            budget = AVTConfig.OPENCV_THREADS.get( stage )
+            if budget is None:
+                concurrency = 1 if stage == cls.ANALYSIS else cameras_count
+                budget = cpus_count // concurrency
+            budgets[ stage ] = max( 1, budget )
+        
+        budget = AVTConfig.OPENCV_THREADS_GLOBAL
+        budgets[ cls.GLOBAL ] = budgets[ cls.ACQUISITION ] if budget is None else max( 1, budget )
+        return budgets
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_threads_count(cls) -> int:
+        '''Returns the threads count that is currently set for OpenCV.
+        '''
+        return cv2.getNumThreads()
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def leave_stage(cls, stage: str) -> None:
+        '''Declares that the currently active thread does not run some stage anymore.
+        
+        Args:
+            stage: str
+                The name of the stage, as passed to 'enter_stage()'.
+        '''
+        with cls._lock:
+            count = cls._active.get( stage, 0 ) - 1
+            if count > 0:
+                cls._active[ stage ] = count
+            else:
+                cls._active.pop( stage, None )
+            cls._apply()
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def _apply(cls) -> None:
+        '''Sets the OpenCV threads count according to the active stages.
+        
+        Must be called with the lock of this class acquired.
+        OpenCV is called only when the count changes.
+        '''
+        if cls._budgets is None:
+            return
+        
+        if cls._active:
+            count = min( cls._budgets[stage] for stage in cls._active )
+        else:
+            count = cls._budgets[ cls.GLOBAL ]
+        
+        if count != cls._count:
+            cv2.setNumThreads( count )
+            cls._count = count
+
+    #-------------------------------------------------------------------------
+    # Class data
+    ACQUISITION = 'acquisition'
+    ANALYSIS    = 'analysis'
+    DISPLAY     = 'display'
+    ENCODING    = 'encoding'
+    GLOBAL      = 'global'
+    
+    STAGES = ( ACQUISITION, DISPLAY, ANALYSIS, ENCODING )
+    
+    _active : Dict[str, int] = {}
+    _budgets: Dict[str, int] = None
+    _count  : int = None
+    _lock = Lock()
+
+
+#=============================================================================
+class OpenCVStage( ContextManager ):
+    """The context manager of the OpenCV threads budget of a pipeline stage.
+    
+    Usage:
+        with OpenCVStage( OpenCVThreads.ENCODING ):
+            ...
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, stage: str) -> None:
+        '''Constructor.
+        
+        Args:
+            stage: str
+                The name of the stage, as defined in class
+                OpenCVThreads.
+        '''
+        super().__init__()
+        self.stage = stage
+
+    #-------------------------------------------------------------------------
+    def cmp_enter(self) -> None:
+        '''Enters the stage.
+        '''
+        OpenCVThreads.enter_stage( self.stage )
+
+    #-------------------------------------------------------------------------
+    def cmp_exit(self, except_type     : BaseExceptionType = None,
+                       except_value    : BaseException     = None,
+                       except_traceback: TracebackType     = None ) -> None:
+        '''Leaves the stage, even when an exception has been raised in the 'with' block.
+        '''
+        OpenCVThreads.leave_stage( self.stage )
+
+#=====   end of   src.Utils.Scheduling.opencv_threads   =====#
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+from threading   import Lock
+from typing      import ForwardRef, List
+
+from src.Utils.Scheduling import Scheduler
+
+
+#=============================================================================
+SchedulerRef = ForwardRef( "Scheduler" )
+
+
+#=============================================================================
+class ThreadsPolicy:
+    """The threads placement policy of application AVT.
+    
+    This is a namespace for class methods only. It  dispatches
+    the running threads of the application over the available
+    CPUs:
+        - each camera acquisition thread gets its own CPU (core)
+          and a raised priority,  as long as at least one  CPU
+          is kept shared for the other threads;
+        - encoding threads run with a slightly lowered priority
+          on the shared CPUs,  so that they never delay the UI
+          but still keep up with the acquisition;
+        - background threads,  which run truly deferrable work,
+          run idle-priority on the shared CPUs;
+        - every other thread (UI, displays) runs  with  normal 
+          priority on the shared CPUs.
+    
+    Acquisition CPUs are reserved from the highest  indexes
+    down, since CPU 0 generally handles many hardware inter-
+    rupts.  On platforms where affinity cannot be  set,  the
+    placement of threads is left to the OS scheduler and only
+    priorities are applied.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_shared_cpus(cls) -> List[int]:
+        '''Returns the list of the CPUs that are not reserved for acquisition threads.
+        '''
+        with cls._lock:
+            return [ cpu for cpu in Scheduler.get_available_cpus() if cpu not in cls._reserved_cpus ]
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def release_acquisition_thread(cls, cpu: int) -> None:
+        '''Releases the CPU that was reserved for an acquisition thread.
+        
+        Args:
+            cpu: int
+                The index of the released CPU, as returned by
+                'set_acquisition_thread()'.  Negative  values
+                are ignored.
+        '''
+        with cls._lock:
+            cls._reserved_cpus.discard( cpu )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def set_acquisition_thread(cls, scheduler: SchedulerRef) -> int:
+        '''Applies the acquisition policy to the currently active thread.
+        
+        Must be called from within the acquisition thread.
+        
+        Args:
+            scheduler: Scheduler
+                A reference to the scheduler that is active in
+                the current thread.
+        
+        Returns:
+            The index of the CPU that is reserved for the cur-
+            rently  active  thread,  or  -1 if no CPU could be
+            reserved. Reserved CPUs should be released on thread
+            completion - see 'release_acquisition_thread()'.
+        '''
+        scheduler.set_thread_priority( scheduler.PRI_MAX )
+        
+        with cls._lock:
+            free_cpus = [ cpu for cpu in Scheduler.get_available_cpus() if cpu not in cls._reserved_cpus ]
+            if len( free_cpus ) <= cls.MIN_SHARED_CPUS:
+                return -1
+            cpu = free_cpus[ -1 ]
+            cls._reserved_cpus.add( cpu )
+        
+        if scheduler.set_thread_affinity( [cpu] ):
+            return cpu
+        else:
+            cls.release_acquisition_thread( cpu )
+            return -1
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def set_background_thread(cls, scheduler: SchedulerRef) -> None:
+        '''Applies the background policy to the currently active thread.
+        
+        Must be called from within the background thread. This
+        policy is kept for truly deferrable work only,  since
+        background threads only run when no other thread of the
+        system is ready to run - see 'set_encoding_thread()'.
+        
+        Args:
+            scheduler: Scheduler
+                A reference to the scheduler that is active in
+                the current thread.
+        '''
+        scheduler.set_thread_affinity( cls.get_shared_cpus() )
+        scheduler.set_thread_background( True )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def set_encoding_thread(cls, scheduler: SchedulerRef) -> None:
+        '''Applies the encoding policy to the currently active thread.
+        
+        Must be called from within the encoding thread. Encoders
+        are not put in background:  an idle-priority thread only
+        runs when no other thread is ready to run,  which would
+        starve the encoders under load and overflow their queues.
+        
+        Args:
+            scheduler: Scheduler
+                A reference to the scheduler that is active in
+                the current thread.
+        '''
+        scheduler.set_thread_affinity( cls.get_shared_cpus() )
+        scheduler.set_thread_priority( scheduler.PRI_MINUS_1 )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def set_shared_thread(cls, scheduler: SchedulerRef) -> None:
+        '''Applies the default policy to the currently active thread.
+        
+        Must be called from within the related thread.
+        
+        Args:
+            scheduler: Scheduler
+                A reference to the scheduler that is active in
+                the current thread.
+        '''
+        scheduler.set_thread_affinity( cls.get_shared_cpus() )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    MIN_SHARED_CPUS = 1
+
+    _lock          = Lock()
+    _reserved_cpus = set()
+
+#=====   end of   src.Utils.Scheduling.threads_policy   =====#
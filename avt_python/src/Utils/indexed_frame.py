@@ -33,11 +33,18 @@ IndexedFrameRef = ForwardRef( "IndexedFrame" )
 #=============================================================================
 class IndexedFrame:
     """The class of frames associated with an index.
+    
+    Captured frames also get their capture time,  so that
+    their consumers - e.g. recorders - do not depend on the
+    time at which they read them.
     """
+    __slots__ = ( 'index', 'frame', 'capture_time' )
+    
     #-------------------------------------------------------------------------
     def __init__(self, index: int   = None,
                        frame: Frame = None,
                        *, 
+                       capture_time: float = None,
                        copy: IndexedFrameRef = None) -> None:
         '''Constructor.
         
@@ -51,6 +58,10 @@ class IndexedFrame:
                 A reference to a frame associated  with  the 
                 index.  Must  be set if 'index' is set. Must 
                 be None if 'copy' is set. Defaults to None.
+            capture_time: float
+                Named argument.  The 'time.perf_counter()' value
+                at which the frame has been captured,  or None if
+                it is not known. Defaults to None.
             copy: IndexFrame
                 Named argument.  This is a reference  to  an 
                 indexed  frame instance that is to be copied 
@@ -65,9 +76,11 @@ class IndexedFrame:
             assert (index is None and frame is None) or (index is not None and frame is not None)
             self.index = index
             self.frame = frame
+            self.capture_time = capture_time
         else:
             assert index is None and frame is None
-            self = copy.copy()
+            copied = copy.copy()
+            self.index, self.frame, self.capture_time = copied.index, copied.frame, copied.capture_time
 
     #-------------------------------------------------------------------------
     def copy(self) -> IndexedFrameRef:
@@ -77,8 +90,8 @@ class IndexedFrame:
         self.frame is None.
         '''
         try:
-            return IndexedFrame( self.index, self.frame.copy() )
+            return IndexedFrame( self.index, self.frame.copy(), capture_time=self.capture_time )
         except:
-            return IndexedFrame( self.index, self.frame )
+            return IndexedFrame( self.index, self.frame, capture_time=self.capture_time )
 
 #=====   end of   src.Utils.indexed_frame   =====#
@@ -26,7 +26,8 @@ SOFTWARE.
 from threading import Thread 
 import time
 
-from src.Utils.Scheduling import Scheduler
+from src.Utils.Scheduling                import Scheduler
+from src.Utils.Scheduling.threads_policy import ThreadsPolicy
 
 
 #=============================================================================
@@ -34,7 +35,9 @@ class PeriodicalThread( Thread ):
     """The class of periodical threads.
     
     Periodical threads get their processing score called at 
-    periodical periods of time.
+    periodical periods of time. They run on the CPUs that are
+    not reserved for acquisition threads - see class 'Threads-
+    Policy'.
     """
     #-------------------------------------------------------------------------
     def __init__(self, period_s: float, thread_name: str = None) -> None:
@@ -115,7 +118,9 @@ class PeriodicalThread( Thread ):
             
             self.keep_on = True
             
-            with Scheduler( 3 ):
+            with Scheduler( 3 ) as scheduler:
+                ThreadsPolicy.set_shared_thread( scheduler )
+                
                 while self.keep_on:
                     # calls the processing core of this periodical thread
                     if not self.process():
@@ -27,6 +27,8 @@ SOFTWARE.
 #
 #    class RGBColor
 #    class GrayColor
+#    class PaletteColor
+#    class Palette
 #
 # and colors
 #    ANTHRACITE
@@ -56,13 +58,17 @@ SOFTWARE.
 #
 
 #=============================================================================
-from typing import ForwardRef, Optional, Union
+from collections import OrderedDict
+import numpy as np
+from threading import Lock
+from typing    import Callable, Dict, ForwardRef, Optional, Tuple, Union
 
 from .types import Numeric, PixelColor
 
 
 #=============================================================================
-RGBColorRef = ForwardRef( "RGBColor" )
+RGBColorRef       = ForwardRef( "RGBColor" )
+PaletteColorRef   = ForwardRef( "PaletteColor" )
 Color = Union[ Numeric, PixelColor, RGBColorRef ]
 
 
@@ -75,7 +81,14 @@ class RGBColor:
     To help developments, class RGBColor codes colors in 
     a  usual  way while the BGR conversion is internally 
     automated for its use with library OpenCV.
+    
+    Notice: colors are hot value types.  In per-frame code, the
+            in-place operators and the tuple-returning methods
+            'to_bgr()' and 'scaled_bgr()' should be preferred to
+            the allocating operators.
     """
+    __slots__ = ( 'color', )
+    
     #-------------------------------------------------------------------------
     def __init__(self, r: int, g: int, b: int) -> None:
         '''Constructor.
@@ -150,6 +163,29 @@ class RGBColor:
         '''
         self.color = [ self._clipped(b), self._clipped(g), self._clipped(r) ]
 
+    #-------------------------------------------------------------------------
+    def scaled_bgr(self, coeff: float) -> Tuple[int, int, int]:
+        '''Returns the BGR tuple of this color scaled by some coefficient.
+        
+        This is the allocation-free equivalent of '(self * coeff).color'
+        and of '(self / (1.0 / coeff)).color'.
+        '''
+        b, g, r = self.color
+        clipped = self._clipped
+        return ( clipped(round(b * coeff)), clipped(round(g * coeff)), clipped(round(r * coeff)) )
+
+    #-------------------------------------------------------------------------
+    def to_array(self) -> np.ndarray:
+        '''Returns the BGR components of this color as a NumPy array of uint8.
+        '''
+        return np.array( self.color, np.uint8 )
+
+    #-------------------------------------------------------------------------
+    def to_bgr(self) -> Tuple[int, int, int]:
+        '''Returns the BGR tuple of this color, as expected by OpenCV.
+        '''
+        return tuple( self.color )
+
     #-------------------------------------------------------------------------
     def to_gray_color(self) -> RGBColorRef:
         '''Returns a reference to the gray color equivalent of this RGB color.
@@ -168,32 +204,27 @@ class RGBColor:
     def __eq__(self, other: Color) -> bool:
         '''Returns True if both colors have same color components.
         '''
+        bgr = tuple( self.color )
         try:
-            return self.color == other.color
-        except:
+            return bgr == tuple( other.color )
+        except AttributeError:
             try:
-                return self.color == other
-            except:
-                return self.color == (other, other, other)
+                return bgr == tuple( other )
+            except TypeError:
+                return bgr == (other, other, other)
 
     #-------------------------------------------------------------------------
     def __ne__(self, other: Color) -> bool:
         '''Returns True if any same color component differs in this and in other.
         '''
-        try:
-            return self.color != other.color
-        except:
-            try:
-                return self.color != other
-            except:
-                return self.color != (other, other, other)
+        return not self.__eq__( other )
 
     #-------------------------------------------------------------------------
     def __add__(self, other: Color) -> RGBColorRef:
         '''
         '''
         try:
-            return RGBColor( self.r + other.r, self.g + other.g, self.r + other.b )
+            return RGBColor( self.r + other.r, self.g + other.g, self.b + other.b )
         except:
             try:
                 return RGBColor( self.r + other[0], self.g + other[1], self.b + other[2] )
@@ -205,7 +236,7 @@ class RGBColor:
         '''
         '''
         try:
-            self.set( self.r + other.r, self.g + other.g, self.r + other.b )
+            self.set( self.r + other.r, self.g + other.g, self.b + other.b )
         except:
             try:
                 self.set( self.r + other[0], self.g + other[1], self.b + other[2] )
@@ -217,7 +248,7 @@ class RGBColor:
     def __radd__(self, other: Color) -> RGBColorRef:
         '''
         '''
-        return self.add( other )
+        return self.__add__( other )
 
     #-------------------------------------------------------------------------
     def __floordiv__(self, den: Numeric) -> RGBColorRef:
@@ -256,7 +287,7 @@ class RGBColor:
         '''
         '''
         try:
-            return RGBColor( self.r - other.r, self.g - other.g, self.r - other.b )
+            return RGBColor( self.r - other.r, self.g - other.g, self.b - other.b )
         except:
             try:
                 return RGBColor( self.r - other[0], self.g - other[1], self.b - other[2] )
@@ -268,7 +299,7 @@ class RGBColor:
         '''
         '''
         try:
-            self.set( self.r - other.r, self.g - other.g, self.r - other.b )
+            self.set( self.r - other.r, self.g - other.g, self.b - other.b )
         except:
             try:
                 self.set( self.r - other[0], self.g - other[1], self.b - other[2] )
@@ -307,6 +338,8 @@ class GrayColor( RGBColor ):
     """The class of RGB gray colors.
     
     """
+    __slots__ = ()
+    
     #-------------------------------------------------------------------------
     def __init__(self, comp: int) -> None:
         '''Constructor.
@@ -322,30 +355,293 @@ class GrayColor( RGBColor ):
 
 
 #=============================================================================
-ANTHRACITE  = RGBColor( 32, 32, 32 )
-BLACK       = RGBColor( 0, 0, 0 )
-BLUE        = RGBColor( 0, 0, 255 )
-BROWN       = RGBColor( 96, 48, 0 )
-DARK_RED    = RGBColor( 128, 0, 0 )
-DEEP_GRAY   = RGBColor( 64, 64, 64 )
-DEEP_GREEN  = RGBColor( 0, 96, 0 )
-GRAY        = RGBColor( 128, 128, 128 )
-LIGHT_BLUE  = RGBColor( 0, 255, 255 )
-LIGHT_GRAY  = RGBColor( 192, 192, 192 )
-LIGHT_GREEN = RGBColor( 0, 255, 0 )
-NAVY_BLUE   = RGBColor( 0, 0, 64 )
-ORANGE      = RGBColor( 255, 128, 0 )
-RED         = RGBColor( 255, 0, 0 )
-YELLOW      = RGBColor( 255, 255, 0 )
-WHITE       = RGBColor( 255, 255, 255 )
-
-TARGET_WHITE = RGBColor( 255, 255, 255 )
-TARGET_BLACK = RGBColor(   0,   0,   0 )
-TARGET_BLUE  = RGBColor(  65, 181, 200 )
-TARGET_RED   = RGBColor( 255,  37,  21 )
-TARGET_GOLD  = RGBColor( 255, 245,  55 )
-
-TARGET_BLUE_6 = RGBColor( 17, 165, 255 )
-TARGET_BLUE_NFAA = RGBColor( 63, 63,  95 )
+class PaletteColor( RGBColor ):
+    """The class of immutable and interned RGB colors.
+    
+    Palette colors are never instantiated directly but  are
+    got  from  class  Palette,  which ensures that a single
+    instance exists per color components values.  Their BGR
+    tuple  and  NumPy  array are evaluated once at creation
+    time, and the shades derived from them by operators '*',
+    '/' and '//', or by method 'to_gray_color()', are cached
+    in  the palette also.  Drawing code can then use colors
+    and their shades in the rendering loop without building
+    any new color object.  The cache of shades of each color
+    is a bounded LRU one - see 'SHADES_CACHE_SIZE' - so that
+    computed operands, e.g. fades, do not make it grow.
+    
+    Notice: any attempt to modify a palette color raises an
+            AttributeError  exception.  In-place  operators
+            rebind their target to the derived palette color,
+            as they do with Python immutable types.  Method
+            'copy()' returns a modifiable RGB color.
+    """
+    __slots__ = ( 'array', '_shades' )
+    
+    #-------------------------------------------------------------------------
+    def __init__(self, bgr: Tuple[int, int, int]) -> None:
+        '''Constructor.
+        
+        Should not be called directly. Use 'Palette.get()' or
+        'Palette.freeze()' instead.
+        
+        Args:
+            bgr: Tuple[int, int, int]
+                The already clipped blue, green and red compon-
+                ents values of this color.
+        '''
+        array = np.array( bgr, np.uint8 )
+        array.flags.writeable = False
+        object.__setattr__( self, 'color', bgr )
+        object.__setattr__( self, 'array', array )
+        object.__setattr__( self, '_shades', OrderedDict() )
+
+    #-------------------------------------------------------------------------
+    def copy(self, other: RGBColorRef = None) -> Optional[ RGBColorRef ]:
+        '''Returns a modifiable copy of this color.
+        
+        Raises:
+            AttributeError: 'other' is set, since palette colors
+                cannot be modified.
+        '''
+        if other is not None:
+            self._raise_immutable()
+        return RGBColor( self.r, self.g, self.b )
+
+    #-------------------------------------------------------------------------
+    def set(self, r: int, g: int, b: int) -> None:
+        '''Always raises AttributeError: palette colors are immutable.
+        '''
+        self._raise_immutable()
+
+    #-------------------------------------------------------------------------
+    def scaled_bgr(self, coeff: float) -> Tuple[int, int, int]:
+        '''Returns the cached BGR tuple of this color scaled by some coefficient.
+        '''
+        return self.__mul__( coeff ).color
+
+    #-------------------------------------------------------------------------
+    def to_array(self) -> np.ndarray:
+        '''Returns the cached, read-only NumPy array of the BGR components.
+        '''
+        return self.array
+
+    #-------------------------------------------------------------------------
+    def to_bgr(self) -> Tuple[int, int, int]:
+        '''Returns the cached BGR tuple of this color.
+        '''
+        return self.color
+
+    #-------------------------------------------------------------------------
+    def to_gray_color(self) -> PaletteColorRef:
+        '''Returns the cached gray palette color equivalent of this color.
+        '''
+        return self._shade( 'gray', None, lambda color, _: RGBColor.to_gray_color(color) )
+
+    #-------------------------------------------------------------------------
+    def _raise_immutable(self) -> None:
+        '''Raises AttributeError on any attempt to modify this color.
+        '''
+        raise AttributeError( f"palette color {self.color} (BGR) cannot be modified" )
+
+    #-------------------------------------------------------------------------
+    def _shade(self, op   : str,
+                     value: Numeric,
+                     func : Callable[[RGBColor, Numeric], RGBColor]) -> PaletteColorRef:
+        '''Returns the cached palette color derived from this color.
+        
+        Args:
+            op: str
+                The name of the derivation operation.
+            value: Numeric
+                The operand of the derivation operation.
+            func: Callable[[RGBColor, Numeric], RGBColor]
+                The function that evaluates the derived color
+                when it is not yet cached.
+        
+        Returns:
+            The palette color that results from the  derivation
+            of this color, evaluated once for each pair (op, value)
+            as long as it stays in the cache.
+        '''
+        key = (op, value)
+        shades = self._shades
+        shade = shades.get( key )
+        if shade is not None:
+            try:
+                shades.move_to_end( key )
+            except KeyError:
+                pass  # evicted meanwhile by another thread
+            return shade
+        
+        shade = Palette.freeze( func(self, value) )
+        shades[ key ] = shade
+        if len( shades ) > self.SHADES_CACHE_SIZE:
+            try:
+                shades.popitem( last=False )
+            except KeyError:
+                pass
+        return shade
+
+    #-------------------------------------------------------------------------
+    def __setattr__(self, name: str, value: object) -> None:
+        '''Always raises AttributeError: palette colors are immutable.
+        '''
+        self._raise_immutable()
+
+    #-------------------------------------------------------------------------
+    def __hash__(self) -> int:
+        '''Palette colors can be used as keys in dictionaries and sets.
+        '''
+        return hash( self.color )
+
+    #-------------------------------------------------------------------------
+    def __floordiv__(self, den: Numeric) -> PaletteColorRef:
+        '''Returns the cached palette color of this color components divided by den, truncated.
+        '''
+        return self._shade( '//', den, RGBColor.__floordiv__ )
+
+    #-------------------------------------------------------------------------
+    def __mul__(self, coeff: Numeric) -> PaletteColorRef:
+        '''Returns the cached palette color of this color components multiplied by coeff.
+        '''
+        return self._shade( '*', coeff, RGBColor.__mul__ )
+
+    #-------------------------------------------------------------------------
+    def __truediv__(self, den: Numeric) -> PaletteColorRef:
+        '''Returns the cached palette color of this color components divided by den, rounded.
+        '''
+        return self._shade( '/', den, RGBColor.__truediv__ )
+
+    #-------------------------------------------------------------------------
+    def __iadd__(self, other: Color) -> PaletteColorRef:
+        '''Returns the palette color of the sum of this color and other.
+        
+        The target of the in-place addition is rebound to it.
+        '''
+        return Palette.freeze( RGBColor.__add__(self, other) )
+
+    #-------------------------------------------------------------------------
+    def __isub__(self, other: Color) -> PaletteColorRef:
+        '''Returns the palette color of the difference of this color and other.
+        
+        The target of the in-place subtraction is rebound to it.
+        '''
+        return Palette.freeze( RGBColor.__sub__(self, other) )
+
+    #-------------------------------------------------------------------------
+    # in-place operators rebind their target, as with immutable Python types
+    __rmul__ = __mul__
+    __ifloordiv__ = __floordiv__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+    
+    #-------------------------------------------------------------------------
+    # Class data
+    SHADES_CACHE_SIZE = 32  # shades cached per palette color
+
+
+#=============================================================================
+class Palette:
+    """The class of the palette of interned colors.
+    
+    This is a namespace class: all its methods are  class
+    methods.  It  ensures  that  a single instance of class
+    PaletteColor exists per color components values.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def count(cls) -> int:
+        '''Returns the count of colors currently interned in the palette.
+        '''
+        return len( cls._colors )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def freeze(cls, color: Optional[ Color ]) -> Optional[ PaletteColor ]:
+        '''Returns the palette color of the same components as specified color.
+        
+        Args:
+            color: Color
+                Either an RGB color, a BGR tuple or a gray  level.
+                None is returned unchanged, which helps with op-
+                tional colors such as backgrounds of fonts.
+        
+        Returns:
+            The interned palette color, or None.
+        '''
+        if color is None or isinstance( color, PaletteColor ):
+            return color
+        try:
+            b, g, r = color.color
+        except AttributeError:
+            try:
+                b, g, r = color
+            except TypeError:
+                b = g = r = color
+        return cls.get( r, g, b )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get(cls, r: int, g: int, b: int) -> PaletteColor:
+        '''Returns the palette color of specified components values.
+        
+        Args:
+            r, g, b: int
+                The resp. red, green and blue components values 
+                of  the  color.  These values are clipped within
+                interval [0, 255].
+        
+        Returns:
+            The interned palette color, created on first  request
+            only.
+        '''
+        clipped = RGBColor._clipped
+        bgr = ( int(clipped(b)), int(clipped(g)), int(clipped(r)) )
+        try:
+            return cls._colors[ bgr ]
+        except KeyError:
+            with cls._lock:
+                return cls._colors.setdefault( bgr, PaletteColor(bgr) )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def gray(cls, comp: int) -> PaletteColor:
+        '''Returns the palette gray color of specified level.
+        '''
+        return cls.get( comp, comp, comp )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _colors: Dict[ Tuple[int, int, int], PaletteColor ] = {}
+    _lock = Lock()
+
+
+#=============================================================================
+ANTHRACITE  = Palette.get( 32, 32, 32 )
+BLACK       = Palette.get( 0, 0, 0 )
+BLUE        = Palette.get( 0, 0, 255 )
+BROWN       = Palette.get( 96, 48, 0 )
+DARK_RED    = Palette.get( 128, 0, 0 )
+DEEP_GRAY   = Palette.get( 64, 64, 64 )
+DEEP_GREEN  = Palette.get( 0, 96, 0 )
+GRAY        = Palette.get( 128, 128, 128 )
+LIGHT_BLUE  = Palette.get( 0, 255, 255 )
+LIGHT_GRAY  = Palette.get( 192, 192, 192 )
+LIGHT_GREEN = Palette.get( 0, 255, 0 )
+NAVY_BLUE   = Palette.get( 0, 0, 64 )
+ORANGE      = Palette.get( 255, 128, 0 )
+RED         = Palette.get( 255, 0, 0 )
+YELLOW      = Palette.get( 255, 255, 0 )
+WHITE       = Palette.get( 255, 255, 255 )
+
+TARGET_WHITE = Palette.get( 255, 255, 255 )
+TARGET_BLACK = Palette.get(   0,   0,   0 )
+TARGET_BLUE  = Palette.get(  65, 181, 200 )
+TARGET_RED   = Palette.get( 255,  37,  21 )
+TARGET_GOLD  = Palette.get( 255, 245,  55 )
+
+TARGET_BLUE_6 = Palette.get( 17, 165, 255 )
+TARGET_BLUE_NFAA = Palette.get( 63, 63,  95 )
 
 #=====   end of   src.Utils.rgb_color   =====#
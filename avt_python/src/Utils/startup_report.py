@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Philippe Schmouker
+
+Permission is hereby granted,  free of charge,  to any person obtaining a copy
+of this software and associated documentation files (the "Software"),  to deal
+in the Software without restriction, including  without  limitation the rights
+to use,  copy,  modify,  merge,  publish,  distribute, sublicense, and/or sell
+copies of the Software,  and  to  permit  persons  to  whom  the  Software  is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY  KIND,  EXPRESS  OR
+IMPLIED,  INCLUDING  BUT  NOT  LIMITED  TO  THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT  SHALL  THE
+AUTHORS  OR  COPYRIGHT  HOLDERS  BE  LIABLE  FOR  ANY CLAIM,  DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT,  TORT OR OTHERWISE, ARISING FROM,
+OUT  OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+#=============================================================================
+## This module defines:
+#
+#    class StartupReport
+#    class StartupTimer
+#
+
+
+#=============================================================================
+from threading  import Lock
+import time
+from types      import TracebackType
+from typing     import Dict, List, Tuple, Type
+
+from .context_manager import ContextManager
+
+
+#=============================================================================
+BaseExceptionType = Type[ BaseException ]
+
+
+#=============================================================================
+class StartupReport:
+    """The report of the startup costs of application AVT.
+    
+    This is a namespace for class methods only.  Startup steps
+    are  recorded  by  category  (for instance 'imports',  
+    'assets', 'display' or 'cameras') and are printed on con-
+    sole  as a summary,  with the most  expensive  items  per
+    category.
+    """
+    #-------------------------------------------------------------------------
+    @classmethod
+    def add(cls, category: str, name: str, duration_s: float) -> None:
+        '''Records the duration of a startup step.
+        
+        Args:
+            category: str
+                The category of this startup step.
+            name: str
+                The name of this startup step.
+            duration_s: float
+                The duration of this startup step,  expressed
+                in fractional seconds.
+        '''
+        with cls._lock:
+            cls._steps.setdefault( category, [] ).append( (name, duration_s) )
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_elapsed(cls) -> float:
+        '''Returns the elapsed time since the very start of the application, in seconds.
+        '''
+        return time.perf_counter() - cls._START_TIME
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def get_totals(cls) -> Dict[str, float]:
+        '''Returns the summed durations of the recorded steps per category.
+        '''
+        with cls._lock:
+            return { category: sum(d for _, d in steps) for category, steps in cls._steps.items() }
+
+    #-------------------------------------------------------------------------
+    @classmethod
+    def print(cls, top_count: int = 3) -> None:
+        '''Prints the startup report on console.
+        
+        Args:
+            top_count: int
+                The max number of most expensive steps that are 
+                printed per category. Defaults to 3.
+        '''
+        with cls._lock:
+            steps = { category: sorted(items, key=lambda s: s[1], reverse=True)
+                                        for category, items in cls._steps.items() }
+        
+        print( f"-- startup report: {1000.0 * cls.get_elapsed():.1f} ms since start" )
+        for category, items in steps.items():
+            total_ms = 1000.0 * sum( d for _, d in items )
+            print( f"   {category:10s} {total_ms:8.1f} ms ({len(items)} items)" )
+            for name, duration_s in items[:top_count]:
+                print( f"      {name:32s} {1000.0 * duration_s:8.1f} ms" )
+
+    #-------------------------------------------------------------------------
+    # Class data
+    _lock = Lock()
+    _steps: Dict[ str, List[Tuple[str, float]] ] = {}
+    _START_TIME = time.perf_counter()
+
+
+#=============================================================================
+class StartupTimer( ContextManager ):
+    """The class of startup steps timers.
+    
+    Use it with Python statement 'with', e.g.:
+        with StartupTimer( 'display', 'main window' ):
+            ...
+    The duration of the 'with' block is then recorded  in the
+    startup report.
+    """
+    #-------------------------------------------------------------------------
+    def __init__(self, category: str, name: str) -> None:
+        '''Constructor.
+        
+        Args:
+            category: str
+                The category of the timed startup step.
+            name: str
+                The name of the timed startup step.
+        '''
+        super().__init__()
+        self.category = category
+        self.name = name
+
+    #-------------------------------------------------------------------------
+    def cmp_enter(self) -> None:
+        '''Starts timing the startup step.
+        '''
+        self.start_time = time.perf_counter()
+
+    #-------------------------------------------------------------------------
+    def cmp_exit(self, except_type     : BaseExceptionType = None,
+                       except_value    : BaseException     = None,
+                       except_traceback: TracebackType     = None ) -> None:
+        '''Records the duration of the startup step.
+        
+        Args:
+            except_type: BaseExceptionType
+                A reference to the  type  of  caught  exception.
+                Defaults to None.
+            except_value: BaseException
+                A reference to the exception itself. Defaults to 
+                None.
+            except_traceback: TracebackType
+                A reference to the type of traceback  associated
+                with the caught exception. Defaults to None.
+        '''
+        StartupReport.add( self.category, self.name, time.perf_counter() - self.start_time )
+
+#=====   end of   src.Utils.startup_report   =====#
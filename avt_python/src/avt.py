@@ -21,7 +21,10 @@ SOFTWARE.
 """
 
 #=============================================================================²
-from src.App.avt_main import avt_main
+from src.Utils.startup_report import StartupTimer
+
+with StartupTimer( 'imports', 'src.App.avt_main' ):
+    from src.App.avt_main import avt_main
 
 
 #=============================================================================